@@ -1,7 +1,7 @@
 # app/config.py
 
 from dataclasses import dataclass
-from typing import Literal, List, cast
+from typing import Literal, List, Optional, cast
 import os
 import yaml
 
@@ -17,10 +17,46 @@ class AppConfig:
     access_token: str = ""
 
     instruments: List[int] = None
+    # daily instrument master dumps (live order symbols, option chains)
+    instruments_cache_dir: str = "data/instruments"
 
     backtest_start: str = "2024-10-01"
     backtest_end: str = "2024-10-07"
     backtest_interval: str = "minute"
+    backtest_cache_dir: str = "data/candles"
+    backtest_offline: bool = False   # serve candles from the cache only
+    backtest_requests_per_second: float = 3.0
+    backtest_download_workers: int = 4
+    backtest_slippage_bps: float = 0.0
+    backtest_latency_ms: float = 0.0
+
+    # live tick ingress buffer (policies: block, drop_oldest, drop_newest, conflate);
+    # conflate loses intra-batch highs/lows and returns, degrading bars and vol estimates
+    feed_buffer_size: int = 10_000
+    feed_overflow_policy: str = "drop_oldest"
+
+    # seconds between broker position resyncs (None → only after fills)
+    position_sync_interval: Optional[float] = 5.0
+    # live only: send orders to the broker (off → orders are logged, never placed)
+    live_orders: bool = False
+    # order submission threads (0 → place orders inline on the tick thread)
+    execution_workers: int = 4
+    # process feed batches as a unit (one strategy evaluation per token per batch;
+    # vol models still see every tick, so signals do not depend on batching)
+    batch_mode: bool = False
+    # live only: run the engine on an asyncio loop (AsyncEngine)
+    async_engine: bool = False
+    # dummy/live: worker processes, instruments split between them (1 → single Engine)
+    shards: int = 1
+    # pre-trade limits (None → not enforced); trading hours as "HH:MM-HH:MM" exchange time
+    risk_max_position: Optional[int] = None
+    risk_max_underlying_notional: Optional[float] = None
+    risk_max_portfolio_notional: Optional[float] = None
+    risk_max_loss: Optional[float] = None
+    risk_trading_hours: Optional[str] = None
+    # per-stage latency histograms (off → no timing on the hot path)
+    instrumentation: bool = False
+    latency_dump_interval: Optional[float] = 60.0
 
     @staticmethod
     def from_yaml(path: str) -> "AppConfig":
@@ -37,6 +73,9 @@ class AppConfig:
         zerodha = data.get("zerodha", {})
         universe = data.get("universe", {})
         backtest = data.get("backtest", {})
+        engine = data.get("engine", {})
+        feed = data.get("feed", {})
+        risk = data.get("risk", {})
 
         api_key = os.getenv("ZERODHA_API_KEY", zerodha.get("api_key", ""))
         access_token = os.getenv("ZERODHA_ACCESS_TOKEN", zerodha.get("access_token", ""))
@@ -48,7 +87,29 @@ class AppConfig:
             api_key=api_key,
             access_token=access_token,
             instruments=instruments,
+            instruments_cache_dir=zerodha.get("instruments_cache_dir", "data/instruments"),
             backtest_start=backtest.get("start", "2024-10-01"),
             backtest_end=backtest.get("end", "2024-10-07"),
             backtest_interval=backtest.get("interval", "minute"),
+            backtest_cache_dir=backtest.get("cache_dir", "data/candles"),
+            backtest_offline=backtest.get("offline", False),
+            backtest_requests_per_second=backtest.get("requests_per_second", 3.0),
+            backtest_download_workers=backtest.get("download_workers", 4),
+            backtest_slippage_bps=backtest.get("slippage_bps", 0.0),
+            backtest_latency_ms=backtest.get("latency_ms", 0.0),
+            feed_buffer_size=feed.get("buffer_size", 10_000),
+            feed_overflow_policy=feed.get("overflow_policy", "drop_oldest"),
+            position_sync_interval=engine.get("position_sync_interval", 5.0),
+            live_orders=engine.get("live_orders", False),
+            execution_workers=engine.get("execution_workers", 4),
+            batch_mode=engine.get("batch_mode", False),
+            async_engine=engine.get("async", False),
+            shards=engine.get("shards", 1),
+            risk_max_position=risk.get("max_position"),
+            risk_max_underlying_notional=risk.get("max_underlying_notional"),
+            risk_max_portfolio_notional=risk.get("max_portfolio_notional"),
+            risk_max_loss=risk.get("max_loss"),
+            risk_trading_hours=risk.get("trading_hours"),
+            instrumentation=engine.get("instrumentation", False),
+            latency_dump_interval=engine.get("latency_dump_interval", 60.0),
         )
@@ -1,20 +1,29 @@
 # app/runner_factory.py
 
-from datetime import datetime
+from datetime import datetime, time, timedelta
 
 from infra.dummy.dummy_feed import DummyFeed
 from infra.dummy.dummy_broker import DummyBroker
 from infra.dummy.dummy_strategy import DummyStrategy
 from infra.dummy.dummy_risk import DummyRiskManager
+from infra.dummy.dry_run_broker import DryRunBroker
 
 from infra.backtest.backtest_feed import BacktestFeed
 from infra.backtest.simulated_broker import SimulatedBroker
 from infra.backtest.historical_provider import ZerodhaHistoricalProvider
+from infra.backtest.candle_cache import CachedHistoricalProvider
+from infra.backtest.signal_precompute import replay_models
 
 from core.engine.runner import Engine
-from core.domain.types import Candle
+from core.engine.sharded_runner import ShardedEngine
+from core.engine.async_runner import AsyncBrokerAdapter, AsyncEngine
+from core.engine.execution import OrderExecutor
+from core.engine.clock import ReplayClock
+from core.engine.instrumentation import Instrumentation
+from core.engine.option_resolver import OptionResolver
 from strategies.option_strategies.high_vol_long_straddle import HighVolLongStraddleStrategy
 from strategies.option_strategies.long_vol_short_condor import LowVolShortCondorStrategy
+from strategies.risk_managers.exposure_risk_manager import ExposureRiskManager
 
 # NEW
 from strategies.vol_models.realized_vol_model import RealizedVolModel
@@ -22,6 +31,43 @@ from infra.zerodtha.zerodtha_broker import ZerodhaBroker
 from infra.zerodtha.zerodtha_feed import ZerodhaFeed
 
 
+def dummy_components(tokens):
+    """Vol models and strategies of the dummy runtime, for `tokens`."""
+    vol_models = [RealizedVolModel(instrument_token=token, lookback=30) for token in tokens]
+    return vol_models, [DummyStrategy()]
+
+
+def live_components(tokens):
+    """Vol models and strategies of the live runtime, for `tokens`."""
+    from strategies.vol_models.ewma_vol_model import EWMAVolModel
+    from strategies.vol_models.garch_vol_model import GARCHVolModel
+
+    vol_models = []
+    for token in tokens:
+        # Realized Vol (Rolling Window)
+        vol_models.append(RealizedVolModel(
+            instrument_token=token,
+            lookback=30,
+            high_threshold=0.01,
+            low_threshold=0.003
+        ))
+        # EWMA
+        vol_models.append(EWMAVolModel(
+            instrument_token=token,
+            decay_factor=0.94
+        ))
+        # GARCH
+        vol_models.append(GARCHVolModel(
+            instrument_token=token
+        ))
+
+    strategies = []
+    for token in tokens:
+        strategies.append(HighVolLongStraddleStrategy(underlying_token=token))
+        strategies.append(LowVolShortCondorStrategy(underlying_token=token))
+    return vol_models, strategies
+
+
 class RunnerFactory:
 
     @staticmethod
@@ -37,51 +83,90 @@ class RunnerFactory:
         else:
             raise ValueError(f"Unsupported mode: {mode}")
 
+    @staticmethod
+    def _instrumentation(config):
+        """Latency histograms when enabled in config, otherwise None."""
+        if not config.instrumentation:
+            return None
+        inst = Instrumentation(dump_interval=config.latency_dump_interval)
+        inst.install_signal_handler()
+        return inst
+
+    @staticmethod
+    def _risk_manager(config):
+        """Exposure and loss limits from the `risk` section of the config."""
+        trading_hours = None
+        if config.risk_trading_hours:
+            start, end = config.risk_trading_hours.split("-")
+            trading_hours = (time.fromisoformat(start.strip()), time.fromisoformat(end.strip()))
+        return ExposureRiskManager(
+            max_position=config.risk_max_position,
+            max_underlying_notional=config.risk_max_underlying_notional,
+            max_portfolio_notional=config.risk_max_portfolio_notional,
+            max_loss=config.risk_max_loss,
+            trading_hours=trading_hours,
+        )
+
     @staticmethod
     def _build_dummy(config):
         feed = DummyFeed(config.instruments)
         broker = DummyBroker()
+        risk_mgr = DummyRiskManager()
+        executor = OrderExecutor(broker, max_workers=config.execution_workers)
+
+        if config.shards > 1:
+            return RunnerFactory._build_sharded(config, feed, broker, dummy_components,
+                                                risk_mgr, executor)
 
         # you can keep the dummy here or also use RealizedVolModel if you want
-        vol_models = [
-            RealizedVolModel(instrument_token=token, lookback=30)
-            for token in config.instruments
-        ]
-        strategies = [DummyStrategy()]
-        risk_mgr = DummyRiskManager()
+        vol_models, strategies = dummy_components(config.instruments)
 
-        return Engine(feed, broker, vol_models, strategies, risk_mgr)
+        return Engine(feed, broker, vol_models, strategies, risk_mgr,
+                      position_sync_interval=config.position_sync_interval,
+                      executor=executor,
+                      instrumentation=RunnerFactory._instrumentation(config),
+                      batch_mode=config.batch_mode)
 
     @staticmethod
-    def _build_backtest(config):
-        provider = ZerodhaHistoricalProvider(config.api_key, config.access_token)
+    def _build_sharded(config, feed, broker, components, risk_mgr, executor, resolver=None):
+        """Models and strategies in `config.shards` processes, one order router."""
+        return ShardedEngine(feed, broker, components, config.instruments, risk_mgr,
+                             shards=config.shards,
+                             position_sync_interval=config.position_sync_interval,
+                             executor=executor,
+                             batch_mode=config.batch_mode,
+                             resolver=resolver)
 
-        candles_by_token = {}
-        for token in config.instruments:
-            raw = provider.get_candles(
-                token,
-                datetime.fromisoformat(config.backtest_start),
-                datetime.fromisoformat(config.backtest_end),
-                config.backtest_interval,
+    @staticmethod
+    def _build_backtest(config):
+        upstream = None
+        if not config.backtest_offline:
+            upstream = ZerodhaHistoricalProvider(
+                config.api_key,
+                config.access_token,
+                requests_per_second=config.backtest_requests_per_second,
+                max_workers=config.backtest_download_workers,
             )
+        provider = CachedHistoricalProvider(config.backtest_cache_dir, upstream)
 
-            candles = [
-                Candle(
-                    instrument_token=token,
-                    timestamp=c["date"],
-                    open=c["open"],
-                    high=c["high"],
-                    low=c["low"],
-                    close=c["close"],
-                    volume=c["volume"],
-                    oi=c.get("oi"),
-                )
-                for c in raw
-            ]
+        # keep config order (the feed breaks timestamp ties by token order),
+        # but fill each token in as soon as its download completes. The whole
+        # range is held in memory before replay starts: the feed merges every
+        # token's history by time, and the vol series are precomputed over it
+        candles_by_token = {token: [] for token in config.instruments}
+        for token, candles in provider.stream_candles(
+            config.instruments,
+            datetime.fromisoformat(config.backtest_start),
+            datetime.fromisoformat(config.backtest_end),
+            config.backtest_interval,
+        ):
             candles_by_token[token] = candles
 
         feed = BacktestFeed(candles_by_token)
-        broker = SimulatedBroker()
+        broker = SimulatedBroker(
+            slippage_bps=config.backtest_slippage_bps,
+            latency=timedelta(milliseconds=config.backtest_latency_ms),
+        )
 
         # Vol model: realized vol per instrument
         vol_models = [
@@ -100,56 +185,69 @@ class RunnerFactory:
             strategies.append(HighVolLongStraddleStrategy(underlying_token=token))
             strategies.append(LowVolShortCondorStrategy(underlying_token=token))
 
-        risk_mgr = DummyRiskManager()  # or you're real one
+        risk_mgr = RunnerFactory._risk_manager(config)
 
         return Engine(
             feed=feed,
             broker=broker,
-            vol_models=vol_models,
+            # tick models replay series computed in one vectorized pass
+            vol_models=replay_models(candles_by_token, vol_models),
             strategies=strategies,
             risk_mgr=risk_mgr,
             state_repo=None,
+            position_sync_interval=config.position_sync_interval,
+            # inline submission keeps backtest fills deterministic
+            executor=OrderExecutor(broker, max_workers=0),
+            instrumentation=RunnerFactory._instrumentation(config),
+            batch_mode=config.batch_mode,
+            # replay time: no wall-clock reads, identical output across runs
+            clock=ReplayClock(),
         )
 
     @staticmethod
     def _build_live(config):
         # 1. Init Broker & Feed
-        broker = ZerodhaBroker(config.api_key, config.access_token)
-        feed = ZerodhaFeed(config.api_key, config.access_token)
+        broker = ZerodhaBroker(config.api_key, config.access_token,
+                               instruments_cache_dir=config.instruments_cache_dir)
+        # strategies trade legs on the underlyings; map them to option contracts
+        resolver = None
+        if broker.instruments is not None:
+            resolver = OptionResolver.from_master(broker.instruments, config.instruments)
+        if not config.live_orders:
+            # real orders stay opt-in
+            broker = DryRunBroker(broker)
+        feed = ZerodhaFeed(config.api_key, config.access_token,
+                           buffer_size=config.feed_buffer_size,
+                           overflow_policy=config.feed_overflow_policy)
         
         feed.subscribe(config.instruments)
 
-        from strategies.vol_models.ewma_vol_model import EWMAVolModel
-        from strategies.vol_models.garch_vol_model import GARCHVolModel
+        # 2. Risk Manager
+        risk_mgr = RunnerFactory._risk_manager(config)
 
-        # 2. Vol Models (Live)
-        vol_models = []
-        for token in config.instruments:
-            # Realized Vol (Rolling Window)
-            vol_models.append(RealizedVolModel(
-                instrument_token=token,
-                lookback=30,
-                high_threshold=0.01,
-                low_threshold=0.003
-            ))
-            # EWMA
-            vol_models.append(EWMAVolModel(
-                instrument_token=token,
-                decay_factor=0.94
-            ))
-            # GARCH
-            vol_models.append(GARCHVolModel(
-                instrument_token=token
-            ))
-
-        # 3. Strategies
-        strategies = []
-        for token in config.instruments:
-            strategies.append(HighVolLongStraddleStrategy(underlying_token=token))
-            strategies.append(LowVolShortCondorStrategy(underlying_token=token))
+        # 3. Vol models and strategies, in shard processes or in this one
+        if config.shards > 1:
+            if config.async_engine:
+                raise ValueError("engine.shards > 1 cannot be combined with engine.async")
+            executor = OrderExecutor(broker, max_workers=config.execution_workers)
+            return RunnerFactory._build_sharded(config, feed, broker, live_components,
+                                                risk_mgr, executor, resolver)
 
-        # 4. Risk Manager (Use Dummy for now, or a real one if available)
-        risk_mgr = DummyRiskManager()
+        vol_models, strategies = live_components(config.instruments)
+
+        if config.async_engine:
+            # orders, position syncs and timers overlap tick processing on one loop
+            return AsyncEngine(
+                feed=feed,
+                broker=AsyncBrokerAdapter(broker),
+                vol_models=vol_models,
+                strategies=strategies,
+                risk_mgr=risk_mgr,
+                position_sync_interval=config.position_sync_interval,
+                instrumentation=RunnerFactory._instrumentation(config),
+                batch_mode=config.batch_mode,
+                resolver=resolver,
+            )
 
         return Engine(
             feed=feed,
@@ -157,4 +255,9 @@ class RunnerFactory:
             vol_models=vol_models,
             strategies=strategies,
             risk_mgr=risk_mgr,
+            position_sync_interval=config.position_sync_interval,
+            executor=OrderExecutor(broker, max_workers=config.execution_workers),
+            instrumentation=RunnerFactory._instrumentation(config),
+            batch_mode=config.batch_mode,
+            resolver=resolver,
         )
\ No newline at end of file
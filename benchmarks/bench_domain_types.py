@@ -0,0 +1,152 @@
+"""
+Micro-benchmark for the hot-path domain types.
+
+Compares the NamedTuple domain types against the frozen dataclasses they
+replaced: construction cost, attribute access and memory per object.
+
+    python -m benchmarks.bench_domain_types [--n 200000]
+"""
+# benchmarks/bench_domain_types.py
+
+import argparse
+import gc
+import timeit
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+from core.domain.actions import TradeAction
+from core.domain.signals import VolSignal
+from core.domain.types import Candle, OrderRequest, Position, Tick
+
+
+# ------------ previous definitions (frozen dataclasses) -----------------
+
+@dataclass(frozen=True)
+class OldTick:
+    instrument_token: int
+    timestamp: datetime
+    last_price: float
+    volume: int
+    oi: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class OldCandle:
+    instrument_token: int
+    timestamp: datetime
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: int
+    oi: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class OldVolSignal:
+    instrument_token: int
+    kind: str
+    strength: float
+    timestamp: datetime
+
+
+@dataclass(frozen=True)
+class OldTradeAction:
+    action_type: str
+    instrument_token: int
+    quantity: int
+    price: Optional[float] = None
+    metadata: Optional[dict] = None
+
+
+@dataclass(frozen=True)
+class OldOrderRequest:
+    instrument_token: int
+    quantity: int
+    order_type: str
+    transaction_type: str
+    price: Optional[float] = None
+
+
+@dataclass(frozen=True)
+class OldPosition:
+    instrument_token: int
+    quantity: int
+    avg_price: float
+    pnl: float
+
+
+NOW = datetime(2024, 10, 1, 9, 15)
+
+# name → (old type, new type, constructor args)
+CASES = {
+    "Tick": (OldTick, Tick, (256265, NOW, 24850.5, 1200)),
+    "Candle": (OldCandle, Candle, (256265, NOW, 24850.5, 24860.0, 24840.0, 24855.0, 1200)),
+    "VolSignal": (OldVolSignal, VolSignal, (256265, "VOL_UP", 0.75, NOW)),
+    "TradeAction": (OldTradeAction, TradeAction, ("OPEN_LONG", 256265, 50)),
+    "OrderRequest": (OldOrderRequest, OrderRequest, (256265, 50, "MARKET", "BUY")),
+    "Position": (OldPosition, Position, (256265, 50, 24850.5, 0.0)),
+}
+
+
+def construct_ns(cls: Callable, args: tuple, n: int) -> float:
+    """Best-of-5 construction time per object, in nanoseconds."""
+    timer = timeit.Timer(lambda: cls(*args))
+    return min(timer.repeat(repeat=5, number=n)) / n * 1e9
+
+
+def access_ns(obj, n: int) -> float:
+    """Best-of-5 first-attribute read time, in nanoseconds."""
+    field = next(iter(getattr(obj, "_fields", None) or obj.__dataclass_fields__))
+    timer = timeit.Timer(f"obj.{field}", globals={"obj": obj})
+    return min(timer.repeat(repeat=5, number=n)) / n * 1e9
+
+
+def bytes_per_object(cls: Callable, args: tuple, n: int) -> float:
+    """Traced allocation per live object (instance + __dict__, if any)."""
+    gc.collect()
+    tracemalloc.start()
+    objects = [cls(*args) for _ in range(n)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # subtract the list holding them
+    size -= objects.__sizeof__()
+    return size / n
+
+
+def run(n: int) -> Dict[str, Dict[str, float]]:
+    results = {}
+    for name, (old, new, args) in CASES.items():
+        results[name] = {
+            "old_construct_ns": construct_ns(old, args, n),
+            "new_construct_ns": construct_ns(new, args, n),
+            "old_access_ns": access_ns(old(*args), n),
+            "new_access_ns": access_ns(new(*args), n),
+            "old_bytes": bytes_per_object(old, args, n),
+            "new_bytes": bytes_per_object(new, args, n),
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--n", type=int, default=200_000, help="objects per measurement")
+    args = parser.parse_args()
+
+    results = run(args.n)
+
+    header = f"{'type':<13}{'construct ns':>22}{'speedup':>9}{'access ns':>18}{'bytes/object':>18}"
+    print(header)
+    print("-" * len(header))
+    for name, r in results.items():
+        print(f"{name:<13}"
+              f"{r['old_construct_ns']:>10.1f} → {r['new_construct_ns']:>7.1f}"
+              f"{r['old_construct_ns'] / r['new_construct_ns']:>8.1f}x"
+              f"{r['old_access_ns']:>8.1f} → {r['new_access_ns']:>5.1f}"
+              f"{r['old_bytes']:>8.0f} → {r['new_bytes']:>5.0f}")
+
+
+if __name__ == "__main__":
+    main()
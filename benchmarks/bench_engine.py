@@ -0,0 +1,158 @@
+"""
+End-to-end throughput benchmark for Engine.run.
+
+Drives the real vol models, strategies and a dummy or simulated broker
+with a deterministic synthetic feed, and reports per scenario:
+  - ticks/sec, with instrumentation off and on
+  - latency percentiles per engine stage (state, positions, models,
+    strategies, risk, ...) and per (component, token)
+  - peak traced memory
+Results are written as JSON so runs can be diffed between commits.
+
+    python -m benchmarks.bench_engine --instruments 1 50 500 --ticks 50000
+"""
+# benchmarks/bench_engine.py
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from benchmarks.synthetic_feed import SyntheticFeed
+from core.engine.clock import ReplayClock
+from core.engine.execution import OrderExecutor
+from core.engine.instrumentation import Instrumentation
+from core.engine.runner import Engine
+from infra.backtest.simulated_broker import SimulatedBroker
+from infra.dummy.dummy_broker import DummyBroker
+from infra.dummy.dummy_risk import DummyRiskManager
+from strategies.option_strategies.high_vol_long_straddle import HighVolLongStraddleStrategy
+from strategies.option_strategies.long_vol_short_condor import LowVolShortCondorStrategy
+from strategies.vol_models.atr_vol_model import ATRVolModel
+from strategies.vol_models.ewma_vol_model import EWMAVolModel
+from strategies.vol_models.garch_vol_model import GARCHVolModel
+from strategies.vol_models.realized_vol_model import RealizedVolModel
+
+DEFAULT_OUTPUT = os.path.join("benchmarks", "results", "bench_engine.json")
+
+
+def build_components(tokens: List[int]) -> Tuple[List, List]:
+    """The vol models and strategies every benchmark runs for `tokens`."""
+    vol_models = []
+    strategies = []
+    for token in tokens:
+        vol_models += [
+            RealizedVolModel(token, lookback=30, high_threshold=0.0016, low_threshold=0.0006),
+            EWMAVolModel(token, high_threshold=0.0016, low_threshold=0.0006),
+            GARCHVolModel(token, high_threshold=0.0016, low_threshold=0.0006),
+            ATRVolModel(token, high_threshold=0.004, low_threshold=0.002),
+        ]
+        strategies += [
+            HighVolLongStraddleStrategy(underlying_token=token),
+            LowVolShortCondorStrategy(underlying_token=token),
+        ]
+    return vol_models, strategies
+
+
+def build_engine(instruments: int, ticks: int, broker_kind: str, seed: int) -> Engine:
+    """One engine wired like a backtest, over a fresh synthetic feed."""
+    feed = SyntheticFeed(instruments, ticks, seed=seed)
+    broker = SimulatedBroker() if broker_kind == "simulated" else DummyBroker()
+    vol_models, strategies = build_components(feed.tokens)
+
+    return Engine(feed, broker, vol_models, strategies, DummyRiskManager(),
+                  position_sync_interval=None,
+                  executor=OrderExecutor(broker, max_workers=0),
+                  clock=ReplayClock())
+
+
+def run_engine(engine: Engine) -> float:
+    """Run to completion with stdout silenced; returns wall seconds."""
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        engine.run()
+    return time.perf_counter() - started
+
+
+def run_scenario(instruments: int, ticks: int, broker_kind: str, seed: int) -> Dict:
+    # 1. throughput, uninstrumented
+    engine = build_engine(instruments, ticks, broker_kind, seed)
+    elapsed = run_engine(engine)
+    result = {
+        "instruments": instruments,
+        "ticks": engine.tick_count,
+        "actions": engine.action_count,
+        "seconds": elapsed,
+        "ticks_per_sec": engine.tick_count / elapsed if elapsed else 0.0,
+    }
+
+    # 2. stage/component latencies from the engine's own instrumentation
+    engine = build_engine(instruments, ticks, broker_kind, seed)
+    engine.instrumentation = Instrumentation(sink=lambda report: None)
+    elapsed = run_engine(engine)
+    report = engine.instrumentation.report()
+    result["instrumented_ticks_per_sec"] = engine.tick_count / elapsed if elapsed else 0.0
+    result["stages"] = report["stages"]
+    result["components"] = report["components"]
+
+    # 3. peak memory, including the engine's components
+    tracemalloc.start()
+    engine = build_engine(instruments, ticks, broker_kind, seed)
+    run_engine(engine)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    result["peak_memory_mb"] = peak / 2**20
+
+    return result
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--instruments", type=int, nargs="+", default=[1, 50, 500])
+    parser.add_argument("--ticks", type=int, default=50_000, help="total ticks per scenario")
+    parser.add_argument("--broker", choices=("dummy", "simulated"), default="simulated")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    args = parser.parse_args()
+
+    scenarios = []
+    for instruments in args.instruments:
+        result = run_scenario(instruments, args.ticks, args.broker, args.seed)
+        scenarios.append(result)
+        stages = "  ".join(f"{s} p99={r['p99_us']:.1f}us" for s, r in result["stages"].items()
+                           if s in ("state", "positions", "models", "strategies", "risk"))
+        print(f"{instruments:>4} instruments: {result['ticks_per_sec']:>10,.0f} ticks/s  "
+              f"peak {result['peak_memory_mb']:.1f} MB  {stages}")
+
+    report = {
+        "benchmark": "engine",
+        "revision": git_revision(),
+        "created": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "config": {"ticks": args.ticks, "broker": args.broker, "seed": args.seed},
+        "scenarios": scenarios,
+    }
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"results → {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Throughput scaling benchmark for ShardedEngine.
+
+Runs the same synthetic feed, vol models and strategies (see
+bench_engine.build_components) through a single Engine and through
+ShardedEngine with an increasing shard count, against a DummyBroker, and
+reports ticks/sec and the speedup over the single process. The feed
+delivers one batch per simulated second holding every instrument's tick,
+like a websocket message at the open.
+
+Speedups need at least shards + 1 free cores (the front process routes
+every tick); on a single core the numbers only show the routing overhead.
+
+    python -m benchmarks.bench_sharded --instruments 500 --ticks 200000 --shards 1 2 4 8
+"""
+# benchmarks/bench_sharded.py
+
+import argparse
+import json
+import os
+import platform
+from datetime import datetime, timezone
+from typing import Dict
+
+from benchmarks.bench_engine import build_components, git_revision, run_engine
+from benchmarks.synthetic_feed import SyntheticFeed
+from core.engine.clock import ReplayClock
+from core.engine.execution import OrderExecutor
+from core.engine.runner import Engine
+from core.engine.sharded_runner import ShardedEngine
+from infra.dummy.dummy_broker import DummyBroker
+from infra.dummy.dummy_risk import DummyRiskManager
+
+DEFAULT_OUTPUT = os.path.join("benchmarks", "results", "bench_sharded.json")
+
+
+def build_single(instruments: int, ticks: int, seed: int) -> Engine:
+    feed = SyntheticFeed(instruments, ticks, seed=seed, batch_size=instruments)
+    broker = DummyBroker()
+    vol_models, strategies = build_components(feed.tokens)
+    return Engine(feed, broker, vol_models, strategies, DummyRiskManager(),
+                  position_sync_interval=None,
+                  executor=OrderExecutor(broker, max_workers=0),
+                  clock=ReplayClock())
+
+
+def build_sharded(instruments: int, ticks: int, seed: int, shards: int) -> ShardedEngine:
+    feed = SyntheticFeed(instruments, ticks, seed=seed, batch_size=instruments)
+    broker = DummyBroker()
+    return ShardedEngine(feed, broker, build_components, feed.tokens, DummyRiskManager(),
+                         shards=shards,
+                         position_sync_interval=None,
+                         executor=OrderExecutor(broker, max_workers=0),
+                         clock=ReplayClock())
+
+
+def measure(engine) -> Dict:
+    elapsed = run_engine(engine)
+    return {
+        "ticks": engine.tick_count,
+        "actions": engine.action_count,
+        "seconds": elapsed,
+        "ticks_per_sec": engine.tick_count / elapsed if elapsed else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--instruments", type=int, default=500)
+    parser.add_argument("--ticks", type=int, default=200_000, help="total ticks per run")
+    parser.add_argument("--shards", type=int, nargs="+",
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    args = parser.parse_args()
+
+    baseline = measure(build_single(args.instruments, args.ticks, args.seed))
+    print(f"single engine: {baseline['ticks_per_sec']:>10,.0f} ticks/s  "
+          f"{baseline['actions']} actions")
+
+    scenarios = []
+    for shards in args.shards:
+        result = measure(build_sharded(args.instruments, args.ticks, args.seed, shards))
+        result["shards"] = shards
+        result["speedup"] = (result["ticks_per_sec"] / baseline["ticks_per_sec"]
+                             if baseline["ticks_per_sec"] else 0.0)
+        scenarios.append(result)
+        print(f"{shards:>3} shards:    {result['ticks_per_sec']:>10,.0f} ticks/s  "
+              f"x{result['speedup']:.2f}  {result['actions']} actions")
+
+    report = {
+        "benchmark": "sharded_engine",
+        "revision": git_revision(),
+        "created": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "config": {"instruments": args.instruments, "ticks": args.ticks, "seed": args.seed},
+        "baseline": baseline,
+        "scenarios": scenarios,
+    }
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"results → {args.output}")
+
+
+if __name__ == "__main__":
+    main()
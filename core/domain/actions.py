@@ -1,14 +1,22 @@
 """
 Domain actions for the trading system.
 """
-from dataclasses import dataclass
-from typing import Optional
+from typing import Dict, NamedTuple, Optional
 
-@dataclass(frozen=True)
-class TradeAction:
+class TradeAction(NamedTuple):
     """Represents a trading action decided by a strategy."""
     action_type: str
     instrument_token: int
     quantity: int
     price: Optional[float] = None
-    metadata: Optional[dict] = None
\ No newline at end of file
+    metadata: Optional[dict] = None
+
+# action_type → broker transaction type
+ACTION_SIDES: Dict[str, str] = {
+    "OPEN_LONG": "BUY",
+    "CLOSE_SHORT": "BUY",
+    "OPEN_SHORT": "SELL",
+    "CLOSE_LONG": "SELL",
+    "BUY": "BUY",
+    "SELL": "SELL",
+}
@@ -0,0 +1,144 @@
+"""
+Columnar ring buffer for recent candles.
+"""
+# core/domain/candle_buffer.py
+
+from datetime import datetime, timezone, tzinfo
+from typing import Iterable, Iterator, List, Optional, Union, overload
+
+import numpy as np
+
+from core.domain.types import Candle
+
+NO_OI = -1   # stored in the oi column for candles without open interest
+
+_FLOAT_COLUMNS = ("timestamp", "open", "high", "low", "close")
+_INT_COLUMNS = ("volume", "oi")
+
+
+class CandleRingBuffer:
+    """
+    Fixed-capacity OHLCV history for one instrument, stored as NumPy columns.
+
+    Every row is written twice, at slot i and i + capacity, so the last n
+    rows are always one contiguous slice: `closes(n)` and friends return
+    read-only views without copying or building Candle objects.
+    Indexing/iteration still yield Candles (oldest first) for callers that
+    want them; those are created on demand.
+
+    Timestamps are stored as epoch seconds; naive datetimes are treated as
+    UTC so they round-trip unchanged.
+    """
+
+    def __init__(self, instrument_token: int, capacity: int = 500):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.instrument_token = instrument_token
+        self.capacity = capacity
+        self._columns = {name: np.zeros(2 * capacity, dtype=np.float64)
+                         for name in _FLOAT_COLUMNS}
+        self._columns.update({name: np.zeros(2 * capacity, dtype=np.int64)
+                              for name in _INT_COLUMNS})
+        self._count = 0       # rows ever appended
+        self._end = capacity  # one past the newest row in the second half
+        self._tz: Optional[tzinfo] = None
+        self._naive = True
+
+    # ------------ writes -----------------
+
+    def append(self, candle: Candle) -> None:
+        """Append a bar, evicting the oldest once full."""
+        if self._count == 0:
+            self._tz = candle.timestamp.tzinfo
+            self._naive = self._tz is None
+
+        ts = candle.timestamp
+        if self._naive:
+            ts = ts.replace(tzinfo=timezone.utc)
+
+        slot = self._count % self.capacity
+        row = (ts.timestamp(), candle.open, candle.high, candle.low, candle.close,
+               candle.volume, NO_OI if candle.oi is None else candle.oi)
+        for name, value in zip(_FLOAT_COLUMNS + _INT_COLUMNS, row):
+            column = self._columns[name]
+            column[slot] = value
+            column[slot + self.capacity] = value
+
+        self._count += 1
+        self._end = slot + self.capacity + 1
+
+    def extend(self, candles: Iterable[Candle]) -> None:
+        """Append several bars in order."""
+        for candle in candles:
+            self.append(candle)
+
+    # ------------ zero-copy views -----------------
+
+    def column(self, name: str, n: Optional[int] = None) -> np.ndarray:
+        """Read-only view of the last `n` values of a column (all by default)."""
+        size = len(self)
+        n = size if n is None else min(n, size)
+        view = self._columns[name][self._end - n:self._end]
+        view.flags.writeable = False
+        return view
+
+    def timestamps(self, n: Optional[int] = None) -> np.ndarray:
+        return self.column("timestamp", n)
+
+    def opens(self, n: Optional[int] = None) -> np.ndarray:
+        return self.column("open", n)
+
+    def highs(self, n: Optional[int] = None) -> np.ndarray:
+        return self.column("high", n)
+
+    def lows(self, n: Optional[int] = None) -> np.ndarray:
+        return self.column("low", n)
+
+    def closes(self, n: Optional[int] = None) -> np.ndarray:
+        return self.column("close", n)
+
+    def volumes(self, n: Optional[int] = None) -> np.ndarray:
+        return self.column("volume", n)
+
+    # ------------ sequence of Candles -----------------
+
+    def __len__(self) -> int:
+        return min(self._count, self.capacity)
+
+    @overload
+    def __getitem__(self, index: int) -> Candle: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[Candle]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Candle, List[Candle]]:
+        size = len(self)
+        if isinstance(index, slice):
+            return [self._candle_at(i) for i in range(*index.indices(size))]
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("candle index out of range")
+        return self._candle_at(index)
+
+    def __iter__(self) -> Iterator[Candle]:
+        for i in range(len(self)):
+            yield self._candle_at(i)
+
+    def _candle_at(self, index: int) -> Candle:
+        row = self._end - len(self) + index
+        cols = self._columns
+        ts = datetime.fromtimestamp(cols["timestamp"][row], self._tz or timezone.utc)
+        if self._naive:
+            ts = ts.replace(tzinfo=None)
+        oi = int(cols["oi"][row])
+        return Candle(
+            instrument_token=self.instrument_token,
+            timestamp=ts,
+            open=float(cols["open"][row]),
+            high=float(cols["high"][row]),
+            low=float(cols["low"][row]),
+            close=float(cols["close"][row]),
+            volume=int(cols["volume"][row]),
+            oi=None if oi == NO_OI else oi,
+        )
@@ -0,0 +1,20 @@
+"""
+Domain events for the trading system.
+"""
+from dataclasses import dataclass
+from core.domain.actions import TradeAction
+from core.domain.types import Candle, OrderRequest, OrderExecutionReport
+
+@dataclass(frozen=True)
+class ExecutionEvent:
+    """An execution report for an order the engine submitted."""
+    action: TradeAction
+    order: OrderRequest
+    report: OrderExecutionReport
+
+@dataclass(frozen=True)
+class BarClosed:
+    """A completed OHLCV bar built from ticks."""
+    instrument_token: int
+    interval: int          # seconds
+    candle: Candle
@@ -2,11 +2,10 @@
 Domain signals for the trading system.
 """
 
-from dataclasses import dataclass
 from datetime import datetime
+from typing import NamedTuple
 
-@dataclass(frozen=True)
-class VolSignal:
+class VolSignal(NamedTuple):
     """Represents a volatility signal generated by a model."""
     instrument_token: int
     kind: str
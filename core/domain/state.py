@@ -1,14 +1,25 @@
 """
 Domain state for the trading system.
 """
-from dataclasses import dataclass
-from typing import Dict, List
-from core.domain.types import Tick, Candle
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+from core.domain.candle_buffer import CandleRingBuffer
+from core.domain.types import Tick
 
 @dataclass
 class MarketState:
     """Represents the aggregate market state."""
     last_ticks: Dict[int, Tick]
-    recent_candles: Dict[int, List[Candle]]
+    recent_candles: Dict[int, CandleRingBuffer]   # base interval bars
     positions: Dict[int, int]
-    timestamp: float
\ No newline at end of file
+    timestamp: float
+    # interval (seconds) → instrument_token → bars
+    candles_by_interval: Dict[int, Dict[int, CandleRingBuffer]] = field(default_factory=dict)
+
+    def candles(self, instrument_token: int,
+                interval: Optional[int] = None) -> Optional[CandleRingBuffer]:
+        """Bars for a token at an interval; falls back to recent_candles."""
+        by_token = self.candles_by_interval.get(interval) if interval else None
+        if by_token is None:
+            by_token = self.recent_candles
+        return by_token.get(instrument_token)
@@ -1,12 +1,15 @@
 """
 Domain types for the trading system.
+
+These are NamedTuples rather than frozen dataclasses: they are created at
+full tick rate, and tuple construction skips the per-field
+object.__setattr__ and the per-instance __dict__. Use `._replace()` to
+derive modified copies.
 """
-from dataclasses import dataclass
-from datetime import datetime
-from typing import Optional
+from datetime import date, datetime
+from typing import NamedTuple, Optional
 
-@dataclass(frozen=True)
-class Tick:
+class Tick(NamedTuple):
     """Represents a market tick update."""
     instrument_token: int
     timestamp: datetime
@@ -14,8 +17,7 @@ class Tick:
     volume: int
     oi: Optional[int] = None
 
-@dataclass(frozen=True)
-class Candle:
+class Candle(NamedTuple):
     """Represents a market candle (OHLCV) update."""
     instrument_token: int
     timestamp: datetime
@@ -26,8 +28,7 @@ class Candle:
     volume: int
     oi: Optional[int] = None
 
-@dataclass(frozen=True)
-class OrderRequest:
+class OrderRequest(NamedTuple):
     """Represents a request to place an order."""
     instrument_token: int
     quantity: int
@@ -35,8 +36,7 @@ class OrderRequest:
     transaction_type: str  # BUY/SELL
     price: Optional[float] = None
 
-@dataclass(frozen=True)
-class OrderExecutionReport:
+class OrderExecutionReport(NamedTuple):
     """Represents a report of an order execution."""
     order_id: str
     status: str            # FILLED, REJECTED, CANCELLED
@@ -44,10 +44,22 @@ class OrderExecutionReport:
     avg_price: float
     timestamp: datetime
 
-@dataclass(frozen=True)
-class Position:
+class Position(NamedTuple):
     """Represents a current holding position."""
     instrument_token: int
     quantity: int
     avg_price: float
-    pnl: float
\ No newline at end of file
+    pnl: float
+
+class Instrument(NamedTuple):
+    """Reference data for a tradable instrument (one row of the broker's master)."""
+    instrument_token: int
+    exchange: str          # NSE, BSE, NFO, ...
+    tradingsymbol: str
+    name: str              # underlying name for derivatives, e.g. NIFTY
+    instrument_type: str   # EQ, FUT, CE, PE
+    segment: str
+    expiry: Optional[date]
+    strike: float
+    tick_size: float
+    lot_size: int
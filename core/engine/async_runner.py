@@ -0,0 +1,323 @@
+"""
+The async runner module drives the engine pipeline from an asyncio event loop.
+"""
+# core/engine/async_runner.py
+
+import asyncio
+import inspect
+import logging
+import threading
+from typing import (AsyncIterator, Awaitable, Callable, Dict, List, Optional, Sequence,
+                    Set, Tuple, Union)
+
+from core.engine.bar_builder import DEFAULT_BAR_INTERVALS, DEFAULT_MAX_BARS
+from core.engine.execution import to_order
+from core.engine.instrumentation import Instrumentation
+from core.engine.option_resolver import OptionResolver
+from core.engine.position_cache import PositionCache
+from core.engine.runner import Engine
+from core.ports.broker import AsyncBroker, Broker
+from core.ports.clock import Clock
+from core.ports.market_data import AsyncMarketDataFeed, MarketDataFeed
+from core.ports.risk import RiskManager
+from core.ports.strategy import Strategy
+from core.ports.vol_model import VolatilityModel
+from core.domain.actions import TradeAction
+from core.domain.events import ExecutionEvent
+from core.domain.types import OrderRequest, OrderExecutionReport, Position, Tick
+
+logger = logging.getLogger(__name__)
+
+TimerCallback = Callable[[], Union[None, Awaitable[None]]]
+
+
+class AsyncBrokerAdapter(AsyncBroker):
+    """
+    Exposes a blocking Broker as an AsyncBroker.
+    Every call runs in a worker thread, so a slow HTTP round trip never
+    holds up the event loop. `on_tick` stays inline (simulated brokers
+    match fills against it in memory).
+    """
+
+    def __init__(self, broker: Broker):
+        self.broker = broker
+
+    async def place_order(self, order: OrderRequest) -> OrderExecutionReport:
+        return await asyncio.to_thread(self.broker.place_order, order)
+
+    async def modify_order(self, order_id: str, **kwargs) -> OrderExecutionReport:
+        return await asyncio.to_thread(self.broker.modify_order, order_id, **kwargs)
+
+    async def cancel_order(self, order_id: str) -> None:
+        await asyncio.to_thread(self.broker.cancel_order, order_id)
+
+    async def get_positions(self) -> List[Position]:
+        return await asyncio.to_thread(self.broker.get_positions)
+
+    def on_tick(self, tick: Tick) -> List[OrderExecutionReport]:
+        return self.broker.on_tick(tick)
+
+    def set_clock(self, clock: Clock) -> None:
+        self.clock = clock
+        self.broker.set_clock(clock)
+
+
+_DONE = object()
+
+
+class AsyncFeedAdapter(AsyncMarketDataFeed):
+    """
+    Exposes a blocking MarketDataFeed as an AsyncMarketDataFeed.
+
+    A daemon thread drives `feed.stream()` and hands ticks to the event
+    loop; at most `max_pending` ticks wait in between, after which the
+    thread blocks on the feed's side, never on the loop's.
+    """
+
+    def __init__(self, feed: MarketDataFeed, max_pending: int = 10_000):
+        self.feed = feed
+        self.max_pending = max_pending
+
+    def subscribe(self, instruments: List[int]) -> None:
+        self.feed.subscribe(instruments)
+
+    async def astream(self) -> AsyncIterator[Tick]:
+        loop = asyncio.get_running_loop()
+        pending: "asyncio.Queue" = asyncio.Queue()
+        slots = threading.Semaphore(self.max_pending)
+        stopped = threading.Event()
+
+        def publish(item) -> bool:
+            try:
+                loop.call_soon_threadsafe(pending.put_nowait, item)
+                return True
+            except RuntimeError:  # loop closed under us
+                return False
+
+        def produce():
+            try:
+                for tick in self.feed.stream():
+                    while not slots.acquire(timeout=0.1):
+                        if stopped.is_set():
+                            return
+                    if stopped.is_set() or not publish(tick):
+                        return
+            except Exception as exc:
+                publish(exc)
+            finally:
+                publish(_DONE)
+
+        threading.Thread(target=produce, name="feed-adapter", daemon=True).start()
+        try:
+            while True:
+                item = await pending.get()
+                if item is _DONE:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                slots.release()
+                yield item
+        finally:
+            stopped.set()
+
+
+class AsyncOrderExecutor:
+    """
+    Event-loop counterpart of OrderExecutor.
+
+    - every action becomes one task awaiting the broker, so the tick that
+      produced it is not held up by the round trip
+    - at most `max_pending` broker calls are in flight; later orders wait
+      their turn inside their task
+    - reports come back as ExecutionEvents, collected by `drain()`
+    """
+
+    def __init__(self, broker: AsyncBroker, max_pending: int = 64):
+        self.broker = broker
+        self._slots = asyncio.Semaphore(max_pending)
+        self._events: List[ExecutionEvent] = []
+        self._tasks: Set[asyncio.Task] = set()
+
+        # order_id → (action, order), to attach reports that arrive later
+        self._orders: Dict[str, Tuple[TradeAction, OrderRequest]] = {}
+
+    @property
+    def pending(self) -> int:
+        """Orders submitted but not yet acknowledged by the broker."""
+        return len(self._tasks)
+
+    def submit(self, actions: List[TradeAction]) -> None:
+        """Map actions to orders and schedule them on the running loop."""
+        for action in actions:
+            try:
+                order = to_order(action)
+            except ValueError:
+                logger.exception("Dropping action %s", action)
+                continue
+
+            task = asyncio.get_running_loop().create_task(self._place(action, order))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    def on_report(self, report: OrderExecutionReport) -> None:
+        """Publish a later report (fill, cancel) for an order we submitted."""
+        entry = self._orders.get(report.order_id)
+        if entry is None:
+            return
+        action, order = entry
+        self._events.append(ExecutionEvent(action, order, report))
+
+    def drain(self) -> List[ExecutionEvent]:
+        """Return every execution event received since the last drain."""
+        events, self._events = self._events, []
+        return events
+
+    async def aclose(self) -> None:
+        """Wait for in-flight orders to finish."""
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    async def _place(self, action: TradeAction, order: OrderRequest) -> None:
+        async with self._slots:
+            try:
+                report = await self.broker.place_order(order)
+            except Exception:  # the broker adapter decides what is retryable
+                logger.exception("Order failed: %s", order)
+                report = OrderExecutionReport(
+                    order_id="",
+                    status="REJECTED",
+                    filled_quantity=0,
+                    avg_price=0.0,
+                    timestamp=self.broker.clock.now(),
+                )
+            else:
+                self._orders[report.order_id] = (action, order)
+
+        logger.info("Order %s %s x%s → %s", order.transaction_type,
+                    order.instrument_token, order.quantity, report.status)
+        self._events.append(ExecutionEvent(action, order, report))
+
+
+class AsyncEngine(Engine):
+    """
+    The Engine pipeline driven by `async for` over an AsyncMarketDataFeed.
+
+    Ticks run through the same synchronous pipeline as Engine; everything
+    that waits on the outside world runs as a task on the same loop:
+      - order placement (AsyncOrderExecutor)
+      - position syncs, every `position_sync_interval` seconds and soon
+        after each fill
+      - timers registered with `add_timer`
+    The loop yields after every tick (or batch), so those tasks make
+    progress even when the feed always has data ready.
+    """
+
+    def __init__(self,
+                 feed: AsyncMarketDataFeed,
+                 broker: AsyncBroker,
+                 vol_models: List[VolatilityModel],
+                 strategies: List[Strategy],
+                 risk_mgr: RiskManager,
+                 state_repo=None,
+                 position_sync_interval: Optional[float] = 5.0,
+                 max_pending_orders: int = 64,
+                 bar_intervals: Sequence[int] = DEFAULT_BAR_INTERVALS,
+                 max_bars: int = DEFAULT_MAX_BARS,
+                 instrumentation: Optional[Instrumentation] = None,
+                 batch_mode: bool = False,
+                 clock: Optional[Clock] = None,
+                 resolver: Optional[OptionResolver] = None):
+        super().__init__(feed, broker, vol_models, strategies, risk_mgr,
+                         state_repo=state_repo,
+                         position_sync_interval=None,
+                         executor=AsyncOrderExecutor(broker, max_pending_orders),
+                         bar_intervals=bar_intervals,
+                         max_bars=max_bars,
+                         instrumentation=instrumentation,
+                         batch_mode=batch_mode,
+                         clock=clock,
+                         resolver=resolver)
+        # positions are loaded by the sync task; the pipeline only reads them
+        self.positions = PositionCache(None, clock=self.clock.monotonic)
+        self.position_sync_interval = position_sync_interval
+        self._timers: List[Tuple[float, TimerCallback]] = []
+        self._resync: Optional[asyncio.Event] = None
+        self._stopping = False
+
+    def add_timer(self, interval: float, callback: TimerCallback) -> None:
+        """Call `callback` (plain or async) every `interval` seconds while running."""
+        self._timers.append((interval, callback))
+
+    def on_execution_report(self, order: OrderRequest, report: OrderExecutionReport):
+        super().on_execution_report(order, report)
+        if report.status == "FILLED" and self._resync is not None:
+            self._resync.set()
+
+    def run(self):
+        """Blocking entry point, for callers outside an event loop."""
+        asyncio.run(self.arun())
+
+    async def arun(self):
+        """Main loop; returns when the feed is exhausted."""
+        print("Engine started...")
+
+        self._resync = asyncio.Event()
+        self._stopping = False
+        await self._sync_positions()
+        tasks = [asyncio.create_task(self._position_sync_loop())]
+        tasks += [asyncio.create_task(self._timer_loop(interval, callback))
+                  for interval, callback in self._timers]
+
+        try:
+            if self.batch_mode:
+                async for batch in self.feed.astream_batches():
+                    if batch:
+                        self._on_batch(batch)
+                    await asyncio.sleep(0)
+            else:
+                async for tick in self.feed.astream():
+                    self._on_batch((tick,))
+                    await asyncio.sleep(0)
+        finally:
+            # wait_for can swallow a cancel that lands as the resync event
+            # fires, so the sync loop also checks an explicit stop flag
+            self._stopping = True
+            self._resync.set()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await self.executor.aclose()
+            self._process_execution_events()
+            if self.instrumentation is not None and self.instrumentation.enabled:
+                self.instrumentation.dump()
+
+    async def _sync_positions(self):
+        try:
+            positions = await self.broker.get_positions()
+        except Exception:
+            logger.exception("Position sync failed")
+            return
+        self.positions.load(positions)
+
+    async def _position_sync_loop(self):
+        """Resync on the interval, or as soon as a fill comes in."""
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._resync.wait(), self.position_sync_interval)
+            except asyncio.TimeoutError:
+                pass
+            if self._stopping:
+                return
+            self._resync.clear()
+            await self._sync_positions()
+
+    @staticmethod
+    async def _timer_loop(interval: float, callback: TimerCallback):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                result = callback()
+                if inspect.isawaitable(result):
+                    await result
+            except Exception:
+                logger.exception("Timer callback %r failed", callback)
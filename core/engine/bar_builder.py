@@ -0,0 +1,139 @@
+"""
+The bar builder module aggregates ticks into OHLCV bars.
+"""
+# core/engine/bar_builder.py
+
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from core.domain.candle_buffer import CandleRingBuffer
+from core.domain.events import BarClosed
+from core.domain.types import Candle, Tick
+
+DEFAULT_BAR_INTERVALS = (60, 300, 900)   # 1m / 5m / 15m
+DEFAULT_MAX_BARS = 500
+
+
+class _OpenBar:
+    """The bar currently being built for one (interval, token)."""
+
+    __slots__ = ("start", "end", "open", "high", "low", "close", "volume_base", "volume", "oi")
+
+    def __init__(self, start: datetime, end: datetime, tick: Tick, volume_base: int):
+        self.start = start
+        self.end = end
+        self.open = self.high = self.low = self.close = tick.last_price
+        self.volume_base = volume_base
+        self.volume = tick.volume
+        self.oi = tick.oi
+
+    def update(self, tick: Tick) -> None:
+        price = tick.last_price
+        if price > self.high:
+            self.high = price
+        elif price < self.low:
+            self.low = price
+        self.close = price
+        self.volume = tick.volume
+        self.oi = tick.oi
+
+    def to_candle(self, token: int) -> Candle:
+        return Candle(
+            instrument_token=token,
+            timestamp=self.start,
+            open=self.open,
+            high=self.high,
+            low=self.low,
+            close=self.close,
+            volume=max(self.volume - self.volume_base, 0),
+            oi=self.oi,
+        )
+
+
+class BarBuilder:
+    """
+    Incremental tick → OHLCV aggregation for several intervals at once.
+
+    - bars are aligned to wall-clock boundaries of the tick timestamps
+      (e.g. 09:15, 09:30 for 15m); intervals must divide a day
+    - a bar closes when the first tick of a later bar arrives for the same
+      token; each close is returned as a BarClosed event
+    - closed bars are kept per (interval, token) in columnar ring buffers
+    - tick volume is the exchange's cumulative day volume (Kite's
+      `volume`), so a bar's volume is the increase across the bar; every
+      feed must follow this (BacktestFeed replays candles that way)
+    """
+
+    def __init__(self,
+                 intervals: Sequence[int] = DEFAULT_BAR_INTERVALS,
+                 max_bars: int = DEFAULT_MAX_BARS):
+        if not intervals:
+            raise ValueError("BarBuilder needs at least one interval")
+        for interval in intervals:
+            if interval <= 0 or 86400 % interval:
+                raise ValueError(f"Bar interval must divide a day: {interval}s")
+
+        self.intervals: Tuple[int, ...] = tuple(sorted(set(intervals)))
+        self.max_bars = max_bars
+
+        # interval → token → closed bars (oldest first)
+        self.history: Dict[int, Dict[int, CandleRingBuffer]] = {i: {} for i in self.intervals}
+        self._open: Dict[Tuple[int, int], _OpenBar] = {}
+
+    @property
+    def base_interval(self) -> int:
+        """The shortest interval."""
+        return self.intervals[0]
+
+    def on_tick(self, tick: Tick) -> List[BarClosed]:
+        """Fold a tick into every interval; return the bars it closed."""
+        token = tick.instrument_token
+        ts = tick.timestamp
+        closed: List[BarClosed] = []
+
+        for interval in self.intervals:
+            key = (interval, token)
+            bar = self._open.get(key)
+
+            if bar is not None and ts < bar.end:
+                # hot path → same bar
+                bar.update(tick)
+                continue
+
+            volume_base = tick.volume
+            if bar is not None:
+                candle = bar.to_candle(token)
+                self._bars(interval, token).append(candle)
+                closed.append(BarClosed(token, interval, candle))
+                # cumulative volume resets at the start of a day
+                if tick.volume >= bar.volume:
+                    volume_base = bar.volume
+
+            start = self._bar_start(ts, interval)
+            self._open[key] = _OpenBar(start, start + timedelta(seconds=interval),
+                                       tick, volume_base)
+
+        return closed
+
+    def bars(self, token: int, interval: Optional[int] = None) -> CandleRingBuffer:
+        """Closed bars for a token (base interval by default)."""
+        return self._bars(interval or self.base_interval, token)
+
+    def seed(self, token: int, candles: Sequence[Candle], interval: Optional[int] = None) -> None:
+        """Replace a token's history, e.g. with bars loaded at startup."""
+        interval = interval or self.base_interval
+        bars = self.history[interval][token] = CandleRingBuffer(token, self.max_bars)
+        bars.extend(candles)
+
+    def _bars(self, interval: int, token: int) -> CandleRingBuffer:
+        per_token = self.history[interval]
+        bars = per_token.get(token)
+        if bars is None:
+            bars = per_token[token] = CandleRingBuffer(token, self.max_bars)
+        return bars
+
+    @staticmethod
+    def _bar_start(ts: datetime, interval: int) -> datetime:
+        midnight = ts.replace(hour=0, minute=0, second=0, microsecond=0)
+        seconds = (ts - midnight).total_seconds()
+        return midnight + timedelta(seconds=seconds - seconds % interval)
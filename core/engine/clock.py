@@ -0,0 +1,33 @@
+"""
+The clock module provides replay time for backtests.
+"""
+# core/engine/clock.py
+
+from datetime import datetime, timezone
+from typing import Optional
+
+from core.ports.clock import Clock
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+class ReplayClock(Clock):
+    """
+    Time taken from the replayed data instead of the system.
+
+    `now()` is the latest tick timestamp the engine has seen (`start`
+    before the first tick), so a backtest never reads the wall clock,
+    never waits on it, and yields the same timestamps on every run.
+    """
+
+    def __init__(self, start: Optional[datetime] = None):
+        self.start = start or EPOCH
+        self._now: Optional[datetime] = None
+
+    def now(self) -> datetime:
+        return self.start if self._now is None else self._now
+
+    def advance(self, timestamp: datetime) -> None:
+        # out-of-order ticks never move replay time backwards
+        if self._now is None or timestamp > self._now:
+            self._now = timestamp
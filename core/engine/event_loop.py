@@ -3,31 +3,42 @@ The event loop module manages the market state updates.
 """
 # core/engine/event_loop.py
 
-from typing import Dict, List
+from typing import Dict, List, Optional, Sequence
 from core.domain.state import MarketState
+from core.domain.events import BarClosed
 from core.domain.types import Tick, Candle
+from core.engine.bar_builder import BarBuilder, DEFAULT_BAR_INTERVALS, DEFAULT_MAX_BARS
 
 
 class EventLoop:
     """
     Maintains the current market state.
-    Turns all incoming ticks into updated MarketState objects.
+    Turns all incoming ticks into updated MarketState objects,
+    building OHLCV bars for every configured interval along the way.
     """
 
-    def __init__(self):
+    def __init__(self,
+                 bar_intervals: Sequence[int] = DEFAULT_BAR_INTERVALS,
+                 max_bars: int = DEFAULT_MAX_BARS):
+        self.bars = BarBuilder(bar_intervals, max_bars)
+        self.closed_bars: List[BarClosed] = []   # bars closed by the last tick
+
         self.state = MarketState(
             last_ticks={},         # instrument_token → Tick
-            recent_candles={},     # instrument_token → list[Candle]
+            recent_candles=self.bars.history[self.bars.base_interval],  # token → bars
             positions={},          # instrument_token → quantity
-            timestamp=0
+            timestamp=0,
+            candles_by_interval=self.bars.history,
         )
 
     def update_state_with_tick(self, tick: Tick) -> MarketState:
         """
-        Update the latest tick for the instrument.
+        Update the latest tick for the instrument and its bars.
+        Bars closed by this tick are published in `closed_bars`.
         """
         self.state.last_ticks[tick.instrument_token] = tick
         self.state.timestamp = tick.timestamp.timestamp()
+        self.closed_bars = self.bars.on_tick(tick)
         return self.state
 
     def update_positions(self, positions: Dict[int, int]):
@@ -35,10 +46,11 @@ class EventLoop:
         self.state.positions = positions
         return self.state
 
-    def set_candles(self, instrument_token: int, candles: List[Candle]):
-        """Update recent candles for an instrument."""
-        self.state.recent_candles[instrument_token] = candles
+    def set_candles(self, instrument_token: int, candles: List[Candle],
+                    interval: Optional[int] = None):
+        """Seed recent candles for an instrument (base interval by default)."""
+        self.bars.seed(instrument_token, candles, interval)
 
     def get_state(self) -> MarketState:
         """Return the current market state."""
-        return self.state
\ No newline at end of file
+        return self.state
@@ -0,0 +1,118 @@
+"""
+The execution module turns trade actions into broker orders.
+"""
+# core/engine/execution.py
+
+import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from core.ports.broker import Broker
+from core.domain.actions import ACTION_SIDES, TradeAction
+from core.domain.events import ExecutionEvent
+from core.domain.types import OrderRequest, OrderExecutionReport
+
+logger = logging.getLogger(__name__)
+
+
+def to_order(action: TradeAction) -> OrderRequest:
+    """Map a strategy action to a broker order request."""
+    side = ACTION_SIDES.get(action.action_type)
+    if side is None:
+        raise ValueError(f"Unsupported action type: {action.action_type}")
+
+    return OrderRequest(
+        instrument_token=action.instrument_token,
+        quantity=action.quantity,
+        order_type="LIMIT" if action.price is not None else "MARKET",
+        transaction_type=side,
+        price=action.price,
+    )
+
+
+class OrderExecutor:
+    """
+    Submits orders off the tick thread.
+
+    - every action becomes one task on a bounded thread pool, so all legs
+      of a structure (e.g. the 4 legs of a condor) are sent concurrently
+    - at most `max_pending` orders are in flight; `submit` blocks beyond that
+    - reports come back as ExecutionEvents, collected by `drain()`
+    - `max_workers=0` places orders inline on the caller's thread, which
+      keeps backtests deterministic
+    """
+
+    def __init__(self, broker: Broker, max_workers: int = 4, max_pending: int = 64):
+        self.broker = broker
+        self._pool: Optional[ThreadPoolExecutor] = (
+            ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="order")
+            if max_workers else None
+        )
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._events: "queue.Queue[ExecutionEvent]" = queue.Queue()
+
+        # order_id → (action, order), to attach reports that arrive later
+        self._lock = threading.Lock()
+        self._orders: Dict[str, Tuple[TradeAction, OrderRequest]] = {}
+
+    def submit(self, actions: List[TradeAction]) -> None:
+        """Map actions to orders and send them without waiting for the broker."""
+        for action in actions:
+            try:
+                order = to_order(action)
+            except ValueError:
+                logger.exception("Dropping action %s", action)
+                continue
+
+            if self._pool is None:
+                self._place(action, order)
+                continue
+
+            self._slots.acquire()
+            future = self._pool.submit(self._place, action, order)
+            future.add_done_callback(lambda _: self._slots.release())
+
+    def on_report(self, report: OrderExecutionReport) -> None:
+        """Publish a later report (fill, cancel) for an order we submitted."""
+        with self._lock:
+            entry = self._orders.get(report.order_id)
+        if entry is None:
+            return
+        action, order = entry
+        self._events.put(ExecutionEvent(action, order, report))
+
+    def drain(self) -> List[ExecutionEvent]:
+        """Return every execution event received since the last drain."""
+        events = []
+        while True:
+            try:
+                events.append(self._events.get_nowait())
+            except queue.Empty:
+                return events
+
+    def close(self) -> None:
+        """Wait for in-flight orders to finish."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+
+    def _place(self, action: TradeAction, order: OrderRequest) -> None:
+        try:
+            report = self.broker.place_order(order)
+        except Exception:  # the broker adapter decides what is retryable
+            logger.exception("Order failed: %s", order)
+            report = OrderExecutionReport(
+                order_id="",
+                status="REJECTED",
+                filled_quantity=0,
+                avg_price=0.0,
+                timestamp=self.broker.clock.now(),
+            )
+        else:
+            with self._lock:
+                self._orders[report.order_id] = (action, order)
+
+        logger.info("Order %s %s x%s → %s", order.transaction_type,
+                    order.instrument_token, order.quantity, report.status)
+        self._events.put(ExecutionEvent(action, order, report))
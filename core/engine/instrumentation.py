@@ -0,0 +1,174 @@
+"""
+The instrumentation module times engine stages and components.
+"""
+# core/engine/instrumentation.py
+
+import json
+import logging
+import signal
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# stage names, in pipeline order; "tick" is the whole pipeline
+STAGES = ("fills", "state", "positions", "models", "context", "strategies", "risk",
+          "execution", "tick")
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+class LatencyHistogram:
+    """
+    HDR-style log-linear histogram of nanosecond latencies.
+
+    Values below 2**sub_bucket_bits are counted exactly; above that every
+    power of two is split into 2**sub_bucket_bits linear sub-buckets, so the
+    relative error stays below 2**-sub_bucket_bits (~3% by default) across
+    the whole range. Recording is O(1) into a preallocated list.
+    """
+
+    def __init__(self, sub_bucket_bits: int = 5, max_bits: int = 40):
+        self._bits = sub_bucket_bits
+        self._sub = 1 << sub_bucket_bits
+        self._max_value = (1 << max_bits) - 1
+        self.counts = [0] * (self._sub * (max_bits - sub_bucket_bits + 1))
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+
+    def record(self, value: int) -> None:
+        """Record one latency in nanoseconds (clamped to the histogram range)."""
+        if value < 0:
+            value = 0
+        elif value > self._max_value:
+            value = self._max_value
+        self.counts[self._index(value)] += 1
+        if not self.count or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.count += 1
+        self.total += value
+
+    def percentile(self, p: float) -> int:
+        """Value at percentile `p` (0-100), as the midpoint of its bucket."""
+        if not self.count:
+            return 0
+        rank = max(1, -(-self.count * p // 100))   # ceil, at least the first value
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                low, high = self._bounds(index)
+                return min(max((low + high) // 2, self.min), self.max)
+        return self.max
+
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Add another histogram with the same layout into this one."""
+        for i, n in enumerate(other.counts):
+            if n:
+                self.counts[i] += n
+        if other.count and (not self.count or other.min < self.min):
+            self.min = other.min
+        self.max = max(self.max, other.max)
+        self.count += other.count
+        self.total += other.total
+
+    def summary(self) -> Dict[str, float]:
+        """count, mean, percentiles and max, in microseconds."""
+        out = {"count": self.count, "mean_us": self.mean() / 1e3}
+        for p in PERCENTILES:
+            out[f"p{p:g}_us"] = self.percentile(p) / 1e3
+        out["max_us"] = self.max / 1e3
+        return out
+
+    def _index(self, value: int) -> int:
+        if value < self._sub:
+            return value
+        shift = value.bit_length() - self._bits - 1
+        return self._sub * (shift + 1) + (value >> shift) - self._sub
+
+    def _bounds(self, index: int) -> Tuple[int, int]:
+        if index < self._sub:
+            return index, index
+        shift = index // self._sub - 1
+        low = (self._sub + index % self._sub) << shift
+        return low, low + (1 << shift) - 1
+
+
+class Instrumentation:
+    """
+    Latency histograms for engine stages and components.
+
+    The engine reads `enabled` once per tick; when it is False no clock is
+    read and nothing is recorded. Components are keyed by (name, token).
+    `dump()` emits a report on demand; with `dump_interval` set, the engine
+    also dumps every `dump_interval` seconds.
+    """
+
+    def __init__(self,
+                 enabled: bool = True,
+                 dump_interval: Optional[float] = None,
+                 sink: Optional[Callable[[dict], None]] = None,
+                 clock: Callable[[], int] = time.perf_counter_ns,
+                 wall_clock: Callable[[], float] = time.monotonic):
+        self.enabled = enabled
+        self.dump_interval = dump_interval
+        self.clock = clock
+        self._sink = sink or self._log
+        self._wall_clock = wall_clock
+        self._last_dump = wall_clock()
+
+        self.stages: Dict[str, LatencyHistogram] = {s: LatencyHistogram() for s in STAGES}
+        self.components: Dict[Tuple[str, Optional[int]], LatencyHistogram] = {}
+
+    def stage(self, name: str, elapsed_ns: int) -> None:
+        hist = self.stages.get(name)
+        if hist is None:
+            hist = self.stages[name] = LatencyHistogram()
+        hist.record(elapsed_ns)
+
+    def component(self, name: str, token: Optional[int], elapsed_ns: int) -> None:
+        key = (name, token)
+        hist = self.components.get(key)
+        if hist is None:
+            hist = self.components[key] = LatencyHistogram()
+        hist.record(elapsed_ns)
+
+    def report(self) -> dict:
+        """Summaries of every non-empty histogram."""
+        return {
+            "stages": {name: h.summary() for name, h in self.stages.items() if h.count},
+            "components": {f"{name}[{token}]": h.summary()
+                           for (name, token), h in self.components.items() if h.count},
+        }
+
+    def dump(self) -> dict:
+        """Send the current report to the sink and return it."""
+        report = self.report()
+        self._last_dump = self._wall_clock()
+        self._sink(report)
+        return report
+
+    def maybe_dump(self) -> None:
+        """Dump if `dump_interval` seconds have passed since the last dump."""
+        if self.dump_interval is not None and \
+                self._wall_clock() - self._last_dump >= self.dump_interval:
+            self.dump()
+
+    def reset(self) -> None:
+        """Drop every recorded sample."""
+        self.stages = {s: LatencyHistogram() for s in STAGES}
+        self.components = {}
+
+    def install_signal_handler(self, signum: int = getattr(signal, "SIGUSR1", 10)) -> None:
+        """Dump on a signal (SIGUSR1 by default), e.g. `kill -USR1 <pid>`."""
+        signal.signal(signum, lambda *_: self.dump())
+
+    @staticmethod
+    def _log(report: dict) -> None:
+        logger.info("engine latency report: %s", json.dumps(report, sort_keys=True))
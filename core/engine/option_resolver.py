@@ -0,0 +1,302 @@
+"""
+The option resolver module turns strategy legs into option contracts.
+"""
+# core/engine/option_resolver.py
+
+import logging
+from array import array
+from bisect import bisect_left
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from core.domain.actions import TradeAction
+from core.domain.types import Tick
+from core.ports.clock import Clocked
+
+logger = logging.getLogger(__name__)
+
+# index tradingsymbol in the instruments dump → the `name` its options are listed under
+INDEX_OPTION_NAMES: Dict[str, str] = {
+    "NIFTY 50": "NIFTY",
+    "NIFTY BANK": "BANKNIFTY",
+    "NIFTY FIN SERVICE": "FINNIFTY",
+    "NIFTY MID SELECT": "MIDCPNIFTY",
+    "SENSEX": "SENSEX",
+    "BANKEX": "BANKEX",
+}
+
+# strategy leg → option type
+LEG_TYPES: Dict[str, str] = {
+    "CALL": "CE",
+    "PUT": "PE",
+    "LONG_CALL": "CE",
+    "SHORT_CALL": "CE",
+    "LONG_PUT": "PE",
+    "SHORT_PUT": "PE",
+}
+
+_CLOSING = frozenset(("CLOSE_LONG", "CLOSE_SHORT"))
+
+LegKey = Tuple[int, Optional[str], str]   # (underlying, structure, leg)
+
+
+class OptionLeg(NamedTuple):
+    """A listed option contract chosen for a strategy leg."""
+    instrument_token: int
+    option_type: str   # CE, PE
+    strike: float
+    expiry: date
+    lot_size: int
+
+
+class _Expiry:
+    """One expiry of a chain: sorted strikes with row-aligned CE/PE tokens (0 = not listed)."""
+
+    __slots__ = ("expiry", "strikes", "calls", "puts", "lot_sizes")
+
+    def __init__(self, expiry: date, by_strike: Dict[float, list]):
+        self.expiry = expiry
+        strikes = sorted(by_strike)
+        self.strikes = array("d", strikes)
+        self.calls = array("q", [by_strike[k][0] for k in strikes])
+        self.puts = array("q", [by_strike[k][1] for k in strikes])
+        self.lot_sizes = array("l", [by_strike[k][2] for k in strikes])
+
+    def nearest(self, target: float, option_type: str) -> Optional[OptionLeg]:
+        """The listed strike closest to `target` (the lower one on a tie)."""
+        strikes = self.strikes
+        i = bisect_left(strikes, target)
+        if i == len(strikes) or (i > 0 and target - strikes[i - 1] <= strikes[i] - target):
+            i -= 1
+        token = (self.calls if option_type == "CE" else self.puts)[i]
+        if not token:
+            return None
+        return OptionLeg(token, option_type, strikes[i], self.expiry, self.lot_sizes[i])
+
+
+class OptionChain:
+    """Every listed option of one underlying, by expiry."""
+
+    def __init__(self, name: str, by_expiry: Dict[int, Dict[float, list]]):
+        self.name = name
+        ordinals = sorted(by_expiry)
+        self.ordinals = array("l", ordinals)
+        self.expiries: List[_Expiry] = [_Expiry(date.fromordinal(o), by_expiry[o])
+                                        for o in ordinals]
+
+    def expiry(self, earliest: date, rank: int = 0) -> Optional[_Expiry]:
+        """The `rank`-th expiry on or after `earliest` (0 → the nearest)."""
+        i = bisect_left(self.ordinals, earliest.toordinal()) + rank
+        return self.expiries[i] if i < len(self.expiries) else None
+
+
+class OptionResolver(Clocked):
+    """
+    Pipeline stage between strategies and risk: maps option legs to contracts.
+
+    Strategies emit legs on the underlying's token with metadata `leg`
+    (CALL, PUT, SHORT_CALL, LONG_PUT, ...), `approx_strike` and an optional
+    `relative_strike` offset. The resolver picks the expiry (`expiry_rank`
+    among those at least `min_days_to_expiry` days after the clock's date),
+    rounds approx_strike + relative_strike to the nearest listed strike and
+    rewrites the action:
+      - instrument_token → the CE/PE contract
+      - quantity → lots × the contract's lot size
+      - metadata gains underlying, option_type, strike, expiry, lot_size,
+        lots and ref_price
+    `ref_price` is the underlying's last price (from `on_tick`, else
+    approx_strike), so risk can size option legs at underlying notional
+    before the contracts themselves have been marked.
+    Expiry and strike lookups are binary searches over arrays built once
+    per underlying. Legs that pass risk are reported back through `accept`
+    and remembered per (underlying, structure, leg), so closes trade the
+    same contracts even after the ATM strike or the nearest expiry moved.
+
+    Consecutive legs of one structure on one underlying resolve together:
+    if any leg has no contract, the whole group is dropped. Actions without
+    a `leg` (or already resolved) pass through unchanged.
+    """
+
+    def __init__(self, chains: Dict[int, OptionChain], expiry_rank: int = 0,
+                 min_days_to_expiry: int = 0):
+        self.chains = chains
+        self.expiry_rank = expiry_rank
+        self.min_days_to_expiry = min_days_to_expiry
+
+        self._open: Dict[LegKey, OptionLeg] = {}
+        self._spot: Dict[int, float] = {}   # underlying → last price
+        # underlying → (date ordinal, expiry chosen for that date)
+        self._expiries: Dict[int, Tuple[int, Optional[_Expiry]]] = {}
+
+    @classmethod
+    def from_master(cls, master, underlying_tokens: Iterable[int],
+                    option_names: Optional[Dict[int, str]] = None,
+                    **kwargs) -> "OptionResolver":
+        """
+        Build the chains of `underlying_tokens` from an instrument master
+        (anything with `get(token)` and row-aligned `column(name)`s, expiry
+        as date ordinals). Options are matched on their `name`: the
+        equity's tradingsymbol, or INDEX_OPTION_NAMES for indices, unless
+        `option_names` gives it per token.
+        """
+        option_names = option_names or {}
+        tokens_by_name: Dict[str, List[int]] = {}
+        for token in underlying_tokens:
+            name = option_names.get(token)
+            if name is None:
+                instrument = master.get(token)
+                if instrument is None:
+                    logger.warning("Underlying %s is not in the instrument master", token)
+                    continue
+                name = instrument.tradingsymbol
+                if instrument.segment == "INDICES":
+                    name = INDEX_OPTION_NAMES.get(name, name)
+            tokens_by_name.setdefault(name, []).append(token)
+
+        # name → expiry ordinal → strike → [CE token, PE token, lot size]
+        rows: Dict[str, Dict[int, Dict[float, list]]] = {}
+        for token, name, kind, expiry, strike, lot_size in zip(
+                master.column("instrument_token"), master.column("name"),
+                master.column("instrument_type"), master.column("expiry"),
+                master.column("strike"), master.column("lot_size")):
+            if (kind == "CE" or kind == "PE") and name in tokens_by_name:
+                slot = rows.setdefault(name, {}).setdefault(expiry, {}).setdefault(
+                    strike, [0, 0, lot_size])
+                slot[0 if kind == "CE" else 1] = token
+
+        chains: Dict[int, OptionChain] = {}
+        for name, tokens in tokens_by_name.items():
+            if name not in rows:
+                logger.warning("No options listed for %s (%s)", name, tokens)
+                continue
+            chain = OptionChain(name, rows[name])
+            for token in tokens:
+                chains[token] = chain
+        return cls(chains, **kwargs)
+
+    # ------------ lookups -----------------
+
+    def leg(self, underlying: int, option_type: str, target_strike: float) -> Optional[OptionLeg]:
+        """The contract for a strike target on the current expiry, or None."""
+        chain = self.chains.get(underlying)
+        if chain is None:
+            return None
+        today = self.clock.now().date()
+        cached = self._expiries.get(underlying)
+        if cached is not None and cached[0] == today.toordinal():
+            expiry = cached[1]
+        else:
+            earliest = date.fromordinal(today.toordinal() + self.min_days_to_expiry)
+            expiry = chain.expiry(earliest, self.expiry_rank)
+            self._expiries[underlying] = (today.toordinal(), expiry)
+        if expiry is None:
+            return None
+        return expiry.nearest(target_strike, option_type)
+
+    def open_leg(self, underlying: int, structure: Optional[str], leg: str) -> Optional[OptionLeg]:
+        """The contract an open leg was traded on, if any."""
+        return self._open.get((underlying, structure, leg))
+
+    # ------------ pipeline stage -----------------
+
+    def on_tick(self, tick: Tick) -> None:
+        """Track the last price of the underlyings."""
+        if tick.instrument_token in self.chains:
+            self._spot[tick.instrument_token] = tick.last_price
+
+    def resolve(self, actions: List[TradeAction]) -> List[TradeAction]:
+        """Rewrite option legs into contract orders (see the class docstring)."""
+        if not actions:
+            return actions
+        resolved: List[TradeAction] = []
+        for group, is_leg in self._groups(actions):
+            if not is_leg:
+                resolved.extend(group)
+                continue
+            legs = self._resolve_group(group)
+            if legs is not None:
+                resolved.extend(legs)
+        return resolved
+
+    @staticmethod
+    def _groups(actions: List[TradeAction]) -> Iterator[Tuple[List[TradeAction], bool]]:
+        """Runs of legs of one structure on one underlying; other actions stand alone."""
+        group: List[TradeAction] = []
+        key = None
+        for action in actions:
+            meta = action.metadata
+            if meta and "leg" in meta and "option_type" not in meta:
+                action_key = (action.instrument_token, meta.get("structure"))
+            else:
+                action_key = None
+            if group and (action_key is None or action_key != key):
+                yield group, key is not None
+                group = []
+            group.append(action)
+            key = action_key
+        if group:
+            yield group, key is not None
+
+    def _resolve_group(self, group: List[TradeAction]) -> Optional[List[TradeAction]]:
+        legs: List[OptionLeg] = []
+        for action in group:
+            meta = action.metadata
+            key = (action.instrument_token, meta.get("structure"), meta["leg"])
+            leg = self._open.get(key) if action.action_type in _CLOSING else None
+            if leg is None:
+                leg = self._lookup(action)
+            if leg is None:
+                logger.warning("No option contract for %s leg %s on %s; dropping %d action(s)",
+                               meta.get("structure"), meta["leg"], action.instrument_token,
+                               len(group))
+                return None
+            legs.append(leg)
+
+        resolved = []
+        for action, leg in zip(group, legs):
+            underlying = action.instrument_token
+            ref_price = self._spot.get(underlying, action.metadata.get("approx_strike"))
+            resolved.append(TradeAction(
+                action_type=action.action_type,
+                instrument_token=leg.instrument_token,
+                quantity=action.quantity * leg.lot_size,
+                price=action.price,
+                metadata={
+                    **action.metadata,
+                    "underlying": underlying,
+                    "option_type": leg.option_type,
+                    "strike": leg.strike,
+                    "expiry": leg.expiry,
+                    "lot_size": leg.lot_size,
+                    "lots": action.quantity,
+                    "ref_price": ref_price,
+                },
+            ))
+        return resolved
+
+    def accept(self, actions: List[TradeAction]) -> None:
+        """
+        Record the resolved legs that passed risk: opens are remembered,
+        closes forget their leg. Call with the risk manager's output.
+        """
+        for action in actions:
+            meta = action.metadata
+            if not meta or "option_type" not in meta or "leg" not in meta:
+                continue
+            key = (meta["underlying"], meta.get("structure"), meta["leg"])
+            if action.action_type in _CLOSING:
+                held = self._open.get(key)
+                if held is not None and held.instrument_token == action.instrument_token:
+                    del self._open[key]
+            else:
+                self._open[key] = OptionLeg(action.instrument_token, meta["option_type"],
+                                            meta["strike"], meta["expiry"], meta["lot_size"])
+
+    def _lookup(self, action: TradeAction) -> Optional[OptionLeg]:
+        meta = action.metadata
+        option_type = LEG_TYPES.get(meta["leg"])
+        base = meta.get("approx_strike")
+        if option_type is None or base is None:
+            return None
+        return self.leg(action.instrument_token, option_type,
+                        base + meta.get("relative_strike", 0.0))
@@ -0,0 +1,99 @@
+"""
+The position cache module keeps a local snapshot of broker positions.
+"""
+# core/engine/position_cache.py
+
+import time
+from typing import Callable, Dict, List, Optional
+
+from core.ports.broker import Broker
+from core.domain.types import OrderRequest, OrderExecutionReport, Position
+
+
+class PositionCache:
+    """
+    Event-driven position snapshot (instrument_token → quantity).
+
+    Fills are applied locally as soon as they are reported, so the engine
+    never has to ask the broker on the hot path. The broker is only queried:
+      - on the first refresh
+      - every `sync_interval` seconds (None disables periodic syncs)
+      - on the refresh after a fill, to pick up fees/partial fills/manual trades
+    With `broker=None` the cache never queries anything itself; the owner
+    fetches positions and hands them to `load()` (e.g. from an event loop).
+    """
+
+    def __init__(self,
+                 broker: Optional[Broker],
+                 sync_interval: Optional[float] = 5.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.broker = broker
+        self.sync_interval = sync_interval
+        self._clock = clock
+
+        self._positions: Dict[int, int] = {}
+        self._applied: Dict[str, int] = {}   # order_id → quantity already applied
+        self._last_sync: Optional[float] = None
+        self._resync_pending = True
+        self._changed = True  # the first snapshot is always published
+
+    def snapshot(self) -> Dict[int, int]:
+        """Return a copy of the current positions."""
+        return dict(self._positions)
+
+    def apply_fill(self, order: OrderRequest, report: OrderExecutionReport) -> None:
+        """
+        Apply a fill locally and schedule a broker resync.
+        `filled_quantity` is cumulative per order, so repeated reports
+        for the same order only apply the newly filled quantity.
+        """
+        delta = report.filled_quantity - self._applied.get(report.order_id, 0)
+        if delta <= 0:
+            return
+        self._applied[report.order_id] = report.filled_quantity
+
+        mult = 1 if order.transaction_type == "BUY" else -1
+        token = order.instrument_token
+        qty = self._positions.get(token, 0) + mult * delta
+        if qty:
+            self._positions[token] = qty
+        else:
+            self._positions.pop(token, None)
+
+        self._changed = True
+        self._resync_pending = True
+
+    def sync(self) -> None:
+        """Replace the snapshot with the broker's view of positions."""
+        self.load(self.broker.get_positions())
+
+    def load(self, broker_positions: List[Position]) -> None:
+        """Replace the snapshot with positions fetched by the caller."""
+        positions = {pos.instrument_token: pos.quantity
+                     for pos in broker_positions
+                     if pos.quantity}
+        self._last_sync = self._clock()
+        self._resync_pending = False
+
+        if positions != self._positions:
+            self._positions = positions
+            self._changed = True
+
+    def refresh(self) -> bool:
+        """
+        Resync with the broker if one is due.
+        Returns True when the snapshot changed since the previous refresh.
+        """
+        if self.broker is not None and (self._resync_pending or self._sync_due()):
+            self.sync()
+
+        changed = self._changed
+        self._changed = False
+        return changed
+
+    def _sync_due(self) -> bool:
+        if self._last_sync is None:
+            return True
+        if self.sync_interval is None:
+            return False
+        return self._clock() - self._last_sync >= self.sync_interval
@@ -3,14 +3,53 @@ The runner module orchestrates the entire trading loop.
 """
 # core/engine/runner.py
 
-from typing import List
+from typing import Dict, List, Optional, Sequence, TypeVar
 from core.engine.event_loop import EventLoop
+from core.engine.bar_builder import DEFAULT_BAR_INTERVALS, DEFAULT_MAX_BARS
+from core.engine.position_cache import PositionCache
+from core.engine.execution import OrderExecutor
+from core.engine.instrumentation import Instrumentation
+from core.engine.option_resolver import OptionResolver
+from core.ports.clock import WALL_CLOCK, Clock
 from core.ports.market_data import MarketDataFeed
 from core.ports.broker import Broker
 from core.ports.vol_model import VolatilityModel
 from core.ports.strategy import Strategy, StrategyContext
 from core.ports.risk import RiskManager
 from core.domain.actions import TradeAction
+from core.domain.events import BarClosed
+from core.domain.signals import VolSignal
+from core.domain.types import OrderRequest, OrderExecutionReport, Tick
+
+T = TypeVar("T")
+
+
+def _is_bar_model(model: VolatilityModel) -> bool:
+    """Candle models run on bar close, everything else on ticks."""
+    return getattr(model, "uses_candles", False) is True
+
+
+def _index_by_token(components: Sequence[T]) -> Dict[Optional[int], List[T]]:
+    """
+    Build a token → components dispatch table.
+
+    Components with an integer ``instrument_token`` only receive that token;
+    everything else (``None`` or a multi-instrument component) lands in the
+    wildcard bucket under ``None`` and is appended to every token's list.
+    Registration order is kept within each bucket.
+    """
+    buckets: Dict[Optional[int], List[T]] = {None: []}
+    for component in components:
+        token = getattr(component, "instrument_token", None)
+        key = token if isinstance(token, int) else None
+        buckets.setdefault(key, []).append(component)
+
+    wildcard = buckets[None]
+    index: Dict[Optional[int], List[T]] = {None: wildcard}
+    for token, bucket in buckets.items():
+        if token is not None:
+            index[token] = bucket + wildcard
+    return index
 
 
 class Engine:
@@ -21,7 +60,9 @@ class Engine:
       - updating market state
       - calling vol models
       - executing strategies
+      - resolving option legs into contracts (optional)
       - applying risk management
+      - submitting orders through the executor
     """
 
     def __init__(self,
@@ -30,61 +71,264 @@ class Engine:
                  vol_models: List[VolatilityModel],
                  strategies: List[Strategy],
                  risk_mgr: RiskManager,
-                 state_repo=None):
+                 state_repo=None,
+                 position_sync_interval: Optional[float] = 5.0,
+                 executor: Optional[OrderExecutor] = None,
+                 bar_intervals: Sequence[int] = DEFAULT_BAR_INTERVALS,
+                 max_bars: int = DEFAULT_MAX_BARS,
+                 instrumentation: Optional[Instrumentation] = None,
+                 batch_mode: bool = False,
+                 clock: Optional[Clock] = None,
+                 resolver: Optional[OptionResolver] = None):
         self.feed = feed
         self.broker = broker
         self.vol_models = vol_models
         self.strategies = strategies
         self.risk_mgr = risk_mgr
         self.state_repo = state_repo
+        self.resolver = resolver
+
+        # one time source for every component: wall time live, replay time in backtests
+        self.clock = clock or WALL_CLOCK
+        for component in (*vol_models, *strategies, broker, risk_mgr, resolver):
+            set_clock = getattr(component, "set_clock", None)
+            if set_clock is not None:
+                set_clock(self.clock)
+
+        # token → subscribers; None holds the wildcard components
+        self._models_by_token = _index_by_token(
+            [vm for vm in vol_models if not _is_bar_model(vm)])
+        self._strategies_by_token = _index_by_token(strategies)
+
+        # interval → token → candle models, run once per closed bar
+        by_interval: Dict[int, List[VolatilityModel]] = {}
+        for vm in vol_models:
+            if _is_bar_model(vm):
+                by_interval.setdefault(vm.candle_interval, []).append(vm)
+        self._bar_models = {interval: _index_by_token(models)
+                            for interval, models in by_interval.items()}
+
+        self.loop = EventLoop(sorted(set(bar_intervals) | set(by_interval)), max_bars)
+        # one context, reset every tick instead of reallocated
+        self._ctx = StrategyContext(self.loop.state, [])
+        self.positions = PositionCache(broker, sync_interval=position_sync_interval,
+                                       clock=self.clock.monotonic)
+        self.executor = executor or OrderExecutor(broker)
+        self.instrumentation = instrumentation
+        self.batch_mode = batch_mode
+
+        # run counters (read by backtest reports)
+        self.tick_count = 0
+        self.action_count = 0
+
+    def _models_for(self, token: int) -> List[VolatilityModel]:
+        """Vol models that should see a tick for ``token``."""
+        return self._models_by_token.get(token, self._models_by_token[None])
+
+    def _bar_models_for(self, token: int, interval: int) -> List[VolatilityModel]:
+        """Candle models that should see a closed bar for ``token``."""
+        index = self._bar_models.get(interval)
+        if index is None:
+            return []
+        return index.get(token, index[None])
+
+    def _strategies_for(self, token: int) -> List[Strategy]:
+        """Strategies that should react to ``token``."""
+        return self._strategies_by_token.get(token, self._strategies_by_token[None])
+
+    def on_execution_report(self, order: OrderRequest, report: OrderExecutionReport):
+        """Feed an execution report back into the position snapshot and the risk book."""
+        if report.status == "FILLED":
+            self.positions.apply_fill(order, report)
+            self.risk_mgr.on_fill(order, report)
 
-        self.loop = EventLoop()
+    def _process_execution_events(self):
+        """Apply execution reports that arrived since the last tick."""
+        for event in self.executor.drain():
+            self.on_execution_report(event.order, event.report)
 
     def run(self):
         """
         Main loop for the trading engine.
-        NOTE: In Step 1, we ONLY print actions, not execute broker orders.
+        With `batch_mode` the feed's tick batches are processed as a unit.
         """
         print("Engine started...")
 
-        for tick in self.feed.stream():
+        try:
+            if self.batch_mode:
+                for batch in self.feed.stream_batches():
+                    if batch:
+                        self._on_batch(batch)
+            else:
+                for tick in self.feed.stream():
+                    self._on_batch((tick,))
+        finally:
+            self.executor.close()
+            self._process_execution_events()
+            if self.instrumentation is not None and self.instrumentation.enabled:
+                self.instrumentation.dump()
 
+    def _on_batch(self, ticks: Sequence[Tick]):
+        """
+        Run ticks through the pipeline as one unit.
+
+        Every tick updates the market state and the vol models in order,
+        so stateful models see every return whatever the batch size;
+        strategies then run once per affected token (in first-seen order),
+        so several ticks for a token in one batch cost one evaluation.
+        """
+        self.tick_count += len(ticks)
+        if len(ticks) == 1:
+            tokens = (ticks[0].instrument_token,)
+        else:
+            tokens = tuple(dict.fromkeys(t.instrument_token for t in ticks))
+
+        # Instrumentation is checked once; the disabled path reads no clock
+        inst = self.instrumentation
+        timed = inst is not None and inst.enabled
+        if timed:
+            clock = inst.clock
+            t = start = clock()
+
+        # ---- 0. Advance the clock, mark risk and the resolver to market,
+        #         collect fills (simulated brokers match these ticks) ----
+        advance = self.clock.advance
+        risk_on_tick = self.risk_mgr.on_tick
+        resolver = self.resolver
+        for tick in ticks:
+            advance(tick.timestamp)
+            risk_on_tick(tick)
+            if resolver is not None:
+                resolver.on_tick(tick)
+            for report in self.broker.on_tick(tick):
+                self.executor.on_report(report)
+        self._process_execution_events()
+        if timed:
+            t = self._lap(inst, "fills", t)
+
+        vol_signals = []
+        if len(ticks) == 1:
             # ---- 1. Update internal market state ----
-            state = self.loop.update_state_with_tick(tick)
+            state = self.loop.update_state_with_tick(ticks[0])
+            if timed:
+                t = self._lap(inst, "state", t)
 
-            # ---- 2. Get current broker positions ----
-            positions = {pos.instrument_token: pos.quantity
-                         for pos in self.broker.get_positions()}
-            self.loop.update_positions(positions)
+            # ---- 2. Refresh positions (broker is only hit when a sync is due) ----
+            if self.positions.refresh():
+                self.loop.update_positions(self.positions.snapshot())
+            if timed:
+                t = self._lap(inst, "positions", t)
 
-            # ---- 3. Call volatility models ----
-            vol_signals = []
-            for vm in self.vol_models:
-                signal = vm.update(state)
-                if signal:
-                    vol_signals.append(signal)
+            # ---- 3. Call volatility models subscribed to this token ----
+            self._update_models(state, tokens[0], self.loop.closed_bars, vol_signals,
+                                inst if timed else None)
+            if timed:
+                t = self._lap(inst, "models", t)
+        else:
+            # ---- 1 + 3. State and models advance tick by tick ----
+            models_ns = 0
+            for tick in ticks:
+                state = self.loop.update_state_with_tick(tick)
+                if timed:
+                    m = clock()
+                self._update_models(state, tick.instrument_token, self.loop.closed_bars,
+                                    vol_signals, inst if timed else None)
+                if timed:
+                    models_ns += clock() - m
+            if timed:
+                now = clock()
+                inst.stage("state", now - t - models_ns)
+                inst.stage("models", models_ns)
+                t = now
 
-            # ---- 4. Create strategy context ----
-            ctx = StrategyContext(state=state, vol_signals=vol_signals)
+            # ---- 2. Refresh positions ----
+            if self.positions.refresh():
+                self.loop.update_positions(self.positions.snapshot())
+            if timed:
+                t = self._lap(inst, "positions", t)
 
-            # ---- 5. Let strategies respond ----
-            actions: List[TradeAction] = []
-            for strategy in self.strategies:
-                # Tick-based adjustments
+        # ---- 4. Point the shared strategy context at this tick ----
+        ctx = self._ctx
+        ctx.reset(state, vol_signals)
+        if timed:
+            t = self._lap(inst, "context", t)
+
+        # ---- 5. Let strategies respond ----
+        actions: List[TradeAction] = []
+
+        # Tick-based adjustments
+        for token in tokens:
+            ctx.focus(token)
+            for strategy in self._strategies_for(token):
+                if timed:
+                    c = clock()
                 tick_actions = strategy.on_tick(ctx)
+                if timed:
+                    inst.component(strategy.name, token, clock() - c)
                 actions.extend(tick_actions)
 
-                # Reaction to vol signals
-                for _ in vol_signals:
-                    signal_actions = strategy.on_vol_signal(ctx)
-                    actions.extend(signal_actions)
+        # Reaction to vol signals: each strategy runs once per signalling token,
+        # seeing only that token's signals
+        for token in ctx.signals_by_token:
+            ctx.focus(token)
+            for strategy in self._strategies_for(token):
+                if timed:
+                    c = clock()
+                signal_actions = strategy.on_vol_signal(ctx)
+                if timed:
+                    inst.component(strategy.name, token, clock() - c)
+                actions.extend(signal_actions)
+        if timed:
+            t = self._lap(inst, "strategies", t)
+
+        # ---- 5b. Turn option legs on underlyings into contract orders ----
+        if resolver is not None and actions:
+            actions = resolver.resolve(actions)
+            if timed:
+                t = self._lap(inst, "resolve", t)
+
+        # ---- 6. Run actions through a risk manager ----
+        safe_actions = self.risk_mgr.filter_actions(actions)
+        if resolver is not None and safe_actions:
+            resolver.accept(safe_actions)
+        self.action_count += len(safe_actions)
+        if timed:
+            t = self._lap(inst, "risk", t)
+
+        # ---- 7. Hand orders to the executor (non-blocking) ----
+        if safe_actions:
+            self.executor.submit(safe_actions)
+        if timed:
+            t = self._lap(inst, "execution", t)
+            inst.stage("tick", t - start)
+            inst.maybe_dump()
 
-            # ---- 6. Run actions through a risk manager ----
-            safe_actions = self.risk_mgr.filter_actions(actions)
+    def _update_models(self, state, token: int, closed_bars: List[BarClosed],
+                       vol_signals: List[VolSignal], inst: Optional[Instrumentation]):
+        """Run the tick models for ``token`` and the candle models of closed bars."""
+        for vm in self._models_for(token):
+            if inst is not None:
+                c = inst.clock()
+            signal = vm.update(state)
+            if inst is not None:
+                inst.component(vm.name, token, inst.clock() - c)
+            if signal:
+                vol_signals.append(signal)
+
+        # Candle models only run when one of their bars has just closed
+        for bar in closed_bars:
+            for vm in self._bar_models_for(bar.instrument_token, bar.interval):
+                if inst is not None:
+                    c = inst.clock()
+                signal = vm.update(state)
+                if inst is not None:
+                    inst.component(vm.name, bar.instrument_token, inst.clock() - c)
+                if signal:
+                    vol_signals.append(signal)
 
-            # ---- 7. (Step 1) DO NOT EXECUTE ORDERS YET ----
-            if safe_actions:
-                print("\n=== ACTIONS GENERATED ===")
-                for action in safe_actions:
-                    print(action)
-                print("=========================\n")
\ No newline at end of file
+    @staticmethod
+    def _lap(inst: Instrumentation, stage: str, since: int) -> int:
+        """Record a stage span and return the new lap start."""
+        now = inst.clock()
+        inst.stage(stage, now - since)
+        return now
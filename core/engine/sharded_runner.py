@@ -0,0 +1,353 @@
+"""
+The sharded runner module spreads the engine pipeline over worker processes.
+"""
+# core/engine/sharded_runner.py
+
+import multiprocessing
+import queue
+import traceback
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from core.engine.bar_builder import DEFAULT_BAR_INTERVALS, DEFAULT_MAX_BARS
+from core.engine.execution import OrderExecutor
+from core.engine.option_resolver import OptionResolver
+from core.engine.position_cache import PositionCache
+from core.engine.runner import Engine
+from core.ports.broker import Broker
+from core.ports.clock import WALL_CLOCK, Clock
+from core.ports.market_data import MarketDataFeed
+from core.ports.risk import RiskManager
+from core.ports.strategy import Strategy
+from core.ports.vol_model import VolatilityModel
+from core.domain.actions import TradeAction
+from core.domain.types import OrderRequest, OrderExecutionReport, Position, Tick
+
+# Builds the vol models and strategies for one shard's tokens. Runs inside the
+# worker process, so it must be picklable (a module-level function or a partial).
+ShardFactory = Callable[[List[int]], Tuple[List[VolatilityModel], List[Strategy]]]
+
+# front → shard messages: (kind, payload)
+_TICKS, _POSITIONS, _STOP = "ticks", "positions", "stop"
+# shard → router messages: (kind, shard, payload)
+_ACTIONS, _DONE, _FAILED = "actions", "done", "failed"
+
+_POLL_SECONDS = 0.5
+
+
+def partition(tokens: Sequence[int], shards: int) -> List[List[int]]:
+    """
+    Deal tokens round-robin into at most `shards` non-empty lists.
+    Round-robin spreads the head of the universe (usually the busiest
+    names) evenly; config order is kept within each shard.
+    """
+    if shards < 1:
+        raise ValueError(f"shards must be >= 1, got {shards}")
+    tokens = list(tokens)
+    return [tokens[i::shards] for i in range(min(shards, len(tokens)))]
+
+
+class _ShardBroker(Broker):
+    """Broker seen by a shard's engine: orders go to the router, never here."""
+
+    def place_order(self, order: OrderRequest) -> OrderExecutionReport:
+        raise RuntimeError("shards do not place orders")
+
+    def modify_order(self, order_id: str, **kwargs) -> OrderExecutionReport:
+        raise RuntimeError("shards do not modify orders")
+
+    def cancel_order(self, order_id: str) -> None:
+        raise RuntimeError("shards do not cancel orders")
+
+    def get_positions(self) -> List[Position]:
+        return []
+
+
+class _PassThroughRisk(RiskManager):
+    """Risk is applied once, by the router, over every shard's actions."""
+
+    def filter_actions(self, actions: List[TradeAction]) -> List[TradeAction]:
+        return actions
+
+
+class _RouterLink:
+    """Executor seen by a shard's engine: forwards each tick's actions to the router."""
+
+    def __init__(self, outbox, shard: int):
+        self.outbox = outbox
+        self.shard = shard
+
+    def submit(self, actions: List[TradeAction]) -> None:
+        # one message per tick keeps multi-leg structures together
+        self.outbox.put((_ACTIONS, self.shard, actions))
+
+    def on_report(self, report: OrderExecutionReport) -> None:
+        pass
+
+    def drain(self) -> list:
+        return []
+
+    def close(self) -> None:
+        pass
+
+
+def _run_shard(shard: int, tokens: List[int], factory: ShardFactory, inbox, outbox,
+               options: Dict) -> None:
+    """Worker process: an Engine over one shard, fed from the front's pipe."""
+    try:
+        vol_models, strategies = factory(tokens)
+        engine = Engine(None, _ShardBroker(), vol_models, strategies, _PassThroughRisk(),
+                        position_sync_interval=None,
+                        executor=_RouterLink(outbox, shard),
+                        **options)
+        # positions arrive from the router; the shard never syncs them itself
+        engine.positions = PositionCache(None)
+        on_batch = engine._on_batch
+        batch_mode = engine.batch_mode
+
+        while True:
+            kind, payload = inbox.recv()
+            if kind == _TICKS:
+                if batch_mode:
+                    on_batch(payload)
+                else:
+                    for tick in payload:
+                        on_batch((tick,))
+            elif kind == _POSITIONS:
+                engine.loop.update_positions(payload)
+            else:
+                break
+    except BaseException:
+        outbox.put((_FAILED, shard, traceback.format_exc()))
+        return
+    outbox.put((_DONE, shard, engine.tick_count))
+
+
+class ShardedEngine:
+    """
+    The Engine pipeline partitioned by instrument across worker processes.
+
+    - `instruments` are dealt into `shards` partitions; each worker builds
+      its own vol models and strategies with `shard_factory(tokens)` and
+      runs them on its own EventLoop
+    - the front process reads the feed, advances the clock, marks the risk
+      manager to market, lets the broker match fills and fans each feed batch out to the owning shards over
+      pipes (one message per shard per batch); tokens outside `instruments`
+      go to shard `token % shards`
+    - shards send their actions back on one queue; the router in the front
+      process resolves option legs (with `resolver`, as Engine does) and
+      filters everything received since its last pass through `risk_mgr`
+      as a single list, submits it through the executor and
+      broadcasts position changes to every shard
+
+    Shards run concurrently with the front, so fills land a few ticks later
+    than with Engine; use Engine for deterministic backtests. Strategies see
+    only their own shard's market state and signals.
+
+    Routing is not free: each tick is pickled through a pipe and each
+    action back through a queue. With bench_sharded's workload (500
+    instruments, realized vol + straddle/condor per token) that costs about
+    3-5 µs per tick, so on one core a single shard runs ~10-15% below
+    Engine and more shards only add overhead (33k ticks/s for Engine vs
+    30k / 27k for 1 / 2 shards). Sharding pays off only with a free core
+    per shard plus one for the front process, and once the models and
+    strategies cost clearly more per tick than that routing; scaling on
+    multi-core hardware has not been measured yet, so run bench_sharded
+    on the target machine before enabling `engine.shards`.
+    """
+
+    def __init__(self,
+                 feed: MarketDataFeed,
+                 broker: Broker,
+                 shard_factory: ShardFactory,
+                 instruments: Sequence[int],
+                 risk_mgr: RiskManager,
+                 shards: int = 2,
+                 position_sync_interval: Optional[float] = 5.0,
+                 executor: Optional[OrderExecutor] = None,
+                 bar_intervals: Sequence[int] = DEFAULT_BAR_INTERVALS,
+                 max_bars: int = DEFAULT_MAX_BARS,
+                 batch_mode: bool = False,
+                 clock: Optional[Clock] = None,
+                 mp_context: Optional[str] = None,
+                 resolver: Optional[OptionResolver] = None):
+        self.feed = feed
+        self.broker = broker
+        self.shard_factory = shard_factory
+        self.risk_mgr = risk_mgr
+        self.resolver = resolver
+        self.partitions = partition(instruments, shards)
+        if not self.partitions:
+            raise ValueError("ShardedEngine needs at least one instrument")
+        self.batch_mode = batch_mode
+
+        self.clock = clock or WALL_CLOCK
+        for component in (broker, risk_mgr, resolver):
+            set_clock = getattr(component, "set_clock", None)
+            if set_clock is not None:
+                set_clock(self.clock)
+
+        self.positions = PositionCache(broker, sync_interval=position_sync_interval,
+                                       clock=self.clock.monotonic)
+        self.executor = executor or OrderExecutor(broker)
+        self._options = {"bar_intervals": tuple(bar_intervals), "max_bars": max_bars,
+                         "batch_mode": batch_mode, "clock": self.clock}
+        self._mp = multiprocessing.get_context(mp_context)
+
+        # token → shard; unknown tokens are assigned on first sight
+        self._shard_of: Dict[int, int] = {token: shard
+                                          for shard, tokens in enumerate(self.partitions)
+                                          for token in tokens}
+        self._processes: List = []
+        self._inboxes: List = []
+        self._outbox = None
+        self._running: set = set()
+        self._stopped = False   # shards were told to stop; send them nothing more
+
+        # run counters (same meaning as on Engine)
+        self.tick_count = 0
+        self.action_count = 0
+
+    def run(self):
+        """Main loop; returns when the feed is exhausted and every shard is done."""
+        print(f"Engine started ({len(self.partitions)} shards)...")
+
+        self._start()
+        try:
+            for batch in self.feed.stream_batches():
+                if batch:
+                    self._dispatch(batch)
+                self._route()
+            self._stop()
+        finally:
+            self._shutdown()
+
+    def _start(self):
+        self._stopped = False
+        self._outbox = self._mp.Queue()
+        for shard, tokens in enumerate(self.partitions):
+            receiver, sender = self._mp.Pipe(duplex=False)
+            process = self._mp.Process(
+                target=_run_shard,
+                args=(shard, tokens, self.shard_factory, receiver, self._outbox,
+                      self._options),
+                name=f"engine-shard-{shard}",
+                daemon=True,
+            )
+            process.start()
+            receiver.close()
+            self._processes.append(process)
+            self._inboxes.append(sender)
+            self._running.add(shard)
+
+        if self.positions.refresh():
+            self._broadcast(_POSITIONS, self.positions.snapshot())
+
+    def _shard_for(self, token: int) -> int:
+        shard = self._shard_of.get(token)
+        if shard is None:
+            shard = self._shard_of[token] = token % len(self.partitions)
+        return shard
+
+    def _dispatch(self, batch: Sequence[Tick]):
+        """Collect fills for a feed batch, then send each shard its part of it."""
+        self.tick_count += len(batch)
+        advance = self.clock.advance
+        risk_on_tick = self.risk_mgr.on_tick
+        resolver = self.resolver
+        shard_of = self._shard_of
+        parts: Dict[int, List[Tick]] = {}
+        for tick in batch:
+            advance(tick.timestamp)
+            risk_on_tick(tick)
+            if resolver is not None:
+                resolver.on_tick(tick)
+            for report in self.broker.on_tick(tick):
+                self.executor.on_report(report)
+            shard = shard_of.get(tick.instrument_token)
+            if shard is None:
+                shard = self._shard_for(tick.instrument_token)
+            part = parts.get(shard)
+            if part is None:
+                parts[shard] = [tick]
+            else:
+                part.append(tick)
+
+        for shard, ticks in parts.items():
+            self._inboxes[shard].send((_TICKS, ticks))
+
+    def _route(self, wait: bool = False):
+        """
+        Aggregate actions the shards sent since the last pass, run them
+        through risk as one list and hand them to the executor.
+        With `wait`, block until at least one message arrives (or time out).
+        """
+        actions: List[TradeAction] = []
+        try:
+            message = (self._outbox.get(timeout=_POLL_SECONDS) if wait
+                       else self._outbox.get_nowait())
+            while True:
+                kind, shard, payload = message
+                if kind == _ACTIONS:
+                    actions.extend(payload)
+                elif kind == _DONE:
+                    self._running.discard(shard)
+                else:
+                    raise RuntimeError(f"Engine shard {shard} failed:\n{payload}")
+                message = self._outbox.get_nowait()
+        except queue.Empty:
+            pass
+
+        if actions and self.resolver is not None:
+            actions = self.resolver.resolve(actions)
+        if actions:
+            safe_actions = self.risk_mgr.filter_actions(actions)
+            if self.resolver is not None:
+                self.resolver.accept(safe_actions)
+            self.action_count += len(safe_actions)
+            if safe_actions:
+                self.executor.submit(safe_actions)
+
+        self._process_execution_events()
+        if self.positions.refresh():
+            self._broadcast(_POSITIONS, self.positions.snapshot())
+
+    def _broadcast(self, kind: str, payload=None):
+        if self._stopped:
+            return
+        for inbox in self._inboxes:
+            inbox.send((kind, payload))
+
+    def on_execution_report(self, order: OrderRequest, report: OrderExecutionReport):
+        """Feed an execution report back into the router's positions and risk book."""
+        if report.status == "FILLED":
+            self.positions.apply_fill(order, report)
+            self.risk_mgr.on_fill(order, report)
+
+    def _process_execution_events(self):
+        for event in self.executor.drain():
+            self.on_execution_report(event.order, event.report)
+
+    def _stop(self):
+        """Tell shards the feed ended and route their remaining actions."""
+        self._broadcast(_STOP)
+        self._stopped = True
+        while self._running:
+            self._route(wait=True)
+            for shard in self._running:
+                process = self._processes[shard]
+                if not process.is_alive() and process.exitcode != 0:
+                    raise RuntimeError(f"Engine shard {shard} exited with code "
+                                       f"{process.exitcode}")
+
+    def _shutdown(self):
+        for process in self._processes:
+            if process.is_alive() and self._running:
+                process.terminate()   # only after a failure elsewhere
+            process.join()
+        for inbox in self._inboxes:
+            inbox.close()
+        self._processes, self._inboxes = [], []
+        self._running.clear()
+
+        self.executor.close()
+        self._process_execution_events()
@@ -3,9 +3,10 @@ Domain ports for execution brokers.
 """
 from abc import ABC, abstractmethod
 from typing import List
-from core.domain.types import OrderRequest, OrderExecutionReport, Position
+from core.domain.types import OrderRequest, OrderExecutionReport, Position, Tick
+from core.ports.clock import Clocked
 
-class Broker(ABC):
+class Broker(Clocked, ABC):
     """Abstract base class for execution brokers."""
 
     @abstractmethod
@@ -22,4 +23,35 @@ class Broker(ABC):
 
     @abstractmethod
     def get_positions(self) -> List[Position]:
-        """Get all open positions."""
\ No newline at end of file
+        """Get all open positions."""
+
+    def on_tick(self, tick: Tick) -> List[OrderExecutionReport]:
+        """
+        Called by the engine for every tick. Simulated brokers match resting
+        orders here and return the resulting reports; live brokers do nothing.
+        """
+        return []
+
+
+class AsyncBroker(Clocked, ABC):
+    """Abstract base class for brokers awaited from an event loop."""
+
+    @abstractmethod
+    async def place_order(self, order: OrderRequest) -> OrderExecutionReport:
+        """Place a new order."""
+
+    @abstractmethod
+    async def modify_order(self, order_id: str, **kwargs) -> OrderExecutionReport:
+        """Modify an existing order."""
+
+    @abstractmethod
+    async def cancel_order(self, order_id: str) -> None:
+        """Cancel an existing order."""
+
+    @abstractmethod
+    async def get_positions(self) -> List[Position]:
+        """Get all open positions."""
+
+    def on_tick(self, tick: Tick) -> List[OrderExecutionReport]:
+        """Synchronous per-tick hook, as on Broker; live brokers do nothing."""
+        return []
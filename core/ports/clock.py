@@ -0,0 +1,47 @@
+"""
+Domain ports for time.
+"""
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import Optional
+
+
+class Clock(ABC):
+    """Source of the current time for engine components."""
+
+    @abstractmethod
+    def now(self) -> datetime:
+        """The current time."""
+
+    def monotonic(self) -> float:
+        """Non-decreasing seconds, for measuring intervals."""
+        return self.now().timestamp()
+
+    def advance(self, timestamp: datetime) -> None:
+        """Called by the engine with every tick's timestamp; wall clocks ignore it."""
+
+
+class WallClock(Clock):
+    """Real time, for live and paper trading."""
+
+    def __init__(self, tz: Optional[timezone] = timezone.utc):
+        self.tz = tz
+
+    def now(self) -> datetime:
+        return datetime.now(self.tz)
+
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+
+WALL_CLOCK = WallClock()
+
+
+class Clocked:
+    """Mixin for components that read time from an injectable clock."""
+
+    clock: Clock = WALL_CLOCK
+
+    def set_clock(self, clock: Clock) -> None:
+        self.clock = clock
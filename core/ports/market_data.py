@@ -2,7 +2,7 @@
 Domain ports for market data feeds.
 """
 from abc import ABC, abstractmethod
-from typing import Iterable, List
+from typing import AsyncIterator, Iterable, List
 from core.domain.types import Tick
 
 class MarketDataFeed(ABC):
@@ -17,4 +17,29 @@ class MarketDataFeed(ABC):
         """
         LIVE mode → yields ticks in realtime
         BACKTEST → yields historical ticks/candles
-        """
\ No newline at end of file
+        """
+
+    def stream_batches(self) -> Iterable[List[Tick]]:
+        """
+        Yield ticks in batches, e.g. one websocket message at a time.
+        The default wraps every tick from `stream()` in its own batch.
+        """
+        for tick in self.stream():
+            yield [tick]
+
+
+class AsyncMarketDataFeed(ABC):
+    """Abstract base class for feeds consumed with `async for`."""
+
+    @abstractmethod
+    def subscribe(self, instruments: List[int]) -> None:
+        """Subscribe to a list of instruments."""
+
+    @abstractmethod
+    def astream(self) -> AsyncIterator[Tick]:
+        """Yield ticks without blocking the event loop."""
+
+    async def astream_batches(self) -> AsyncIterator[List[Tick]]:
+        """Yield ticks in batches; the default wraps each tick in its own batch."""
+        async for tick in self.astream():
+            yield [tick]
@@ -4,8 +4,10 @@ Domain ports for risk management.
 from abc import ABC, abstractmethod
 from typing import List
 from core.domain.actions import TradeAction
+from core.domain.types import OrderRequest, OrderExecutionReport, Tick
+from core.ports.clock import Clocked
 
-class RiskManager(ABC):
+class RiskManager(Clocked, ABC):
     """Abstract base class for risk managers."""
 
     @abstractmethod
@@ -16,4 +18,13 @@ class RiskManager(ABC):
           - max loss
           - margin limits
           - timing rules
-        """
\ No newline at end of file
+        """
+
+    def on_tick(self, tick: Tick) -> None:
+        """Called by the engine for every tick, before strategies run (e.g. to mark to market)."""
+
+    def on_fill(self, order: OrderRequest, report: OrderExecutionReport) -> None:
+        """
+        Called by the engine for every FILLED report of an order it submitted.
+        `filled_quantity` is cumulative per order, as in PositionCache.
+        """
@@ -2,21 +2,70 @@
 Domain ports for strategies.
 """
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Dict, List, Optional, Sequence
 from core.domain.signals import VolSignal
 from core.domain.state import MarketState
 from core.domain.actions import TradeAction
+from core.ports.clock import Clocked
 
 class StrategyContext:
-    """Context passed to strategies containing market state and signals."""
-    def __init__(self, state: MarketState, vol_signals: List[VolSignal]):
+    """
+    Context passed to strategies containing market state and signals.
+
+    `signals_by_token` groups this tick's signals by instrument, so a
+    strategy finds its own in O(1) (`signal_for`). While the engine
+    dispatches to the strategies of one token, `token` is that instrument
+    and `signals` holds only its signals; otherwise `signals` is every
+    signal. The engine reuses one context across ticks (see `reset`), so
+    strategies must not keep a reference to it.
+    """
+    def __init__(self, state: MarketState, vol_signals: List[VolSignal],
+                 signals_by_token: Optional[Dict[int, List[VolSignal]]] = None):
+        self.signals_by_token: Dict[int, List[VolSignal]] = {}
+        self.reset(state, vol_signals, signals_by_token)
+
+    def reset(self, state: MarketState, vol_signals: List[VolSignal],
+              signals_by_token: Optional[Dict[int, List[VolSignal]]] = None) -> None:
+        """Point the context at a new tick's state and signals."""
         self.state = state
         self.vol_signals = vol_signals
+        if signals_by_token is None:
+            signals_by_token = self.signals_by_token
+            signals_by_token.clear()
+            for sig in vol_signals:
+                bucket = signals_by_token.get(sig.instrument_token)
+                if bucket is None:
+                    signals_by_token[sig.instrument_token] = [sig]
+                else:
+                    bucket.append(sig)
+        self.signals_by_token = signals_by_token
+        self.token: Optional[int] = None
+        self.signals: Sequence[VolSignal] = vol_signals
+
+    def focus(self, token: int) -> None:
+        """Narrow `token`/`signals` to one instrument."""
+        self.token = token
+        self.signals = self.signals_by_token.get(token, _NO_SIGNALS)
+
+    def signals_for(self, token: int) -> Sequence[VolSignal]:
+        """This tick's signals for an instrument."""
+        return self.signals_by_token.get(token, _NO_SIGNALS)
+
+    def signal_for(self, token: int) -> Optional[VolSignal]:
+        """The first signal for an instrument this tick, or None."""
+        bucket = self.signals_by_token.get(token)
+        return bucket[0] if bucket else None
+
+
+_NO_SIGNALS: Sequence[VolSignal] = ()
+
 
-class Strategy(ABC):
+class Strategy(Clocked, ABC):
     """Abstract base class for trading strategies."""
 
     name: str = "base_strategy"
+    # Token this strategy trades; None means it wants ticks and signals for every token.
+    instrument_token: Optional[int] = None
 
     @abstractmethod
     def on_vol_signal(self, ctx: StrategyContext) -> List[TradeAction]:
@@ -5,12 +5,18 @@ from abc import ABC, abstractmethod
 from typing import Optional
 from core.domain.state import MarketState
 from core.domain.signals import VolSignal
+from core.ports.clock import Clocked
 
-class VolatilityModel(ABC):
+class VolatilityModel(Clocked, ABC):
     """Abstract base class for volatility models."""
 
     name: str = "base_vol_model"
+    # Token this model watches; None means it is updated on every tick.
     instrument_token: Optional[int] = None
+    # True for models driven by closed bars rather than ticks
+    uses_candles: bool = False
+    # Bar interval (seconds) for candle models; they run once per closed bar
+    candle_interval: int = 60
 
     @abstractmethod
     def update(self, state: MarketState) -> Optional[VolSignal]:
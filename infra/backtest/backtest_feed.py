@@ -3,7 +3,10 @@ Backtest implementation of the MarketDataFeed.
 """
 # infra/backtest/backtest_feed.py
 
-from typing import Dict, List
+import heapq
+from itertools import groupby
+from operator import attrgetter
+from typing import Dict, Iterable, Iterator, List
 from core.ports.market_data import MarketDataFeed
 from core.domain.types import Tick, Candle
 
@@ -17,34 +20,45 @@ class BacktestFeed(MarketDataFeed):
     def subscribe(self, instruments):
         """No-op for backtest feed (pre-loaded data)."""
 
-    def stream(self):
+    def stream(self) -> Iterator[Tick]:
         """
         Replays candles in chronological order.
-        Each candle is converted to 4 synthetic ticks.
+        Each candle is converted to 4 synthetic ticks (O, H, L, C).
+        Like Kite ticks, `volume` is the running day volume: it reaches the
+        candle's volume on its close tick and resets at each new day.
+
+        Each token's candles are already time-ordered, so this is a lazy
+        k-way heap merge across tokens: only one pending tick per token is
+        alive at a time and ticks are created as they are consumed.
+        Ties on timestamp keep token insertion order, as a stable sort would.
+        """
+        per_token = [
+            self._ticks_for(token, candles)
+            for token, candles in self.candles_by_token.items()
+        ]
+        return heapq.merge(*per_token, key=attrgetter("timestamp"))
+
+    def stream_batches(self) -> Iterator[List[Tick]]:
+        """
+        Replays the same ticks grouped by timestamp: one batch per candle
+        time, holding every token's O/H/L/C ticks for that minute.
         """
+        for _, batch in groupby(self.stream(), key=attrgetter("timestamp")):
+            yield list(batch)
 
-        # flatten all candles across tokens
-        all_events = []
-
-        for token, candles in self.candles_by_token.items():
-            for c in candles:
-                all_events.append(
-                    Tick(token, c.timestamp, c.open, c.volume, c.oi)
-                )
-                all_events.append(
-                    Tick(token, c.timestamp, c.high, c.volume, c.oi)
-                )
-                all_events.append(
-                    Tick(token, c.timestamp, c.low, c.volume, c.oi)
-                )
-                all_events.append(
-                    Tick(token, c.timestamp, c.close, c.volume, c.oi)
-                )
-
-        # sort by timestamp
-        all_events.sort(key=lambda t: t.timestamp)
-
-        for tick in all_events:
-            yield tick
+    @staticmethod
+    def _ticks_for(token: int, candles: Iterable[Candle]) -> Iterator[Tick]:
+        """Lazily expand one token's candles into ticks."""
+        day = None
+        cumulative = 0
+        for c in candles:
+            if c.timestamp.date() != day:
+                day = c.timestamp.date()
+                cumulative = 0
+            yield Tick(token, c.timestamp, c.open, cumulative, c.oi)
+            yield Tick(token, c.timestamp, c.high, cumulative, c.oi)
+            yield Tick(token, c.timestamp, c.low, cumulative, c.oi)
+            cumulative += c.volume
+            yield Tick(token, c.timestamp, c.close, cumulative, c.oi)
             # optional slow down:
-            # time.sleep(0.001)
\ No newline at end of file
+            # time.sleep(0.001)
@@ -3,20 +3,32 @@ Backtest runner to execute strategies against historical data.
 """
 # infra/backtest/backtest_runner.py
 
-from datetime import datetime
+from datetime import date, datetime
+from typing import Dict, List, Optional
 
-from core.domain.types import Candle
 from infra.backtest.historical_provider import ZerodhaHistoricalProvider
-from infra.backtest.backtest_feed import BacktestFeed
-from infra.backtest.simulated_broker import SimulatedBroker
-from core.engine.runner import Engine
+from infra.backtest.candle_cache import CachedHistoricalProvider
+from infra.backtest.memo_cache import dataset_key, fingerprint, open_cache
+from infra.backtest.sweep_runner import ParameterSweepRunner, default_builder, run_components
+from core.domain.types import Candle
 
 
 class BacktestRunner:
-    """Orchestrates a backtest run."""
+    """
+    Orchestrates a backtest run.
+
+    With `memo_dir`, the candle dataset and each run's metrics are memoized
+    by content hash (see memo_cache), so re-running with unchanged data and
+    parameters skips both the load and the replay.
+    """
 
-    def __init__(self, api_key, access_token):
+    def __init__(self, api_key, access_token, cache_dir: Optional[str] = None,
+                 memo_dir: Optional[str] = None, memo_max_bytes: int = 1 << 30):
         self.provider = ZerodhaHistoricalProvider(api_key, access_token)
+        if cache_dir:
+            self.provider = CachedHistoricalProvider(cache_dir, self.provider)
+        self.memo_dir = memo_dir
+        self.memo = open_cache(memo_dir, memo_max_bytes)
 
     def run(
         self,
@@ -28,42 +40,51 @@ class BacktestRunner:
         strategies,
         risk_mgr
     ):
-        """Run the backtest simulation."""
+        """Run the backtest simulation and return its metrics."""
 
         # 1. Fetch candles for all tokens
-        candles_by_token = {}
+        candles_by_token = self.load_candles(instrument_tokens, start, end, interval)
 
-        for token in instrument_tokens:
-            raw_candles = self.provider.get_candles(token, start, end, interval)
+        # 2. Replay them through a simulated broker (served from the memo when unchanged)
+        data_key = dataset_key(candles_by_token) if self.memo is not None else None
+        return run_components(candles_by_token, vol_models, strategies, risk_mgr,
+                              cache=self.memo, data_key=data_key)
 
-            candles = []
-            for c in raw_candles:
-                candles.append(
-                    Candle(
-                        instrument_token=token,
-                        timestamp=c["date"],
-                        open=c["open"],
-                        high=c["high"],
-                        low=c["low"],
-                        close=c["close"],
-                        volume=c["volume"],
-                        oi=c.get("oi")
-                    )
-                )
+    def load_candles(self, instrument_tokens, start: datetime, end: datetime, interval):
+        """
+        Fetch candles for all tokens (concurrently, as they complete).
+        Datasets that end before today are memoized; today's are still forming.
+        """
+        instrument_tokens = list(instrument_tokens)
+        if self.memo is not None and end.date() < date.today():
+            key = fingerprint("candles", instrument_tokens, start, end, interval)
+            return self.memo.get_or_compute(
+                "candles", key, lambda: self._fetch(instrument_tokens, start, end, interval))
+        return self._fetch(instrument_tokens, start, end, interval)
 
-            candles_by_token[token] = candles
-
-        # 2. Initialize feed & broker
-        feed = BacktestFeed(candles_by_token)
-        broker = SimulatedBroker()
+    def _fetch(self, instrument_tokens, start: datetime, end: datetime, interval) -> Dict[int, List[Candle]]:
+        candles_by_token = {token: [] for token in instrument_tokens}
 
-        # 3. Create an engine and run
-        engine = Engine(
-            feed=feed,
-            broker=broker,
-            vol_models=vol_models,
-            strategies=strategies,
-            risk_mgr=risk_mgr
-        )
+        for token, candles in self.provider.stream_candles(instrument_tokens, start, end, interval):
+            candles_by_token[token] = candles
+        return candles_by_token
 
-        engine.run()
\ No newline at end of file
+    def sweep(
+        self,
+        instrument_tokens,
+        start: datetime,
+        end: datetime,
+        interval,
+        grid,
+        builder=default_builder,
+        max_workers: Optional[int] = None,
+    ):
+        """
+        Run one backtest per combination of `grid` on a process pool.
+        Candles are loaded once and shared with every worker.
+        Returns one results row (params + metrics) per combination.
+        """
+        candles_by_token = self.load_candles(instrument_tokens, start, end, interval)
+        runner = ParameterSweepRunner(candles_by_token, builder=builder, max_workers=max_workers,
+                                      memo_dir=self.memo_dir)
+        return runner.run(grid)
@@ -0,0 +1,296 @@
+"""
+Persistent, columnar on-disk cache for historical candles.
+"""
+# infra/backtest/candle_cache.py
+
+import json
+import os
+import sys
+from array import array
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from core.domain.types import Candle
+from core.ports.repositories import MarketStateRepository
+
+# (column, array typecode); files store the columns in this order
+COLUMNS: Tuple[Tuple[str, str], ...] = (
+    ("timestamp", "d"),   # epoch seconds
+    ("open", "d"),
+    ("high", "d"),
+    ("low", "d"),
+    ("close", "d"),
+    ("volume", "q"),
+    ("oi", "q"),          # NO_OI when the candle carries no open interest
+)
+NO_OI = -1
+
+_SUFFIX = ".col"
+
+
+def candles_to_columns(candles: Iterable[Candle]) -> Tuple[Dict[str, array], Optional[int]]:
+    """
+    Split candles into typed column arrays.
+
+    Returns the columns and the UTC offset (seconds) of the timestamps,
+    or None for naive timestamps, which are stored as if they were UTC.
+    """
+    columns = {name: array(code) for name, code in COLUMNS}
+    utcoffset: Optional[int] = None
+
+    for c in candles:
+        ts = c.timestamp
+        offset = ts.utcoffset()
+        if offset is None:
+            ts = ts.replace(tzinfo=timezone.utc)
+        else:
+            utcoffset = int(offset.total_seconds())
+
+        columns["timestamp"].append(ts.timestamp())
+        columns["open"].append(c.open)
+        columns["high"].append(c.high)
+        columns["low"].append(c.low)
+        columns["close"].append(c.close)
+        columns["volume"].append(c.volume)
+        columns["oi"].append(NO_OI if c.oi is None else c.oi)
+
+    return columns, utcoffset
+
+
+def columns_to_candles(instrument_token: int,
+                       columns: Dict[str, array],
+                       utcoffset: Optional[int]) -> List[Candle]:
+    """Rebuild candles from column arrays (inverse of `candles_to_columns`)."""
+    if utcoffset is None:
+        def to_datetime(ts):
+            return datetime.fromtimestamp(ts, timezone.utc).replace(tzinfo=None)
+    else:
+        tz = timezone(timedelta(seconds=utcoffset))
+
+        def to_datetime(ts):
+            return datetime.fromtimestamp(ts, tz)
+
+    return [
+        Candle(instrument_token, to_datetime(ts), o, h, l, c, int(v),
+               None if oi == NO_OI else int(oi))
+        for ts, o, h, l, c, v, oi in zip(
+            columns["timestamp"], columns["open"], columns["high"],
+            columns["low"], columns["close"], columns["volume"], columns["oi"],
+        )
+    ]
+
+
+def day_runs(days: Iterable[date]) -> List[Tuple[date, date]]:
+    """Group dates into contiguous (first, last) runs."""
+    runs: List[Tuple[date, date]] = []
+    for day in sorted(days):
+        if runs and runs[-1][1] + timedelta(days=1) == day:
+            runs[-1] = (runs[-1][0], day)
+        else:
+            runs.append((day, day))
+    return runs
+
+
+class CandleCache(MarketStateRepository):
+    """
+    Candle store keyed by (token, interval, trading day).
+
+    Layout: <root>/<interval>/<token>/<YYYY-MM-DD>.col, one file per day.
+    Each file is a one-line JSON header followed by the raw column arrays,
+    so a day loads with one `array.fromfile` call per column.
+    A day with no candles (weekend, holiday) is stored as an empty file
+    so it is never requested again.
+    """
+
+    def __init__(self, root: str, interval: str = "minute"):
+        self.root = root
+        self.interval = interval
+        self._dir = os.path.join(root, interval.replace(" ", "_"))
+
+    # ------------ MarketStateRepository -----------------
+
+    def store_candles(self, instrument_token: int, candles: List[Candle]) -> None:
+        """Store candles, replacing any cached data for the days they cover."""
+        by_day: Dict[date, List[Candle]] = {}
+        for c in candles:
+            by_day.setdefault(c.timestamp.date(), []).append(c)
+        for day, day_candles in by_day.items():
+            self.store_day(instrument_token, day, day_candles)
+
+    def load_candles(self, instrument_token: int) -> List[Candle]:
+        """Load every cached candle for an instrument."""
+        return self.load_days(instrument_token, sorted(self.cached_days(instrument_token)))
+
+    # ------------ day-level access -----------------
+
+    def cached_days(self, instrument_token: int) -> Set[date]:
+        """Return the trading days already on disk for an instrument."""
+        token_dir = self._token_dir(instrument_token)
+        if not os.path.isdir(token_dir):
+            return set()
+        return {
+            date.fromisoformat(name[:-len(_SUFFIX)])
+            for name in os.listdir(token_dir)
+            if name.endswith(_SUFFIX)
+        }
+
+    def missing_days(self, instrument_token: int, first: date, last: date) -> List[Tuple[date, date]]:
+        """Return contiguous runs of days in [first, last] that are not cached."""
+        cached = self.cached_days(instrument_token)
+        wanted = (first + timedelta(days=i) for i in range((last - first).days + 1))
+        return day_runs(d for d in wanted if d not in cached)
+
+    def store_day(self, instrument_token: int, day: date, candles: List[Candle]) -> None:
+        """Write one day file atomically."""
+        columns, utcoffset = candles_to_columns(candles)
+        header = {
+            "rows": len(columns["timestamp"]),
+            "utcoffset": utcoffset,
+            "byteorder": sys.byteorder,
+        }
+
+        path = self._day_path(instrument_token, day)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(json.dumps(header).encode() + b"\n")
+            for name, _ in COLUMNS:
+                columns[name].tofile(f)
+        os.replace(tmp, path)
+
+    def load_day(self, instrument_token: int, day: date) -> List[Candle]:
+        """Read one cached day; an uncached day yields no candles."""
+        path = self._day_path(instrument_token, day)
+        if not os.path.exists(path):
+            return []
+
+        with open(path, "rb") as f:
+            header = json.loads(f.readline())
+            rows = header["rows"]
+            columns = {}
+            for name, code in COLUMNS:
+                col = array(code)
+                col.fromfile(f, rows)
+                if header["byteorder"] != sys.byteorder:
+                    col.byteswap()
+                columns[name] = col
+
+        return columns_to_candles(instrument_token, columns, header["utcoffset"])
+
+    def load_days(self, instrument_token: int, days: Iterable[date]) -> List[Candle]:
+        """Concatenate cached days in the given order."""
+        candles: List[Candle] = []
+        for day in days:
+            candles.extend(self.load_day(instrument_token, day))
+        return candles
+
+    def _token_dir(self, instrument_token: int) -> str:
+        return os.path.join(self._dir, str(instrument_token))
+
+    def _day_path(self, instrument_token: int, day: date) -> str:
+        return os.path.join(self._token_dir(instrument_token), day.isoformat() + _SUFFIX)
+
+
+class CachedHistoricalProvider:
+    """
+    Read-through cache in front of a historical provider.
+
+    Only day ranges missing from the cache are requested from `provider`;
+    everything else is served from local files. With `provider=None`
+    the cache is used offline and missing days are simply absent.
+
+    Candles are served for whole days from start.date() to end.date().
+    Today is never cached because its candles are still being formed.
+    """
+
+    def __init__(self, cache_dir: str, provider=None):
+        self.cache_dir = cache_dir
+        self.provider = provider
+        self._caches: Dict[str, CandleCache] = {}
+
+    def cache_for(self, interval: str) -> CandleCache:
+        """Return the cache holding candles of the given interval."""
+        if interval not in self._caches:
+            self._caches[interval] = CandleCache(self.cache_dir, interval)
+        return self._caches[interval]
+
+    def load_candles(self, instrument_token: int, start: datetime, end: datetime,
+                     interval: str) -> List[Candle]:
+        """Load candles, fetching only the days that are not cached yet."""
+        for _, candles in self.stream_candles([instrument_token], start, end, interval):
+            return candles
+        return []
+
+    def stream_candles(self, instrument_tokens: Iterable[int], start: datetime, end: datetime,
+                       interval: str) -> Iterator[Tuple[int, List[Candle]]]:
+        """
+        Yield (token, candles) for every token.
+        Fully cached tokens come out immediately; the others follow as soon
+        as all of their missing day ranges have been downloaded.
+        """
+        cache = self.cache_for(interval)
+        first, last = start.date(), end.date()
+
+        missing: Dict[int, List[Tuple[date, date]]] = {}
+        for token in instrument_tokens:
+            runs = cache.missing_days(token, first, last) if self.provider is not None else []
+            if runs:
+                missing[token] = runs
+            else:
+                yield token, self._serve(cache, token, first, last, {})
+
+        requests = [
+            (token, datetime.combine(run_first, time.min), datetime.combine(run_last, time.max))
+            for token, runs in missing.items()
+            for run_first, run_last in runs
+        ]
+        remaining = {token: len(runs) for token, runs in missing.items()}
+        fetched: Dict[int, Dict[date, List[Candle]]] = {token: {} for token in missing}
+
+        for (token, run_start, run_end), candles in self._fetch_ranges(requests, interval):
+            fetched[token].update(
+                self._store_run(cache, token, run_start.date(), run_end.date(), candles)
+            )
+            remaining[token] -= 1
+            if remaining[token] == 0:
+                yield token, self._serve(cache, token, first, last, fetched.pop(token))
+
+    def _fetch_ranges(self, requests, interval):
+        """Use the provider's concurrent downloader when it has one."""
+        stream_ranges = getattr(self.provider, "stream_ranges", None)
+        if stream_ranges is not None:
+            yield from stream_ranges(requests, interval)
+            return
+        for token, run_start, run_end in requests:
+            yield (token, run_start, run_end), self.provider.load_candles(
+                token, run_start, run_end, interval)
+
+    @staticmethod
+    def _store_run(cache: CandleCache, token: int, run_first: date, run_last: date,
+                   candles: List[Candle]) -> Dict[date, List[Candle]]:
+        """Split a downloaded run into days and persist every completed day."""
+        today = date.today()
+        by_day: Dict[date, List[Candle]] = {}
+        for c in candles:
+            by_day.setdefault(c.timestamp.date(), []).append(c)
+
+        days: Dict[date, List[Candle]] = {}
+        for i in range((run_last - run_first).days + 1):
+            day = run_first + timedelta(days=i)
+            days[day] = by_day.get(day, [])
+            if day < today:
+                cache.store_day(token, day, days[day])
+        return days
+
+    @staticmethod
+    def _serve(cache: CandleCache, token: int, first: date, last: date,
+               fetched: Dict[date, List[Candle]]) -> List[Candle]:
+        """Assemble [first, last] from freshly fetched days and the cache."""
+        candles: List[Candle] = []
+        for i in range((last - first).days + 1):
+            day = first + timedelta(days=i)
+            if day in fetched:
+                candles.extend(fetched[day])
+            else:
+                candles.extend(cache.load_day(token, day))
+        return candles
@@ -0,0 +1,187 @@
+"""
+Chunked, rate-limited, concurrent downloads of Kite historical data.
+"""
+# infra/backtest/download_scheduler.py
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Longest span (in days) Kite accepts in one historical_data call per interval.
+MAX_DAYS_PER_REQUEST: Dict[str, int] = {
+    "minute": 60,
+    "3minute": 100,
+    "5minute": 100,
+    "10minute": 100,
+    "15minute": 200,
+    "30minute": 200,
+    "60minute": 400,
+    "day": 2000,
+}
+
+# (instrument_token, start, end)
+RangeRequest = Tuple[int, datetime, datetime]
+
+# Kite's retryable exceptions (kiteconnect.exceptions), and requests' network
+# errors, matched by class name so this module does not import either library
+TRANSIENT_ERRORS = frozenset(("NetworkException", "DataException",
+                              "Timeout", "ConnectTimeout", "ReadTimeout", "ConnectionError"))
+# HTTP statuses worth retrying: rate limited, or the gateway is struggling
+TRANSIENT_STATUSES = frozenset((429, 502, 503, 504))
+
+
+def is_transient(exc: BaseException) -> bool:
+    """
+    True for failures a retry can fix: Kite network/data errors, HTTP 429
+    and gateway errors, timeouts and dropped connections. Auth and input
+    errors (TokenException, InputException, ...) and programming errors
+    are not.
+    """
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return True
+    if any(cls.__name__ in TRANSIENT_ERRORS for cls in type(exc).__mro__):
+        return True
+    status = getattr(exc, "code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    return status in TRANSIENT_STATUSES
+
+
+def chunk_range(start: datetime, end: datetime, interval: str) -> List[Tuple[datetime, datetime]]:
+    """Split [start, end] into consecutive, non-overlapping spans Kite accepts."""
+    max_days = MAX_DAYS_PER_REQUEST.get(interval.replace(" ", ""), 60)
+    span = timedelta(days=max_days)
+    step = timedelta(seconds=1)
+
+    chunks = []
+    cursor = start
+    while cursor <= end:
+        chunk_end = min(cursor + span - step, end)
+        chunks.append((cursor, chunk_end))
+        cursor = chunk_end + step
+    return chunks
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+    `acquire` blocks until a request may be sent under `rate` requests/sec.
+    """
+
+    def __init__(self,
+                 rate: float,
+                 capacity: float = 1.0,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = capacity
+        self._updated = clock()
+
+    def acquire(self) -> None:
+        """Take one token, sleeping outside the lock until it is available."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # reserve a token even if it puts the bucket in debt; callers
+            # queue up behind each other instead of racing on refill
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        if wait > 0:
+            self._sleep(wait)
+
+
+class HistoricalDownloadScheduler:
+    """
+    Downloads historical candles for many instruments at once.
+
+    - long ranges are split into chunks Kite accepts (`chunk_range`)
+    - chunks for all tokens run on a bounded thread pool
+    - every request first takes a token from a shared `TokenBucket`
+    - transient failures (`retry_on`, by default `is_transient`) are
+      retried with exponential backoff; anything else fails at once
+    - each range is yielded as soon as all of its chunks have arrived
+    """
+
+    def __init__(self,
+                 kite,
+                 requests_per_second: float = 3.0,
+                 max_workers: int = 4,
+                 max_retries: int = 4,
+                 backoff: float = 0.5,
+                 max_backoff: float = 8.0,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep,
+                 retry_on: Callable[[BaseException], bool] = is_transient):
+        self.kite = kite
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.retry_on = retry_on
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._sleep = sleep
+        self.bucket = TokenBucket(requests_per_second, clock=clock, sleep=sleep)
+
+    def fetch_chunk(self, instrument_token: int, start: datetime, end: datetime,
+                    interval: str) -> List[dict]:
+        """Fetch one chunk, retrying transient failures."""
+        attempt = 0
+        while True:
+            self.bucket.acquire()
+            try:
+                return self.kite.historical_data(instrument_token, start, end, interval, oi=True)
+            except Exception as exc:
+                if attempt >= self.max_retries or not self.retry_on(exc):
+                    raise
+                delay = min(self.backoff * (2 ** attempt), self.max_backoff)
+                logger.warning("historical_data(%s, %s, %s) failed (%s); retrying in %.2fs",
+                               instrument_token, start, end, exc, delay)
+                self._sleep(delay)
+                attempt += 1
+
+    def stream(self, requests: Iterable[RangeRequest],
+               interval: str) -> Iterator[Tuple[RangeRequest, List[dict]]]:
+        """
+        Download every requested range concurrently.
+        Yields (request, rows) in completion order; rows are time-ordered.
+        """
+        requests = list(requests)
+        parts: Dict[int, List[List[dict]]] = {}
+        remaining: Dict[int, int] = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {}
+            for idx, (token, start, end) in enumerate(requests):
+                chunks = chunk_range(start, end, interval)
+                parts[idx] = [[] for _ in chunks]
+                remaining[idx] = len(chunks)
+                for part, (chunk_start, chunk_end) in enumerate(chunks):
+                    future = pool.submit(self.fetch_chunk, token, chunk_start, chunk_end, interval)
+                    futures[future] = (idx, part)
+
+            for idx, count in remaining.items():
+                if count == 0:
+                    yield requests[idx], []
+
+            try:
+                for future in as_completed(futures):
+                    idx, part = futures[future]
+                    parts[idx][part] = future.result()
+                    remaining[idx] -= 1
+                    if remaining[idx] == 0:
+                        rows = [row for chunk in parts.pop(idx) for row in chunk]
+                        yield requests[idx], rows
+            finally:
+                # on error or early close, drop chunks that have not started
+                for future in futures:
+                    future.cancel()
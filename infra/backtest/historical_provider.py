@@ -4,23 +4,68 @@ Historical data provider using Zerodha Kite.
 # infra/backtest/historical_provider.py
 
 from datetime import datetime
+from typing import Iterable, Iterator, List, Tuple
+
 from kiteconnect import KiteConnect
 
+from core.domain.types import Candle
+from infra.backtest.download_scheduler import HistoricalDownloadScheduler, RangeRequest
+
+
+def candles_from_kite(instrument_token: int, raw: Iterable[dict]) -> List[Candle]:
+    """Convert Kite `historical_data` rows into domain candles."""
+    return [
+        Candle(
+            instrument_token=instrument_token,
+            timestamp=c["date"],
+            open=c["open"],
+            high=c["high"],
+            low=c["low"],
+            close=c["close"],
+            volume=c["volume"],
+            oi=c.get("oi"),
+        )
+        for c in raw
+    ]
+
+
 class ZerodhaHistoricalProvider:
     """Fetches historical candles from Zerodha."""
 
-    def __init__(self, api_key: str, access_token: str):
+    def __init__(self, api_key: str, access_token: str,
+                 requests_per_second: float = 3.0, max_workers: int = 4):
         self.kite = KiteConnect(api_key=api_key)
         self.kite.set_access_token(access_token)
+        self.scheduler = HistoricalDownloadScheduler(
+            self.kite,
+            requests_per_second=requests_per_second,
+            max_workers=max_workers,
+        )
 
     def get_candles(self, instrument_token: int, start: datetime, end: datetime, interval: str):
         """
         interval: 'minute', '5 minute', '15 minute', 'day', etc.
+        Long ranges are split into chunks Kite accepts and fetched concurrently.
         """
-        return self.kite.historical_data(
-            instrument_token,
-            start,
-            end,
-            interval,
-            oi=True
-        )
\ No newline at end of file
+        for _, rows in self.scheduler.stream([(instrument_token, start, end)], interval):
+            return rows
+        return []
+
+    def load_candles(self, instrument_token: int, start: datetime, end: datetime,
+                     interval: str) -> List[Candle]:
+        """Fetch candles and convert them to domain objects."""
+        raw = self.get_candles(instrument_token, start, end, interval)
+        return candles_from_kite(instrument_token, raw)
+
+    def stream_ranges(self, requests: Iterable[RangeRequest],
+                      interval: str) -> Iterator[Tuple[RangeRequest, List[Candle]]]:
+        """Download many (token, start, end) ranges; yield each as it completes."""
+        for request, rows in self.scheduler.stream(requests, interval):
+            yield request, candles_from_kite(request[0], rows)
+
+    def stream_candles(self, instrument_tokens: Iterable[int], start: datetime, end: datetime,
+                       interval: str) -> Iterator[Tuple[int, List[Candle]]]:
+        """Yield (token, candles) for every token as soon as its download finishes."""
+        requests = [(token, start, end) for token in instrument_tokens]
+        for (token, _, _), candles in self.stream_ranges(requests, interval):
+            yield token, candles
@@ -0,0 +1,201 @@
+"""
+Content-addressed on-disk cache for backtest intermediate products.
+"""
+# infra/backtest/memo_cache.py
+
+import hashlib
+import inspect
+import json
+import logging
+import os
+import pickle
+from datetime import date, datetime, time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from core.domain.types import Candle
+from infra.backtest.candle_cache import COLUMNS, candles_to_columns
+
+logger = logging.getLogger(__name__)
+
+# bump when the key derivation or the pickled layouts change
+CACHE_VERSION = 2
+
+_SUFFIX = ".pkl"
+_SCALARS = (bool, int, float, str, type(None))
+_SKIPPED_KINDS = (inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD)
+
+
+def _canonical(value: Any) -> Any:
+    """
+    A JSON-able, order-independent rendering of a key part.
+    Raises TypeError for values with no stable encoding.
+    """
+    if isinstance(value, _SCALARS):
+        return repr(value) if isinstance(value, float) else value
+    if isinstance(value, (datetime, date, time)):
+        return {"__" + type(value).__name__: value.isoformat()}
+    if isinstance(value, dict):
+        return {"__dict": [[_canonical(k), _canonical(v)]
+                           for k, v in sorted(value.items(), key=lambda kv: repr(kv[0]))]}
+    if isinstance(value, tuple):
+        return {"__tuple": [_canonical(v) for v in value]}
+    if isinstance(value, list):
+        return [_canonical(v) for v in value]
+    if isinstance(value, (set, frozenset)):
+        return {"__set": sorted((_canonical(v) for v in value), key=repr)}
+    if hasattr(value, "__dict__"):
+        return component_key(value)
+    raise TypeError(f"Cannot build a cache key from {type(value).__qualname__} value {value!r}")
+
+
+def fingerprint(*parts: Any) -> str:
+    """
+    SHA-256 hex digest of any mix of scalars, containers and components.
+    Raises TypeError when a part has no stable encoding.
+    """
+    payload = json.dumps([CACHE_VERSION, _canonical(list(parts))], sort_keys=True,
+                         separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def component_key(component: Any) -> Dict[str, Any]:
+    """
+    Identify a model, strategy or risk manager by class and constructor parameters.
+
+    Each named `__init__` parameter is read back from the attribute of the
+    same name, so runtime state (PnL, current vol, ...) never enters the
+    key and a used component keys like a fresh one. Nested components (a
+    composite's children) are keyed recursively. Raises TypeError when a
+    parameter is not kept as an attribute or has no stable encoding;
+    callers then run without the cache.
+    """
+    cls = type(component)
+    params: Dict[str, Any] = {}
+    for name, parameter in inspect.signature(cls.__init__).parameters.items():
+        if name == "self" or parameter.kind in _SKIPPED_KINDS:
+            continue
+        if not hasattr(component, name):
+            raise TypeError(f"{cls.__qualname__} does not keep its `{name}` parameter")
+        params[name] = _canonical(getattr(component, name))
+    return {"type": f"{cls.__module__}.{cls.__qualname__}", "params": params}
+
+
+def candles_key(candles: List[Candle]) -> str:
+    """Digest of one token's candles, hashed from their columnar encoding."""
+    columns, utcoffset = candles_to_columns(candles)
+    h = hashlib.sha256(f"{CACHE_VERSION}:{utcoffset}".encode())
+    for name, _ in COLUMNS:
+        h.update(columns[name].tobytes())
+    return h.hexdigest()
+
+
+def dataset_key(candles_by_token: Dict[int, List[Candle]]) -> str:
+    """Digest of a whole dataset; token order matters (it breaks replay ties)."""
+    return fingerprint([(token, candles_key(candles))
+                        for token, candles in candles_by_token.items()])
+
+
+class MemoCache:
+    """
+    Pickled values keyed by content hash, with LRU size eviction.
+
+    Layout: <root>/<namespace>/<key[:2]>/<key>.pkl. A hit refreshes the
+    entry's mtime; once the cache grows past `max_bytes`, the entries with
+    the oldest mtimes are deleted first. Writes are atomic, so concurrent
+    sweep workers may share one cache directory.
+    """
+
+    def __init__(self, root: str, max_bytes: int = 1 << 30):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, namespace: str, key: str, default: Any = None) -> Any:
+        """Return the cached value, or `default` on a miss."""
+        path = self._path(namespace, key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+        except FileNotFoundError:
+            self.misses += 1
+            return default
+        except (OSError, pickle.UnpicklingError, EOFError):
+            logger.warning("Dropping unreadable cache entry %s", path)
+            self._remove(path)
+            self.misses += 1
+            return default
+
+        self.hits += 1
+        try:
+            os.utime(path)
+        except OSError:   # evicted by another process meanwhile
+            pass
+        return value
+
+    def put(self, namespace: str, key: str, value: Any) -> None:
+        """Store a value, then evict least recently used entries if over budget."""
+        path = self._path(namespace, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+        self.evict()
+
+    def get_or_compute(self, namespace: str, key: str, compute: Callable[[], Any]) -> Any:
+        """Return the cached value, computing and storing it on a miss."""
+        missing = object()
+        value = self.get(namespace, key, missing)
+        if value is missing:
+            value = compute()
+            self.put(namespace, key, value)
+        return value
+
+    def size(self) -> int:
+        """Total bytes of all entries."""
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self) -> None:
+        """Delete least recently used entries until the cache fits `max_bytes`."""
+        entries = list(self._entries())
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes:
+            return
+        for path, size, _ in sorted(entries, key=lambda e: e[2]):
+            self._remove(path)
+            total -= size
+            if total <= self.max_bytes:
+                return
+
+    def clear(self) -> None:
+        for path, _, _ in list(self._entries()):
+            self._remove(path)
+
+    def _entries(self) -> Iterable[Tuple[str, int, float]]:
+        """(path, size, mtime) of every entry."""
+        for dirpath, _, names in os.walk(self.root):
+            for name in names:
+                if not name.endswith(_SUFFIX):
+                    continue
+                path = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                yield path, st.st_size, st.st_mtime
+
+    def _path(self, namespace: str, key: str) -> str:
+        return os.path.join(self.root, namespace, key[:2], key + _SUFFIX)
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def open_cache(root: Optional[str], max_bytes: int = 1 << 30) -> Optional[MemoCache]:
+    """A MemoCache for `root`, or None when memoization is off."""
+    return MemoCache(root, max_bytes) if root else None
@@ -0,0 +1,161 @@
+"""
+Precompute vol/signal series for a whole backtest history.
+"""
+# infra/backtest/signal_precompute.py
+
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.domain.signals import VolSignal
+from core.domain.state import MarketState
+from core.domain.types import Candle
+from core.ports.vol_model import VolatilityModel
+from infra.backtest.memo_cache import MemoCache, candles_key, component_key, fingerprint
+from strategies.vol_models.vectorized import NO_SIGNAL, VOL_UP, VolSeries
+
+SeriesKey = Tuple[str, Optional[int], str]
+
+
+def candle_arrays(candles: Sequence[Candle]) -> Dict[str, np.ndarray]:
+    """Column arrays (open/high/low/close/volume) for a list of candles."""
+    return {
+        "open": np.fromiter((c.open for c in candles), float, len(candles)),
+        "high": np.fromiter((c.high for c in candles), float, len(candles)),
+        "low": np.fromiter((c.low for c in candles), float, len(candles)),
+        "close": np.fromiter((c.close for c in candles), float, len(candles)),
+        "volume": np.fromiter((c.volume for c in candles), float, len(candles)),
+    }
+
+
+def tick_prices(candles: Sequence[Candle]) -> np.ndarray:
+    """Prices in the order BacktestFeed replays them (O, H, L, C per candle)."""
+    cols = candle_arrays(candles)
+    return np.column_stack(
+        (cols["open"], cols["high"], cols["low"], cols["close"])
+    ).ravel()
+
+
+def series_key(model: VolatilityModel) -> SeriesKey:
+    """
+    (model name, instrument_token, parameter digest): unique per model
+    configuration, so two lookbacks of one model on a token get two series.
+    Models whose parameters cannot be keyed fall back to their identity.
+    """
+    try:
+        params = fingerprint(component_key(model))
+    except TypeError:
+        params = f"id:{id(model):x}"
+    return model.name, model.instrument_token, params
+
+
+def precompute_signals(candles_by_token: Dict[int, List[Candle]],
+                       vol_models: Sequence[VolatilityModel],
+                       cache: Optional[MemoCache] = None) -> Dict[SeriesKey, VolSeries]:
+    """
+    Run every model's vectorized `batch` over its instrument's full history.
+
+    Tick-driven models see the same price sequence as the replayed feed;
+    candle-driven models (`uses_candles`) get (high, low, close) bar arrays.
+    Returns {series_key(model): VolSeries}. Models without a batch API or
+    without a single instrument are skipped. With a `cache`, each series is
+    memoized under a hash of its token's candles and the model's parameters.
+    """
+    results: Dict[SeriesKey, VolSeries] = {}
+    arrays: Dict[int, Dict[str, np.ndarray]] = {}
+    prices: Dict[int, np.ndarray] = {}
+    data_keys: Dict[int, str] = {}
+
+    for model in vol_models:
+        token = model.instrument_token
+        if token is None or token not in candles_by_token or not hasattr(model, "batch"):
+            continue
+        key = series_key(model)
+        if key in results:   # an identical configuration: same series
+            continue
+
+        cache_key = None
+        if cache is not None and not key[2].startswith("id:"):
+            if token not in data_keys:
+                data_keys[token] = candles_key(candles_by_token[token])
+            cache_key = fingerprint("signals", data_keys[token], key[2])
+        if cache_key is not None:
+            series = cache.get_or_compute(
+                "signals", cache_key,
+                lambda: _batch(model, candles_by_token[token], arrays, prices))
+        else:
+            series = _batch(model, candles_by_token[token], arrays, prices)
+
+        results[key] = series
+
+    return results
+
+
+class PrecomputedVolModel(VolatilityModel):
+    """
+    Stands in for a tick model in a backtest, replaying its precomputed series.
+
+    The engine calls `update` once per tick of the model's token, in feed
+    order, which is the order `tick_prices` fed to `batch`; each call emits
+    the signal at the next step instead of recomputing the vol.
+    """
+
+    def __init__(self, model: VolatilityModel, series: VolSeries):
+        self.model = model
+        self.name = model.name
+        self.instrument_token = model.instrument_token
+        self._codes = series.signal.tolist()
+        self._strengths = series.strength.tolist()
+        self._step = 0
+
+    def update(self, state: MarketState) -> Optional[VolSignal]:
+        step = self._step
+        self._step = step + 1
+        if step >= len(self._codes):
+            return None
+        code = self._codes[step]
+        if code == NO_SIGNAL:
+            return None
+
+        tick = state.last_ticks.get(self.instrument_token)
+        return VolSignal(
+            instrument_token=self.instrument_token,
+            kind="VOL_UP" if code == VOL_UP else "VOL_DOWN",
+            strength=self._strengths[step],
+            timestamp=(tick.timestamp if tick is not None and isinstance(tick.timestamp, datetime)
+                       else self.clock.now()),
+        )
+
+
+def replay_models(candles_by_token: Dict[int, List[Candle]],
+                  vol_models: Sequence[VolatilityModel],
+                  cache: Optional[MemoCache] = None) -> List[VolatilityModel]:
+    """
+    The backtest's vol models with every single-instrument tick model
+    swapped for a PrecomputedVolModel over its batch series. Candle models
+    stay streaming: the engine builds their bars from ticks, which need not
+    line up with the dataset's candles.
+    """
+    tick_models = [m for m in vol_models if not m.uses_candles]
+    series = precompute_signals(candles_by_token, tick_models, cache)
+    replayed: List[VolatilityModel] = []
+    for model in vol_models:
+        found = None if model.uses_candles else series.get(series_key(model))
+        replayed.append(model if found is None else PrecomputedVolModel(model, found))
+    return replayed
+
+
+def _batch(model: VolatilityModel, candles: List[Candle],
+           arrays: Dict[int, Dict[str, np.ndarray]],
+           prices: Dict[int, np.ndarray]) -> VolSeries:
+    """Run one model's batch API, sharing input arrays per token."""
+    token = model.instrument_token
+    if model.uses_candles:
+        if token not in arrays:
+            arrays[token] = candle_arrays(candles)
+        cols = arrays[token]
+        return model.batch(cols["high"], cols["low"], cols["close"])
+    if token not in prices:
+        prices[token] = tick_prices(candles)
+    return model.batch(prices[token])
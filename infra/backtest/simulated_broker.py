@@ -1,55 +1,101 @@
 """
 Simulated broker for backtesting.
 """
-import uuid
-from typing import List
-from datetime import datetime, timezone
+import heapq
+import itertools
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Deque, Dict, List, Optional, Tuple
 
 from core.ports.broker import Broker
-from core.domain.types import OrderRequest, OrderExecutionReport, Position
+from core.domain.types import OrderRequest, OrderExecutionReport, Position, Tick
+
+
+@dataclass
+class _Book:
+    """Pending orders for one instrument."""
+    # (active_at, seq, order_id) → orders still in flight to the "exchange";
+    # active_at is None for orders placed before the first tick
+    incoming: Deque[Tuple[Optional[datetime], int, str]] = field(default_factory=deque)
+    # (-price, seq, order_id) → best (highest) bid on top
+    bids: List[Tuple[float, int, str]] = field(default_factory=list)
+    # (price, seq, order_id) → best (lowest) ask on top
+    asks: List[Tuple[float, int, str]] = field(default_factory=list)
 
 
 class SimulatedBroker(Broker):
     """
-    Backtest broker. Orders remain NEW until the backtest engine fills them.
+    Backtest broker with a per-instrument matching engine.
+
+    Orders are accepted as NEW and become live `latency` after the last
+    replayed tick. On each tick for an instrument (`on_tick`):
+      - live MARKET orders fill at the tick price ± slippage
+      - LIMIT orders fill once the price crosses their limit, at the tick
+        price ± slippage but never worse than the limit
+    Limit orders sit in price-sorted heaps per instrument, so a tick only
+    touches orders that can actually fill. Cancels and price modifications
+    are lazy: stale heap entries are skipped when they reach the top.
+    Reports are stamped with replay time, never the wall clock.
     """
 
-    def __init__(self):
+    def __init__(self, slippage_bps: float = 0.0, latency: timedelta = timedelta(0)):
+        self.slippage = slippage_bps / 10_000
+        self.latency = latency
+
         self.positions = {}         # token → Position
         self.orders = {}            # order_id → OrderExecutionReport
         self.pending_orders = {}    # order_id → OrderRequest
 
+        self._books: Dict[int, _Book] = {}
+        self._live: Dict[str, int] = {}       # order_id → seq of its current book entry
+        self._seq = itertools.count()
+        self._order_ids = itertools.count(1)
+        self._realized: Dict[int, float] = {}  # token → realized PnL
+        self._now: Optional[datetime] = None   # timestamp of the last replayed tick
+        self._lock = threading.Lock()          # place_order may run on executor threads
+
     def place_order(self, order: OrderRequest) -> OrderExecutionReport:
         """Simulate placing an order."""
-        order_id = str(uuid.uuid4())
-
-        report = OrderExecutionReport(
-            order_id=order_id,
-            status="NEW",
-            filled_quantity=0,
-            avg_price=0.0,
-            timestamp=datetime.now(timezone.utc)
-        )
-
-        self.orders[order_id] = report
-        self.pending_orders[order_id] = order
+        # sequential ids keep repeated runs identical
+        order_id = f"SIM-{next(self._order_ids)}"
+
+        with self._lock:
+            report = OrderExecutionReport(
+                order_id=order_id,
+                status="NEW",
+                filled_quantity=0,
+                avg_price=0.0,
+                timestamp=self._now or self.clock.now()
+            )
+
+            self.orders[order_id] = report
+            self.pending_orders[order_id] = order
+            self._enqueue(order_id, order)
         return report
 
     def modify_order(self, order_id: str, **kwargs) -> OrderExecutionReport:
         """Simulate modifying an order."""
-        order = self.pending_orders.get(order_id)
-        if order:
-            for key, value in kwargs.items():
-                if hasattr(order, key):
-                    object.__setattr__(order, key, value)
-        return self.orders[order_id]
+        with self._lock:
+            order = self.pending_orders.get(order_id)
+            if order:
+                changes = {k: v for k, v in kwargs.items() if k in order._fields}
+                order = order._replace(**changes)
+                self.pending_orders[order_id] = order
+                # re-queue: a modified order loses its place and pays latency again
+                self._enqueue(order_id, order)
+            return self.orders[order_id]
 
     def cancel_order(self, order_id: str) -> None:
         """Simulate cancelling an order."""
-        if order_id in self.pending_orders:
-            del self.pending_orders[order_id]
-        if order_id in self.orders:
-            self.orders[order_id].status = "CANCELLED"
+        with self._lock:
+            if order_id in self.pending_orders:
+                del self.pending_orders[order_id]
+                self._live.pop(order_id, None)
+            if order_id in self.orders:
+                self.orders[order_id] = self.orders[order_id]._replace(
+                    status="CANCELLED", timestamp=self._now or self.clock.now())
 
     def get_positions(self) -> List[Position]:
         """Return simulated positions."""
@@ -57,6 +103,72 @@ class SimulatedBroker(Broker):
 
     # ------------ CALLED BY BACKTEST ENGINE -----------------
 
+    def on_tick(self, tick: Tick) -> List[OrderExecutionReport]:
+        """Match this instrument's pending orders against a replayed tick."""
+        with self._lock:
+            self._now = tick.timestamp
+            token = tick.instrument_token
+            self._mark(token, tick.last_price)
+
+            book = self._books.get(token)
+            if book is None:
+                return []
+
+            price = tick.last_price
+            fills = []
+
+            # orders that reached the exchange: MARKET fills now, LIMIT joins the book
+            while book.incoming and (book.incoming[0][0] is None
+                                     or book.incoming[0][0] <= tick.timestamp):
+                _, seq, order_id = book.incoming.popleft()
+                if self._live.get(order_id) != seq:
+                    continue
+                order = self.pending_orders[order_id]
+                if order.order_type == "MARKET" or order.price is None:
+                    fills.append(self._fill_at(order_id, order, price))
+                elif order.transaction_type == "BUY":
+                    heapq.heappush(book.bids, (-order.price, seq, order_id))
+                else:
+                    heapq.heappush(book.asks, (order.price, seq, order_id))
+
+            # bids at or above the price, asks at or below it
+            while book.bids and -book.bids[0][0] >= price:
+                _, seq, order_id = heapq.heappop(book.bids)
+                if self._live.get(order_id) == seq:
+                    fills.append(self._fill_at(order_id, self.pending_orders[order_id], price))
+            while book.asks and book.asks[0][0] <= price:
+                _, seq, order_id = heapq.heappop(book.asks)
+                if self._live.get(order_id) == seq:
+                    fills.append(self._fill_at(order_id, self.pending_orders[order_id], price))
+
+            return fills
+
+    def _enqueue(self, order_id: str, order: OrderRequest) -> None:
+        seq = next(self._seq)
+        self._live[order_id] = seq
+        book = self._books.setdefault(order.instrument_token, _Book())
+        active_at = self._now + self.latency if self._now is not None else None
+        book.incoming.append((active_at, seq, order_id))
+
+    def _fill_at(self, order_id: str, order: OrderRequest, price: float) -> OrderExecutionReport:
+        """Fill an order at `price` after slippage, capped at its limit."""
+        if order.transaction_type == "BUY":
+            fill_price = price * (1 + self.slippage)
+            if order.price is not None and order.order_type == "LIMIT":
+                fill_price = min(fill_price, order.price)
+        else:
+            fill_price = price * (1 - self.slippage)
+            if order.price is not None and order.order_type == "LIMIT":
+                fill_price = max(fill_price, order.price)
+        return self._simulate_fill(order_id, fill_price, order.quantity)
+
+    def _mark(self, token: int, price: float) -> None:
+        """Mark an open position to the latest price."""
+        pos = self.positions.get(token)
+        if pos is not None:
+            unrealized = (price - pos.avg_price) * pos.quantity
+            self.positions[token] = pos._replace(pnl=self._realized.get(token, 0.0) + unrealized)
+
     def _simulate_fill(self, order_id: str, fill_price: float, fill_qty: int):
         """
         Backtest engine provides fill price and quantity.
@@ -67,29 +179,43 @@ class SimulatedBroker(Broker):
             return
 
         report = self.orders[order_id]
+        token = order_req.instrument_token
 
         mult = 1 if order_req.transaction_type == "BUY" else -1
         qty_delta = mult * fill_qty
 
-        if order_req.instrument_token in self.positions:
-            pos = self.positions[order_req.instrument_token]
-            new_qty = pos.quantity + qty_delta
-            avg_price = fill_price if new_qty == qty_delta else pos.avg_price
-        else:
-            new_qty = qty_delta
-            avg_price = fill_price
+        pos = self.positions.get(token)
+        old_qty = pos.quantity if pos else 0
+        old_avg = pos.avg_price if pos else 0.0
+        new_qty = old_qty + qty_delta
 
-        # PnL is computed later by the backtest engine normally
-        self.positions[order_req.instrument_token] = Position(
-            instrument_token=order_req.instrument_token,
+        if old_qty == 0 or (old_qty > 0) == (qty_delta > 0):
+            # opening or adding → weighted average entry
+            avg_price = (old_avg * old_qty + fill_price * qty_delta) / new_qty
+        else:
+            # reducing, closing or flipping → realize PnL on the closed part
+            closed = min(abs(old_qty), abs(qty_delta))
+            sign = 1 if old_qty > 0 else -1
+            self._realized[token] = (self._realized.get(token, 0.0)
+                                     + (fill_price - old_avg) * closed * sign)
+            avg_price = old_avg if (new_qty and (new_qty > 0) == (old_qty > 0)) else fill_price
+
+        realized = self._realized.get(token, 0.0)
+        self.positions[token] = Position(
+            instrument_token=token,
             quantity=new_qty,
-            avg_price=avg_price,
-            pnl=0.0,
+            avg_price=avg_price if new_qty else 0.0,
+            pnl=realized + (fill_price - avg_price) * new_qty,
         )
 
-        report.filled_quantity = fill_qty
-        report.avg_price = fill_price
-        report.status = "FILLED"
-        report.timestamp = datetime.now(timezone.utc)
+        report = report._replace(
+            filled_quantity=fill_qty,
+            avg_price=fill_price,
+            status="FILLED",
+            timestamp=self._now or self.clock.now(),
+        )
+        self.orders[order_id] = report
 
-        del self.pending_orders[order_id]
\ No newline at end of file
+        del self.pending_orders[order_id]
+        self._live.pop(order_id, None)
+        return report
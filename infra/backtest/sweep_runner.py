@@ -0,0 +1,313 @@
+"""
+Parameter-sweep backtests over a process pool.
+"""
+# infra/backtest/sweep_runner.py
+
+import contextlib
+import csv
+import io
+import itertools
+import logging
+import os
+import time
+from datetime import timedelta
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from core.domain.types import Candle
+from core.engine.runner import Engine
+from core.engine.execution import OrderExecutor
+from core.engine.clock import ReplayClock
+from infra.backtest.backtest_feed import BacktestFeed
+from infra.backtest.candle_cache import COLUMNS, candles_to_columns, columns_to_candles
+from infra.backtest.memo_cache import (MemoCache, component_key, dataset_key, fingerprint,
+                                       open_cache)
+from infra.backtest.signal_precompute import replay_models
+from infra.backtest.simulated_broker import SimulatedBroker
+from infra.dummy.dummy_risk import DummyRiskManager
+from strategies.option_strategies.high_vol_long_straddle import HighVolLongStraddleStrategy
+from strategies.option_strategies.long_vol_short_condor import LowVolShortCondorStrategy
+from strategies.vol_models.ewma_vol_model import EWMAVolModel
+from strategies.vol_models.realized_vol_model import RealizedVolModel
+
+logger = logging.getLogger(__name__)
+
+# (vol_models, strategies, risk_mgr) for one parameter combination
+Components = Tuple[list, list, Any]
+Builder = Callable[[Dict[str, Any], List[int]], Components]
+
+# token, rows, utcoffset, {column: byte offset}
+_Layout = List[Tuple[int, int, Optional[int], Dict[str, int]]]
+
+
+def expand_grid(grid: Dict[str, Sequence[Any]]) -> List[Dict[str, Any]]:
+    """Cartesian product of a parameter grid, in a stable order."""
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+
+
+def default_builder(params: Dict[str, Any], tokens: List[int]) -> Components:
+    """
+    Realized vol (+ EWMA when `decay_factor` is swept) with one straddle and
+    one condor per token. Recognised keys: lookback, high_threshold,
+    low_threshold, decay_factor, entry_threshold, exit_threshold, width.
+    """
+    vol_kwargs = {k: params[k] for k in ("lookback", "high_threshold", "low_threshold")
+                  if k in params}
+    strat_kwargs = {k: params[k] for k in ("entry_threshold", "exit_threshold") if k in params}
+    condor_kwargs = dict(strat_kwargs)
+    if "width" in params:
+        condor_kwargs["width"] = params["width"]
+
+    vol_models = []
+    strategies = []
+    for token in tokens:
+        vol_models.append(RealizedVolModel(instrument_token=token, **vol_kwargs))
+        if "decay_factor" in params:
+            vol_models.append(EWMAVolModel(instrument_token=token,
+                                           decay_factor=params["decay_factor"]))
+        strategies.append(HighVolLongStraddleStrategy(underlying_token=token, **strat_kwargs))
+        strategies.append(LowVolShortCondorStrategy(underlying_token=token, **condor_kwargs))
+
+    return vol_models, strategies, DummyRiskManager()
+
+
+def default_metrics(engine: Engine) -> Dict[str, Any]:
+    """Per-run metrics collected into the results table."""
+    positions = engine.broker.get_positions()
+    return {
+        "ticks": engine.tick_count,
+        "actions": engine.action_count,
+        "open_positions": sum(1 for p in positions if p.quantity),
+        "pnl": sum(p.pnl for p in positions),
+    }
+
+
+class SharedCandleStore:
+    """
+    Packs a candle dataset into one shared-memory block.
+
+    Columns are laid out back to back using the candle cache's columnar
+    encoding; workers attach by name and decode once, so the dataset is
+    never pickled per task.
+    """
+
+    def __init__(self, candles_by_token: Dict[int, List[Candle]]):
+        encoded = []
+        size = 0
+        for token, candles in candles_by_token.items():
+            columns, utcoffset = candles_to_columns(candles)
+            encoded.append((token, columns, utcoffset))
+            size += sum(col.itemsize * len(col) for col in columns.values())
+
+        self.shm = SharedMemory(create=True, size=max(size, 1))
+        self.layout: _Layout = []
+
+        offset = 0
+        for token, columns, utcoffset in encoded:
+            offsets = {}
+            for name, _ in COLUMNS:
+                raw = columns[name].tobytes()
+                self.shm.buf[offset:offset + len(raw)] = raw
+                offsets[name] = offset
+                offset += len(raw)
+            self.layout.append((token, len(columns["timestamp"]), utcoffset, offsets))
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @staticmethod
+    def load(name: str, layout: _Layout) -> Dict[int, List[Candle]]:
+        """Attach to a store by name and rebuild the candles."""
+        shm = SharedMemory(name=name)
+        try:
+            candles_by_token = {}
+            for token, rows, utcoffset, offsets in layout:
+                columns = {}
+                for column, code in COLUMNS:
+                    start = offsets[column]
+                    columns[column] = shm.buf[start:start + 8 * rows].cast(code)
+                candles_by_token[token] = columns_to_candles(token, columns, utcoffset)
+                for col in columns.values():
+                    col.release()
+            return candles_by_token
+        finally:
+            shm.close()
+
+    def close(self) -> None:
+        """Release and unlink the shared block."""
+        self.shm.close()
+        self.shm.unlink()
+
+
+# ------------ worker side -----------------
+
+_worker_candles: Dict[int, List[Candle]] = {}
+_worker_builder: Optional[Builder] = None
+_worker_metrics: Optional[Callable[[Engine], Dict[str, Any]]] = None
+_worker_cache: Optional[MemoCache] = None
+_worker_data_key: Optional[str] = None
+
+
+def _init_worker(name: str, layout: _Layout, builder: Builder, metrics,
+                 memo_dir: Optional[str] = None, data_key: Optional[str] = None) -> None:
+    global _worker_candles, _worker_builder, _worker_metrics, _worker_cache, _worker_data_key
+    _worker_candles = SharedCandleStore.load(name, layout)
+    _worker_builder = builder
+    _worker_metrics = metrics
+    _worker_cache = open_cache(memo_dir)
+    _worker_data_key = data_key
+
+
+def _run_one(params: Dict[str, Any]) -> Dict[str, Any]:
+    return run_backtest(_worker_candles, params, _worker_builder, _worker_metrics,
+                        _worker_cache, _worker_data_key)
+
+
+def run_components(candles_by_token: Dict[int, List[Candle]],
+                   vol_models: list,
+                   strategies: list,
+                   risk_mgr,
+                   slippage_bps: float = 0.0,
+                   latency_ms: float = 0.0,
+                   metrics: Callable[[Engine], Dict[str, Any]] = default_metrics,
+                   cache: Optional[MemoCache] = None,
+                   data_key: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Backtest fresh components over a dataset and return the run's metrics.
+
+    With a `cache`, the metrics are memoized under a hash of the dataset
+    (`data_key`, computed when not given), every component's constructor
+    parameters, the broker settings and the metrics function; an unchanged
+    run is served from disk without replaying a tick. On a miss, the tick
+    models' signal series are still memoized per model (see replay_models),
+    so runs that only change strategies or risk reuse them. Components whose
+    parameters cannot be keyed run uncached. `seconds` is this call's wall
+    time (replay, or cache lookup when `cached` is True) and is never stored.
+    """
+    started = time.perf_counter()
+    key = None
+    if cache is not None:
+        try:
+            key = fingerprint(
+                "run",
+                data_key or dataset_key(candles_by_token),
+                [component_key(vm) for vm in vol_models],
+                [component_key(s) for s in strategies],
+                component_key(risk_mgr),
+                slippage_bps,
+                latency_ms,
+                f"{metrics.__module__}.{metrics.__qualname__}",
+            )
+        except TypeError as e:
+            logger.warning("Running uncached: %s", e)
+        else:
+            cached = cache.get("runs", key)
+            if cached is not None:
+                row = dict(cached)
+                row["cached"] = True
+                row["seconds"] = time.perf_counter() - started
+                return row
+
+    broker = SimulatedBroker(slippage_bps=slippage_bps,
+                             latency=timedelta(milliseconds=latency_ms))
+    engine = Engine(
+        feed=BacktestFeed(candles_by_token),
+        broker=broker,
+        # tick models replay series computed in one vectorized pass
+        vol_models=replay_models(candles_by_token, vol_models, cache),
+        strategies=strategies,
+        risk_mgr=risk_mgr,
+        executor=OrderExecutor(broker, max_workers=0),
+        clock=ReplayClock(),
+    )
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        engine.run()
+
+    row = metrics(engine)
+    if key is not None:
+        cache.put("runs", key, row)
+    row = dict(row)
+    row["cached"] = False
+    row["seconds"] = time.perf_counter() - started
+    return row
+
+
+def run_backtest(candles_by_token: Dict[int, List[Candle]],
+                 params: Dict[str, Any],
+                 builder: Builder = default_builder,
+                 metrics: Callable[[Engine], Dict[str, Any]] = default_metrics,
+                 cache: Optional[MemoCache] = None,
+                 data_key: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Run one backtest for `params` and return its results row.
+    `slippage_bps` and `latency_ms` in `params` configure the simulated broker.
+    """
+    vol_models, strategies, risk_mgr = builder(params, list(candles_by_token))
+    row = dict(params)
+    row.update(run_components(candles_by_token, vol_models, strategies, risk_mgr,
+                              slippage_bps=params.get("slippage_bps", 0.0),
+                              latency_ms=params.get("latency_ms", 0.0),
+                              metrics=metrics, cache=cache, data_key=data_key))
+    return row
+
+
+class ParameterSweepRunner:
+    """
+    Runs one backtest per combination of a parameter grid.
+
+    The candle dataset is loaded once by the caller, shared with every
+    worker through shared memory, and each combination runs in a process
+    pool (all cores by default). Results come back as one row per run.
+    With `memo_dir`, rows are memoized (see `run_components`), so re-running
+    a grid only replays the combinations whose inputs changed.
+    """
+
+    def __init__(self,
+                 candles_by_token: Dict[int, List[Candle]],
+                 builder: Builder = default_builder,
+                 metrics: Callable[[Engine], Dict[str, Any]] = default_metrics,
+                 max_workers: Optional[int] = None,
+                 memo_dir: Optional[str] = None):
+        self.candles_by_token = candles_by_token
+        self.builder = builder
+        self.metrics = metrics
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.memo_dir = memo_dir
+
+    def run(self, grid: Dict[str, Sequence[Any]]) -> List[Dict[str, Any]]:
+        """Run every combination; rows are returned in grid order."""
+        combos = expand_grid(grid)
+        # hash the dataset once for the whole grid
+        data_key = dataset_key(self.candles_by_token) if self.memo_dir else None
+        if self.max_workers == 1 or len(combos) <= 1:
+            cache = open_cache(self.memo_dir)
+            return [run_backtest(self.candles_by_token, params, self.builder, self.metrics,
+                                 cache, data_key)
+                    for params in combos]
+
+        store = SharedCandleStore(self.candles_by_token)
+        try:
+            with ProcessPoolExecutor(
+                max_workers=min(self.max_workers, len(combos)),
+                initializer=_init_worker,
+                initargs=(store.name, store.layout, self.builder, self.metrics,
+                          self.memo_dir, data_key),
+            ) as pool:
+                return list(pool.map(_run_one, combos))
+        finally:
+            store.close()
+
+    @staticmethod
+    def to_csv(rows: List[Dict[str, Any]], path: str) -> None:
+        """Write a results table to CSV."""
+        fields: List[str] = []
+        for row in rows:
+            fields.extend(k for k in row if k not in fields)
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=fields)
+            writer.writeheader()
+            writer.writerows(rows)
@@ -0,0 +1,48 @@
+# infra/dummy/dry_run_broker.py
+
+import itertools
+import logging
+from typing import List
+
+from core.ports.broker import Broker
+from core.domain.types import OrderRequest, OrderExecutionReport, Position
+
+logger = logging.getLogger(__name__)
+
+DRY_RUN = "DRY_RUN"
+
+
+class DryRunBroker(Broker):
+    """
+    Wraps a live broker so orders are logged instead of sent.
+    Positions are still read from the wrapped broker; nothing is ever
+    placed, modified or cancelled there. Reports carry status DRY_RUN,
+    so the engine never books them as fills.
+    """
+
+    def __init__(self, broker: Broker):
+        self.broker = broker
+        self._ids = itertools.count(1)
+
+    def place_order(self, order: OrderRequest) -> OrderExecutionReport:
+        order_id = f"dry-run-{next(self._ids)}"
+        logger.warning("DRY RUN order %s: %s %s x%s %s @ %s", order_id,
+                       order.transaction_type, order.instrument_token, order.quantity,
+                       order.order_type, order.price)
+        return OrderExecutionReport(
+            order_id=order_id,
+            status=DRY_RUN,
+            filled_quantity=0,
+            avg_price=0.0,
+            timestamp=self.clock.now(),
+        )
+
+    def modify_order(self, order_id: str, **kwargs) -> OrderExecutionReport:
+        logger.warning("DRY RUN modify %s: %s", order_id, kwargs)
+        return OrderExecutionReport(order_id, DRY_RUN, 0, 0.0, self.clock.now())
+
+    def cancel_order(self, order_id: str) -> None:
+        logger.warning("DRY RUN cancel %s", order_id)
+
+    def get_positions(self) -> List[Position]:
+        return self.broker.get_positions()
@@ -1,5 +1,4 @@
 import uuid
-from datetime import datetime, timezone
 from typing import List
 
 from core.ports.broker import Broker
@@ -42,7 +41,7 @@ class DummyBroker(Broker):
             status="FILLED",
             filled_quantity=order.quantity,
             avg_price=fill_price,
-            timestamp=datetime.now(timezone.utc)
+            timestamp=self.clock.now()
         )
 
         self.orders[order_id] = report
@@ -9,8 +9,9 @@ class DummyStrategy(Strategy):
     name = "dummy_strategy"
 
     def on_vol_signal(self, ctx: StrategyContext):
+        # only the signals of the token being dispatched, so each is acted on once
         actions = []
-        for sig in ctx.vol_signals:
+        for sig in ctx.signals:
             if sig.kind == "VOL_UP":
                 # produce a buy action
                 actions.append(
@@ -3,7 +3,6 @@
 from core.ports.vol_model import VolatilityModel
 from core.domain.state import MarketState
 from core.domain.signals import VolSignal
-from datetime import datetime
 
 
 class DummyVolModel(VolatilityModel):
@@ -22,6 +21,6 @@ class DummyVolModel(VolatilityModel):
                 instrument_token=any_token,
                 kind="VOL_UP",
                 strength=0.8,
-                timestamp=datetime.now()
+                timestamp=self.clock.now()
             )
         return None
\ No newline at end of file
@@ -0,0 +1,239 @@
+"""
+In-memory instrument master, cached on disk per trading day.
+"""
+# infra/zerodtha/instrument_master.py
+
+import csv
+import json
+import logging
+import os
+import sys
+from array import array
+from datetime import date
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from core.domain.types import Instrument
+
+logger = logging.getLogger(__name__)
+
+# (column, array typecode); expiry is a date ordinal, NO_EXPIRY when absent
+NUMERIC: Tuple[Tuple[str, str], ...] = (
+    ("instrument_token", "q"),
+    ("expiry", "l"),
+    ("strike", "d"),
+    ("tick_size", "d"),
+    ("lot_size", "l"),
+)
+# few distinct values: stored as indexes into a per-file value table
+CODED: Tuple[str, ...] = ("exchange", "segment", "instrument_type")
+TEXT: Tuple[str, ...] = ("tradingsymbol", "name")
+NO_EXPIRY = 0
+
+FORMAT_VERSION = 1
+_SUFFIX = ".col"
+_SEP = "\n"
+
+
+def _expiry_ordinal(value) -> int:
+    if not value:
+        return NO_EXPIRY
+    if isinstance(value, str):
+        value = date.fromisoformat(value[:10])
+    return value.toordinal()
+
+
+class InstrumentMaster:
+    """
+    The broker's instrument dump held column by column.
+
+    Numbers live in typed arrays, exchange/segment/type as small integer
+    codes, and symbols and names as plain lists, so ~100k rows cost a few
+    MB and load from the day file in milliseconds. Dicts map token and
+    "EXCHANGE:TRADINGSYMBOL" to a row, giving O(1) lookups (the symbol
+    index is built on first use); `Instrument` tuples are only built for
+    the rows asked for.
+    """
+
+    def __init__(self, numeric: Dict[str, array], codes: Dict[str, array],
+                 values: Dict[str, List[str]], text: Dict[str, List[str]]):
+        self._numeric = numeric
+        self._codes = codes
+        self._values = values
+        self._text = text
+
+        tokens = numeric["instrument_token"]
+        self._row_by_token: Dict[int, int] = dict(zip(tokens.tolist(), range(len(tokens))))
+        # built on the first symbol lookup; order placement only needs tokens
+        self._row_by_symbol: Optional[Dict[str, int]] = None
+
+    # ------------ construction -----------------
+
+    @classmethod
+    def from_records(cls, records: Iterable[dict]) -> "InstrumentMaster":
+        """Build from rows shaped like Kite's `instruments()` (dicts, or CSV strings)."""
+        numeric = {name: array(code) for name, code in NUMERIC}
+        codes = {name: array("H") for name in CODED}
+        values: Dict[str, List[str]] = {name: [] for name in CODED}
+        lookup: Dict[str, Dict[str, int]] = {name: {} for name in CODED}
+        text: Dict[str, List[str]] = {name: [] for name in TEXT}
+
+        for r in records:
+            numeric["instrument_token"].append(int(r["instrument_token"]))
+            numeric["expiry"].append(_expiry_ordinal(r.get("expiry")))
+            numeric["strike"].append(float(r.get("strike") or 0.0))
+            numeric["tick_size"].append(float(r.get("tick_size") or 0.0))
+            numeric["lot_size"].append(int(float(r.get("lot_size") or 0)))
+            for name in CODED:
+                value = r.get(name) or ""
+                code = lookup[name].get(value)
+                if code is None:
+                    code = lookup[name][value] = len(values[name])
+                    values[name].append(value)
+                codes[name].append(code)
+            for name in TEXT:
+                text[name].append(r.get(name) or "")
+
+        return cls(numeric, codes, values, text)
+
+    @classmethod
+    def from_csv(cls, path: str) -> "InstrumentMaster":
+        """Build from the instruments CSV dump (https://api.kite.trade/instruments)."""
+        with open(path, newline="") as f:
+            return cls.from_records(csv.DictReader(f))
+
+    # ------------ persistence -----------------
+
+    def save(self, path: str) -> None:
+        """Write atomically: a JSON header line, the arrays, then the text blobs."""
+        blobs = {name: _SEP.join(self._text[name]).encode() for name in TEXT}
+        header = {
+            "version": FORMAT_VERSION,
+            "rows": len(self),
+            "byteorder": sys.byteorder,
+            "values": self._values,
+            "text_bytes": {name: len(blob) for name, blob in blobs.items()},
+        }
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(json.dumps(header).encode() + b"\n")
+            for name, _ in NUMERIC:
+                self._numeric[name].tofile(f)
+            for name in CODED:
+                self._codes[name].tofile(f)
+            for name in TEXT:
+                f.write(blobs[name])
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> "InstrumentMaster":
+        """Read a file written by `save`."""
+        with open(path, "rb") as f:
+            header = json.loads(f.readline())
+            if header.get("version") != FORMAT_VERSION:
+                raise ValueError(f"Unsupported instrument file version in {path}")
+            rows = header["rows"]
+            swap = header["byteorder"] != sys.byteorder
+
+            def read(code: str) -> array:
+                col = array(code)
+                col.fromfile(f, rows)
+                if swap:
+                    col.byteswap()
+                return col
+
+            numeric = {name: read(code) for name, code in NUMERIC}
+            codes = {name: read("H") for name in CODED}
+            text = {}
+            for name in TEXT:
+                blob = f.read(header["text_bytes"][name]).decode()
+                text[name] = blob.split(_SEP) if rows else []
+
+        return cls(numeric, codes, header["values"], text)
+
+    # ------------ lookups -----------------
+
+    def __len__(self) -> int:
+        return len(self._numeric["instrument_token"])
+
+    def __contains__(self, instrument_token: int) -> bool:
+        return instrument_token in self._row_by_token
+
+    def get(self, instrument_token: int) -> Optional[Instrument]:
+        """The instrument with this token, or None."""
+        row = self._row_by_token.get(instrument_token)
+        return None if row is None else self.at(row)
+
+    def find(self, exchange: str, tradingsymbol: str) -> Optional[Instrument]:
+        """The instrument listed as `tradingsymbol` on `exchange`, or None."""
+        by_symbol = self._row_by_symbol
+        if by_symbol is None:
+            by_symbol = self._row_by_symbol = self._index_symbols()
+        row = by_symbol.get(exchange + ":" + tradingsymbol)
+        return None if row is None else self.at(row)
+
+    def _index_symbols(self) -> Dict[str, int]:
+        exchanges = self._values["exchange"]
+        return dict(zip(
+            [exchanges[code] + ":" + symbol
+             for code, symbol in zip(self._codes["exchange"], self._text["tradingsymbol"])],
+            range(len(self)),
+        ))
+
+    def at(self, row: int) -> Instrument:
+        """The instrument stored at a row."""
+        numeric, codes, values, text = self._numeric, self._codes, self._values, self._text
+        expiry = numeric["expiry"][row]
+        return Instrument(
+            instrument_token=numeric["instrument_token"][row],
+            exchange=values["exchange"][codes["exchange"][row]],
+            tradingsymbol=text["tradingsymbol"][row],
+            name=text["name"][row],
+            instrument_type=values["instrument_type"][codes["instrument_type"][row]],
+            segment=values["segment"][codes["segment"][row]],
+            expiry=None if expiry == NO_EXPIRY else date.fromordinal(expiry),
+            strike=numeric["strike"][row],
+            tick_size=numeric["tick_size"][row],
+            lot_size=numeric["lot_size"][row],
+        )
+
+    def column(self, name: str) -> Sequence:
+        """
+        A whole column, row-aligned, for bulk consumers building their own
+        indexes (numeric columns are the stored arrays, not copies).
+        """
+        if name in self._numeric:
+            return self._numeric[name]
+        if name in self._codes:
+            table = self._values[name]
+            return [table[code] for code in self._codes[name]]
+        return self._text[name]
+
+
+def load_instrument_master(cache_dir: str, fetch: Callable[[], Iterable[dict]],
+                           day: Optional[date] = None) -> InstrumentMaster:
+    """
+    The instrument master for `day` (default today).
+
+    Served from <cache_dir>/<YYYY-MM-DD>.col when present; otherwise
+    `fetch()` (e.g. `kite.instruments`) downloads it, and the day file is
+    written and older days deleted. The broker publishes the dump once a
+    day before the open, so one download per trading day is enough.
+    """
+    day = day or date.today()
+    path = os.path.join(cache_dir, day.isoformat() + _SUFFIX)
+    if os.path.exists(path):
+        try:
+            return InstrumentMaster.load(path)
+        except (OSError, EOFError, ValueError, KeyError):
+            logger.warning("Discarding unreadable instrument cache %s", path)
+
+    master = InstrumentMaster.from_records(fetch())
+    master.save(path)
+    for name in os.listdir(cache_dir):
+        if name.endswith(_SUFFIX) and name != os.path.basename(path):
+            try:
+                os.remove(os.path.join(cache_dir, name))
+            except OSError:
+                pass
+    return master
@@ -0,0 +1,175 @@
+"""
+Bounded ingress buffer between the Kite websocket thread and the engine.
+"""
+# infra/zerodtha/tick_buffer.py
+
+import queue
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Deque, List, NamedTuple, Optional, Tuple
+
+from core.domain.types import Tick
+
+BLOCK = "block"                # producer waits for space (back-pressure on the socket)
+DROP_OLDEST = "drop_oldest"    # evict the oldest pending tick
+DROP_NEWEST = "drop_newest"    # discard the incoming tick
+CONFLATE = "conflate"          # keep only the latest pending tick per token (lossy)
+POLICIES = (BLOCK, DROP_OLDEST, DROP_NEWEST, CONFLATE)
+
+
+class BufferMetrics(NamedTuple):
+    """Point-in-time view of a TickBuffer."""
+    depth: int
+    capacity: int
+    policy: str
+    enqueued: int
+    delivered: int
+    dropped: int
+    conflated: int
+    high_watermark: int
+    oldest_age: float   # seconds the oldest pending tick has waited
+
+
+class TickBuffer:
+    """
+    Thread-safe bounded FIFO of ticks with a configurable overflow policy.
+
+    Under CONFLATE a newer tick for a token that is already pending replaces
+    it in place: the token keeps its queue position and its original
+    enqueue time, so `oldest_age` still reports how far behind the engine
+    is; when more tokens are pending than `capacity`, the oldest is dropped.
+    Conflation is lossy: replaced ticks never reach the bar builder (bar
+    highs/lows) or the tick vol models (one return per update), so it only
+    suits consumers of the latest price. The other policies drop nothing
+    until the buffer is actually full.
+    """
+
+    def __init__(self,
+                 capacity: int = 10_000,
+                 policy: str = DROP_OLDEST,
+                 clock: Callable[[], float] = time.monotonic):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown overflow policy: {policy} (expected one of {POLICIES})")
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+
+        self.capacity = capacity
+        self.policy = policy
+        self._clock = clock
+        self._cond = threading.Condition()
+
+        # (tick, enqueued_at); CONFLATE keys pending ticks by token
+        self._fifo: Deque[Tuple[Tick, float]] = deque()
+        self._latest: "OrderedDict[int, Tuple[Tick, float]]" = OrderedDict()
+        self._conflate = policy == CONFLATE
+
+        self._enqueued = 0
+        self._delivered = 0
+        self._dropped = 0
+        self._conflated = 0
+        self._high_watermark = 0
+
+    def __len__(self) -> int:
+        with self._cond:
+            return self._depth()
+
+    def put(self, tick: Tick) -> None:
+        """Add one tick, applying the overflow policy if full."""
+        with self._cond:
+            self._put(tick, self._clock())
+            self._cond.notify_all()
+
+    def put_many(self, ticks: List[Tick]) -> None:
+        """Add a batch of ticks under a single lock acquisition."""
+        with self._cond:
+            now = self._clock()
+            for tick in ticks:
+                self._put(tick, now)
+            self._cond.notify_all()
+
+    def get(self, timeout: Optional[float] = None) -> Tick:
+        """Remove and return the oldest tick; raises queue.Empty on timeout."""
+        with self._cond:
+            self._wait_for_items(timeout)
+            tick = self._pop()
+            self._delivered += 1
+            self._cond.notify_all()
+            return tick
+
+    def get_batch(self, max_items: Optional[int] = None,
+                  timeout: Optional[float] = None) -> List[Tick]:
+        """Wait for at least one tick, then drain up to `max_items` in order."""
+        with self._cond:
+            self._wait_for_items(timeout)
+            n = self._depth() if max_items is None else min(max_items, self._depth())
+            ticks = [self._pop() for _ in range(n)]
+            self._delivered += n
+            self._cond.notify_all()
+            return ticks
+
+    def metrics(self) -> BufferMetrics:
+        with self._cond:
+            oldest = self._oldest_enqueued_at()
+            return BufferMetrics(
+                depth=self._depth(),
+                capacity=self.capacity,
+                policy=self.policy,
+                enqueued=self._enqueued,
+                delivered=self._delivered,
+                dropped=self._dropped,
+                conflated=self._conflated,
+                high_watermark=self._high_watermark,
+                oldest_age=0.0 if oldest is None else self._clock() - oldest,
+            )
+
+    # ------------ internals (lock held) -----------------
+
+    def _depth(self) -> int:
+        return len(self._latest) if self._conflate else len(self._fifo)
+
+    def _put(self, tick: Tick, now: float) -> None:
+        self._enqueued += 1
+
+        if self._conflate:
+            token = tick.instrument_token
+            pending = self._latest.get(token)
+            if pending is not None:
+                self._latest[token] = (tick, pending[1])
+                self._conflated += 1
+                return
+            if len(self._latest) >= self.capacity:
+                self._latest.popitem(last=False)
+                self._dropped += 1
+            self._latest[token] = (tick, now)
+        else:
+            if len(self._fifo) >= self.capacity:
+                if self.policy == DROP_NEWEST:
+                    self._dropped += 1
+                    return
+                if self.policy == DROP_OLDEST:
+                    self._fifo.popleft()
+                    self._dropped += 1
+                else:
+                    while len(self._fifo) >= self.capacity:
+                        self._cond.notify_all()   # wake the consumer before waiting
+                        self._cond.wait()
+            self._fifo.append((tick, now))
+
+        depth = self._depth()
+        if depth > self._high_watermark:
+            self._high_watermark = depth
+
+    def _pop(self) -> Tick:
+        if self._conflate:
+            return self._latest.popitem(last=False)[1][0]
+        return self._fifo.popleft()[0]
+
+    def _wait_for_items(self, timeout: Optional[float]) -> None:
+        if not self._cond.wait_for(self._depth, timeout):
+            raise queue.Empty
+
+    def _oldest_enqueued_at(self) -> Optional[float]:
+        if self._conflate:
+            return next(iter(self._latest.values()))[1] if self._latest else None
+        return self._fifo[0][1] if self._fifo else None
@@ -1,39 +1,64 @@
 """
 Zerodha implementation of the Broker interface.
 """
-from datetime import datetime, timezone
-from typing import List
+from typing import List, Optional
 
 from kiteconnect import KiteConnect
 
 from core.ports.broker import Broker
-from core.domain.types import OrderRequest, OrderExecutionReport, Position
+from core.domain.types import Instrument, OrderRequest, OrderExecutionReport, Position
+from infra.zerodtha.instrument_master import InstrumentMaster, load_instrument_master
+
+
+def round_to_tick(price: float, tick_size: float) -> float:
+    """Snap a limit price to the instrument's tick grid."""
+    if tick_size <= 0:
+        return price
+    return round(round(price / tick_size) * tick_size, 2)
 
 
 class ZerodhaBroker(Broker):
-    """Execution broker using Zerodha Kite Connect API."""
+    """
+    Execution broker using Zerodha Kite Connect API.
+    Orders are addressed by exchange and tradingsymbol, looked up in the
+    instrument master (passed in, or loaded from `instruments_cache_dir`).
+    """
 
-    def __init__(self, api_key: str, access_token: str):
+    def __init__(self, api_key: str, access_token: str,
+                 instruments: Optional[InstrumentMaster] = None,
+                 instruments_cache_dir: Optional[str] = None):
         self.kite = KiteConnect(api_key=api_key)
         self.kite.set_access_token(access_token)
 
+        if instruments is None and instruments_cache_dir:
+            instruments = load_instrument_master(instruments_cache_dir, self.kite.instruments)
+        self.instruments = instruments
+
         self.orders = {}  # order_id → OrderExecutionReport
 
+    def _instrument(self, instrument_token: int) -> Instrument:
+        instrument = self.instruments.get(instrument_token) if self.instruments else None
+        if instrument is None:
+            raise ValueError(f"Unknown instrument token {instrument_token}")
+        return instrument
+
     def place_order(self, order: OrderRequest) -> OrderExecutionReport:
         """Place an order via Kite Connect."""
+        instrument = self._instrument(order.instrument_token)
         transaction = order.transaction_type
         order_type = (
             self.kite.ORDER_TYPE_LIMIT if order.price else self.kite.ORDER_TYPE_MARKET
         )
+        price = round_to_tick(order.price, instrument.tick_size) if order.price else 0
 
         order_id = self.kite.place_order(
             variety=self.kite.VARIETY_REGULAR,
-            exchange="NFO",
-            tradingsymbol=str(order.instrument_token),
+            exchange=instrument.exchange,
+            tradingsymbol=instrument.tradingsymbol,
             transaction_type=transaction,
             quantity=order.quantity,
             order_type=order_type,
-            price=order.price or 0,
+            price=price,
             product=self.kite.PRODUCT_MIS,
         )
 
@@ -42,7 +67,7 @@ class ZerodhaBroker(Broker):
             status="NEW",
             filled_quantity=0,
             avg_price=0.0,
-            timestamp=datetime.now(timezone.utc)
+            timestamp=self.clock.now()
         )
 
         self.orders[order_id] = report
@@ -63,7 +88,9 @@ class ZerodhaBroker(Broker):
             variety=self.kite.VARIETY_REGULAR,
             order_id=order_id
         )
-        self.orders[order_id].status = "CANCELLED"
+        if order_id in self.orders:
+            self.orders[order_id] = self.orders[order_id]._replace(
+                status="CANCELLED", timestamp=self.clock.now())
 
     def get_positions(self) -> List[Position]:
         """Fetch current positions from Zerodha."""
@@ -1,23 +1,35 @@
 """
 Zerodha implementation of the MarketDataFeed.
 """
+import asyncio
 import logging
 import queue
-from typing import Iterable, List
+from typing import AsyncIterator, Iterable, List
 
 from kiteconnect import KiteTicker
 
-from core.ports.market_data import MarketDataFeed
+from core.ports.market_data import AsyncMarketDataFeed, MarketDataFeed
 from core.domain.types import Tick
+from infra.zerodtha.tick_buffer import DROP_OLDEST, BufferMetrics, TickBuffer
 
 logger = logging.getLogger(__name__)
 
 
-class ZerodhaFeed(MarketDataFeed):
-    """Real-time market data feed using Zerodha Kite Ticker."""
-    def __init__(self, api_key: str, access_token: str):
+class ZerodhaFeed(MarketDataFeed, AsyncMarketDataFeed):
+    """
+    Real-time market data feed using Zerodha Kite Ticker.
+    Ticks pass through a bounded TickBuffer; `overflow_policy` decides what
+    happens when the engine falls behind (see tick_buffer.POLICIES).
+    Works with both the sync Engine (`stream`) and AsyncEngine (`astream`).
+    """
+
+    # how long an async wait may park a worker thread before re-checking
+    ASYNC_POLL_TIMEOUT = 0.5
+
+    def __init__(self, api_key: str, access_token: str,
+                 buffer_size: int = 10_000, overflow_policy: str = DROP_OLDEST):
         self.kws = KiteTicker(api_key, access_token)
-        self.tick_queue = queue.Queue()
+        self.tick_buffer = TickBuffer(buffer_size, overflow_policy)
         self.subscribed_tokens = []
 
         # Bind callbacks
@@ -41,10 +53,39 @@ class ZerodhaFeed(MarketDataFeed):
 
         while True:
             # Blocking get, waiting for ticks
-            tick_data = self.tick_queue.get()
+            tick_data = self.tick_buffer.get()
             yield tick_data
 
+    def stream_batches(self) -> Iterable[List[Tick]]:
+        """Yield everything buffered since the last batch (at least one tick)."""
+        self.kws.connect(threaded=True)
+
+        while True:
+            yield self.tick_buffer.get_batch()
+
+    async def astream(self) -> AsyncIterator[Tick]:
+        async for batch in self.astream_batches():
+            for tick in batch:
+                yield tick
+
+    async def astream_batches(self) -> AsyncIterator[List[Tick]]:
+        """Like stream_batches, but the buffer wait happens off the event loop."""
+        self.kws.connect(threaded=True)
+
+        while True:
+            try:
+                batch = await asyncio.to_thread(self.tick_buffer.get_batch,
+                                                None, self.ASYNC_POLL_TIMEOUT)
+            except queue.Empty:
+                continue
+            yield batch
+
+    def metrics(self) -> BufferMetrics:
+        """Ingress buffer depth, drops, conflations and oldest-tick age."""
+        return self.tick_buffer.metrics()
+
     def _on_ticks(self, ws, ticks):
+        batch = []
         for t in ticks:
             # Transform Kite tick to domain Tick
             # Kite tick structure depends on the mode (Full vs. Quote). Assuming Full/Quote.
@@ -60,7 +101,8 @@ class ZerodhaFeed(MarketDataFeed):
                 volume=t.get("volume", 0),
                 oi=t.get("oi", 0)  # Open Interest if available
             )
-            self.tick_queue.put(domain_tick)
+            batch.append(domain_tick)
+        self.tick_buffer.put_many(batch)
 
     def _on_connect(self, ws, response):
         logger.info("Zerodha Ticker connected.")
@@ -13,9 +13,9 @@ class HighVolLongStraddleStrategy(Strategy):
     When volatility goes up (VOL_UP), enter a long straddle.
     When volatility goes down (VOL_DOWN), exit.
 
-    NOTE: For now we issue actions on the underlying token itself.
-    Later an option resolver will translate metadata into actual
-    option instrument tokens.
+    Legs are issued on the underlying token with the spot price as
+    `approx_strike`; the engine's OptionResolver rounds it to the ATM
+    strike and translates each leg into a CE/PE contract.
     """
 
     name = "high_vol_long_straddle"
@@ -28,6 +28,7 @@ class HighVolLongStraddleStrategy(Strategy):
         lot_size: int = 1,
     ):
         self.underlying_token = underlying_token
+        self.instrument_token = underlying_token
         self.entry_threshold = entry_threshold
         self.exit_threshold = exit_threshold
         self.lot_size = lot_size
@@ -37,10 +38,7 @@ class HighVolLongStraddleStrategy(Strategy):
 
     def _get_relevant_signal(self, ctx: StrategyContext) -> Optional[VolSignal]:
         """Retrieve the volatility signal for the underlying token."""
-        for sig in ctx.vol_signals:
-            if sig.instrument_token == self.underlying_token:
-                return sig
-        return None
+        return ctx.signal_for(self.underlying_token)
 
     def on_vol_signal(self, ctx: StrategyContext) -> List[TradeAction]:
         """React to a volatility signal."""
@@ -58,9 +56,9 @@ class HighVolLongStraddleStrategy(Strategy):
         # ENTER
         if sig.kind == "VOL_UP" and sig.strength >= self.entry_threshold and not self.position_open:
             self.position_open = True
-            self.last_strike = ltp  # placeholder; later round to ATM
+            self.last_strike = ltp  # the resolver rounds to ATM
 
-            # Here we pretend to open 2 legs; we encode "CE"/"PE" in metadata
+            # One action per leg; the resolver picks the CE/PE contracts
             actions.append(
                 TradeAction(
                     action_type="OPEN_LONG",
@@ -14,6 +14,10 @@ class LowVolShortCondorStrategy(Strategy):
     When volatility increases (VOL_UP), exit.
 
     This is a *short-vol* strategy and should be used with care.
+
+    Legs are issued on the underlying token, strikes given relative to the
+    centre; the engine's OptionResolver maps them to option contracts and
+    closes each leg on the contract it opened.
     """
 
     name = "low_vol_short_condor"
@@ -27,6 +31,7 @@ class LowVolShortCondorStrategy(Strategy):
         lot_size: int = 1,
     ):
         self.underlying_token = underlying_token
+        self.instrument_token = underlying_token
         self.width = width
         self.entry_threshold = entry_threshold
         self.exit_threshold = exit_threshold
@@ -37,10 +42,7 @@ class LowVolShortCondorStrategy(Strategy):
 
     def _get_relevant_signal(self, ctx: StrategyContext) -> Optional[VolSignal]:
         """Retrieve the volatility signal for the underlying token."""
-        for sig in ctx.vol_signals:
-            if sig.instrument_token == self.underlying_token:
-                return sig
-        return None
+        return ctx.signal_for(self.underlying_token)
 
     def on_vol_signal(self, ctx: StrategyContext) -> List[TradeAction]:
         """React to a volatility signal."""
@@ -68,6 +70,7 @@ class LowVolShortCondorStrategy(Strategy):
                     metadata={
                         "structure": "IRON_CONDOR",
                         "leg": "SHORT_CALL",
+                        "approx_strike": self.center_strike,
                         "relative_strike": +self.width,
                     },
                 )
@@ -80,6 +83,7 @@ class LowVolShortCondorStrategy(Strategy):
                     metadata={
                         "structure": "IRON_CONDOR",
                         "leg": "SHORT_PUT",
+                        "approx_strike": self.center_strike,
                         "relative_strike": -self.width,
                     },
                 )
@@ -92,6 +96,7 @@ class LowVolShortCondorStrategy(Strategy):
                     metadata={
                         "structure": "IRON_CONDOR",
                         "leg": "LONG_CALL",
+                        "approx_strike": self.center_strike,
                         "relative_strike": +2 * self.width,
                     },
                 )
@@ -104,6 +109,7 @@ class LowVolShortCondorStrategy(Strategy):
                     metadata={
                         "structure": "IRON_CONDOR",
                         "leg": "LONG_PUT",
+                        "approx_strike": self.center_strike,
                         "relative_strike": -2 * self.width,
                     },
                 )
@@ -0,0 +1,359 @@
+"""
+Risk manager implementation: exposure and loss limits.
+"""
+import logging
+from collections import OrderedDict
+from datetime import datetime, time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from core.ports.risk import RiskManager
+from core.domain.actions import ACTION_SIDES, TradeAction
+from core.domain.types import OrderRequest, OrderExecutionReport, Position, Tick
+
+logger = logging.getLogger(__name__)
+
+# completed order ids remembered to drop repeated final reports
+COMPLETED_ORDERS_KEPT = 1024
+
+
+class _Exposure:
+    """Book entry for one instrument."""
+
+    __slots__ = ("underlying", "quantity", "avg_price", "mark", "realized")
+
+    def __init__(self, underlying: int, mark: Optional[float]):
+        self.underlying = underlying
+        self.quantity = 0
+        self.avg_price = 0.0
+        self.mark = mark
+        self.realized = 0.0
+
+    @property
+    def price(self) -> float:
+        """Last traded price, or the average entry price before any tick."""
+        return self.mark if self.mark is not None else self.avg_price
+
+    @property
+    def notional(self) -> float:
+        return abs(self.quantity) * self.price
+
+    @property
+    def unrealized(self) -> float:
+        return self.quantity * (self.price - self.avg_price)
+
+    def fill(self, quantity: int, price: float) -> float:
+        """Apply a signed fill at `price`; returns the PnL it realized."""
+        if self.mark is None:
+            self.mark = price
+        held = self.quantity
+        new = held + quantity
+        if held == 0 or (held > 0) == (quantity > 0):
+            self.avg_price = (abs(held) * self.avg_price + abs(quantity) * price) / abs(new)
+            self.quantity = new
+            return 0.0
+
+        closed = min(abs(quantity), abs(held))
+        pnl = closed * (price - self.avg_price) * (1 if held > 0 else -1)
+        if new == 0:
+            self.avg_price = 0.0
+        elif (new > 0) != (held > 0):   # flipped through flat
+            self.avg_price = price
+        self.quantity = new
+        self.realized += pnl
+        return pnl
+
+
+class _Pending:
+    """Exposure added by the groups already accepted from one action list."""
+
+    __slots__ = ("quantities", "underlying_notional", "gross_notional")
+
+    def __init__(self):
+        self.quantities: Dict[int, int] = {}
+        self.underlying_notional: Dict[int, float] = {}
+        self.gross_notional = 0.0
+
+
+class ExposureRiskManager(RiskManager):
+    """
+    Pre-trade limits over an incrementally maintained exposure book.
+
+    Per instrument the book holds net quantity, average price, last price
+    and realized PnL; per underlying and for the portfolio it holds gross
+    notional, and for the portfolio realized and unrealized PnL. Fills
+    (`on_fill`) and ticks (`on_tick`) adjust only the aggregates of the
+    instrument they touch, so checking an action never walks the book.
+
+    `filter_actions` evaluates a list in one pass. Consecutive actions with
+    the same `metadata["structure"]` on the same underlying (e.g. the four
+    legs of a condor) form one group, which is accepted or dropped as a
+    whole on its combined effect; exposure accepted earlier in the list
+    counts against later groups. A group that only reduces positions is
+    always accepted. Anything else is checked against:
+      - `max_position`: absolute net quantity per instrument
+      - `max_underlying_notional`: gross notional per underlying
+      - `max_portfolio_notional`: gross notional overall (a margin proxy)
+      - `max_loss`: no new risk once realized + unrealized PnL <= -max_loss
+      - `trading_hours`: (start, end) times compared with the latest tick's
+        timestamp, i.e. exchange time
+    Market orders are valued at the instrument's last tick, else at
+    `metadata["ref_price"]` (an estimate, e.g. the underlying's price for
+    resolved option legs), else at its average entry price.
+    Limits left as None are not enforced. Instruments map to underlyings
+    through `underlyings`, or `metadata["underlying"]` on their actions;
+    anything unmapped is its own underlying. Orders in flight are not
+    counted until they fill.
+    """
+
+    name = "exposure_risk_manager"
+
+    def __init__(
+        self,
+        max_position: Optional[int] = None,
+        max_underlying_notional: Optional[float] = None,
+        max_portfolio_notional: Optional[float] = None,
+        max_loss: Optional[float] = None,
+        trading_hours: Optional[Tuple[time, time]] = None,
+        underlyings: Optional[Dict[int, int]] = None,
+    ):
+        self.max_position = max_position
+        self.max_underlying_notional = max_underlying_notional
+        self.max_portfolio_notional = max_portfolio_notional
+        self.max_loss = max_loss
+        self.trading_hours = trading_hours
+        self.underlyings: Dict[int, int] = dict(underlyings or {})
+        # `underlyings` plus mappings learned from action metadata
+        self._underlying_by_token: Dict[int, int] = dict(self.underlyings)
+
+        self._book: Dict[int, _Exposure] = {}
+        self._marks: Dict[int, float] = {}
+        self._underlying_notional: Dict[int, float] = {}
+        # order_id → quantity already booked, for orders still filling
+        self._applied: Dict[str, int] = {}
+        # recently completed order_ids, so a repeated final report is ignored
+        self._completed: "OrderedDict[str, None]" = OrderedDict()
+        self._last_time: Optional[datetime] = None
+
+        self.gross_notional = 0.0
+        self.realized_pnl = 0.0
+        self.unrealized_pnl = 0.0
+        self.rejected = 0   # actions dropped so far
+
+    # ---- aggregates ----
+
+    @property
+    def total_pnl(self) -> float:
+        return self.realized_pnl + self.unrealized_pnl
+
+    def position(self, token: int) -> int:
+        entry = self._book.get(token)
+        return entry.quantity if entry is not None else 0
+
+    def underlying_notional(self, underlying: int) -> float:
+        return self._underlying_notional.get(underlying, 0.0)
+
+    def _entry(self, token: int) -> _Exposure:
+        entry = self._book.get(token)
+        if entry is None:
+            entry = self._book[token] = _Exposure(self._underlying_by_token.get(token, token),
+                                                  self._marks.get(token))
+        return entry
+
+    def _detach(self, entry: _Exposure) -> None:
+        """Take an entry's contribution out of the aggregates before changing it."""
+        notional = entry.notional
+        self._underlying_notional[entry.underlying] = (
+            self._underlying_notional.get(entry.underlying, 0.0) - notional)
+        self.gross_notional -= notional
+        self.unrealized_pnl -= entry.unrealized
+
+    def _attach(self, entry: _Exposure) -> None:
+        notional = entry.notional
+        self._underlying_notional[entry.underlying] = (
+            self._underlying_notional.get(entry.underlying, 0.0) + notional)
+        self.gross_notional += notional
+        self.unrealized_pnl += entry.unrealized
+
+    # ---- engine hooks ----
+
+    def on_tick(self, tick: Tick) -> None:
+        """Mark the instrument to market."""
+        token = tick.instrument_token
+        self._marks[token] = tick.last_price
+        self._last_time = tick.timestamp
+        entry = self._book.get(token)
+        if entry is None:
+            return
+        if entry.quantity:
+            self._detach(entry)
+            entry.mark = tick.last_price
+            self._attach(entry)
+        else:
+            entry.mark = tick.last_price
+
+    def on_fill(self, order: OrderRequest, report: OrderExecutionReport) -> None:
+        """Book the newly filled quantity of an order."""
+        if report.status != "FILLED" or report.order_id in self._completed:
+            return
+        delta = report.filled_quantity - self._applied.get(report.order_id, 0)
+        if delta <= 0:
+            return
+        if report.filled_quantity >= order.quantity:
+            self._applied.pop(report.order_id, None)
+            self._completed[report.order_id] = None
+            if len(self._completed) > COMPLETED_ORDERS_KEPT:
+                self._completed.popitem(last=False)
+        else:
+            self._applied[report.order_id] = report.filled_quantity
+
+        entry = self._entry(order.instrument_token)
+        self._detach(entry)
+        signed = delta if order.transaction_type == "BUY" else -delta
+        self.realized_pnl += entry.fill(signed, report.avg_price)
+        self._attach(entry)
+
+    def load(self, positions: List[Position]) -> None:
+        """
+        Replace booked quantities and entry prices with the broker's (e.g. at
+        start of day). Fill bookkeeping starts over: the broker's positions
+        already include every earlier fill.
+        """
+        self._applied.clear()
+        self._completed.clear()
+        held = {pos.instrument_token: pos for pos in positions}
+        for token in set(self._book) | set(held):
+            entry = self._entry(token)
+            self._detach(entry)
+            pos = held.get(token)
+            entry.quantity = pos.quantity if pos is not None else 0
+            entry.avg_price = pos.avg_price if pos is not None else 0.0
+            self._attach(entry)
+
+    # ---- pre-trade checks ----
+
+    def filter_actions(self, actions: List[TradeAction]) -> List[TradeAction]:
+        if not actions:
+            return actions
+        accepted: List[TradeAction] = []
+        pending = _Pending()
+        for group in self._groups(actions):
+            reason = self._check(group, pending)
+            if reason is None:
+                accepted.extend(group)
+            else:
+                self.rejected += len(group)
+                logger.warning("Risk rejected %d action(s) on %s: %s", len(group),
+                               sorted({a.instrument_token for a in group}), reason)
+        return accepted
+
+    def _underlying_of(self, action: TradeAction) -> int:
+        token = action.instrument_token
+        underlying = action.metadata.get("underlying") if action.metadata else None
+        if underlying is not None and token not in self._underlying_by_token:
+            self._underlying_by_token[token] = underlying
+            return underlying
+        return self._underlying_by_token.get(token, token)
+
+    def _groups(self, actions: List[TradeAction]) -> Iterator[List[TradeAction]]:
+        """Split a list into atomic groups: runs of legs of one structure on one underlying."""
+        group: List[TradeAction] = []
+        key = None
+        for action in actions:
+            structure = action.metadata.get("structure") if action.metadata else None
+            action_key = (structure, self._underlying_of(action)) if structure else None
+            if group and (action_key is None or action_key != key):
+                yield group
+                group = []
+            group.append(action)
+            key = action_key
+        if group:
+            yield group
+
+    def _check(self, group: List[TradeAction], pending: _Pending) -> Optional[str]:
+        """None when the group may trade (and is added to `pending`), else the reason."""
+        # net quantity change and price per instrument
+        deltas: Dict[int, int] = {}
+        prices: Dict[int, Optional[float]] = {}
+        ref_prices: Dict[int, float] = {}
+        for action in group:
+            side = ACTION_SIDES.get(action.action_type)
+            if side is None:
+                return f"unsupported action type {action.action_type}"
+            token = action.instrument_token
+            qty = action.quantity if side == "BUY" else -action.quantity
+            deltas[token] = deltas.get(token, 0) + qty
+            if action.price is not None or token not in prices:
+                prices[token] = action.price
+            ref_price = action.metadata.get("ref_price") if action.metadata else None
+            if ref_price is not None:
+                ref_prices[token] = ref_price
+
+        quantities: Dict[int, int] = {}
+        underlying_change: Dict[int, float] = {}
+        gross_change = 0.0
+        adds_risk = False
+        for token, delta in deltas.items():
+            before = pending.quantities.get(token)
+            if before is None:
+                before = self.position(token)
+            after = before + delta
+            quantities[token] = after
+
+            grows = abs(after) > abs(before) or (after != 0 and before != 0
+                                                 and (after > 0) != (before > 0))
+            if grows:
+                adds_risk = True
+                if self.max_position is not None and abs(after) > self.max_position:
+                    return f"position {after} on {token} exceeds {self.max_position}"
+
+            price = prices[token]
+            if price is None:
+                price = self._marks.get(token)
+            if price is None:
+                price = ref_prices.get(token)
+            if price is None:
+                entry = self._book.get(token)
+                price = entry.price if entry is not None else 0.0
+            change = (abs(after) - abs(before)) * price
+            underlying = self._underlying_by_token.get(token, token)
+            underlying_change[underlying] = underlying_change.get(underlying, 0.0) + change
+            gross_change += change
+
+        if adds_risk:
+            reason = self._check_limits(underlying_change, gross_change, pending)
+            if reason is not None:
+                return reason
+
+        pending.quantities.update(quantities)
+        for underlying, change in underlying_change.items():
+            pending.underlying_notional[underlying] = (
+                pending.underlying_notional.get(underlying, 0.0) + change)
+        pending.gross_notional += gross_change
+        return None
+
+    def _check_limits(self, underlying_change: Dict[int, float], gross_change: float,
+                      pending: _Pending) -> Optional[str]:
+        if self.trading_hours is not None and self._last_time is not None:
+            start, end = self.trading_hours
+            now = self._last_time.time()
+            if not start <= now <= end:
+                return f"{now} is outside trading hours {start}-{end}"
+
+        if self.max_loss is not None and self.total_pnl <= -self.max_loss:
+            return f"PnL {self.total_pnl:.2f} breaches max loss {self.max_loss}"
+
+        if self.max_underlying_notional is not None:
+            for underlying, change in underlying_change.items():
+                if change <= 0:
+                    continue
+                total = (self.underlying_notional(underlying)
+                         + pending.underlying_notional.get(underlying, 0.0) + change)
+                if total > self.max_underlying_notional:
+                    return (f"notional {total:.2f} on underlying {underlying} exceeds "
+                            f"{self.max_underlying_notional}")
+
+        if self.max_portfolio_notional is not None and gross_change > 0:
+            total = self.gross_notional + pending.gross_notional + gross_change
+            if total > self.max_portfolio_notional:
+                return f"portfolio notional {total:.2f} exceeds {self.max_portfolio_notional}"
+        return None
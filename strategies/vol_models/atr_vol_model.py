@@ -3,24 +3,26 @@ ATR (Average True Range) volatility model implementation.
 """
 # strategies/vol_models/atr_vol_model.py
 
-from collections import deque
 from typing import Optional
-from datetime import datetime
+
+import numpy as np
 
 from core.ports.vol_model import VolatilityModel
 from core.domain.state import MarketState
 from core.domain.signals import VolSignal
-from core.domain.types import Candle
+from strategies.vol_models.vectorized import VolSeries, classify, rolling_mean
 
 
 class ATRVolModel(VolatilityModel):
     """
     ATR volatility model based on recent candles (not ticks).
+    The engine runs it once per closed `candle_interval` bar.
     ATR% = ATR / close
     Emits VOL_UP / VOL_DOWN based on thresholds.
     """
 
     name = "atr_vol_model"
+    uses_candles = True
 
     def __init__(
         self,
@@ -28,42 +30,30 @@ class ATRVolModel(VolatilityModel):
         period: int = 14,
         high_threshold: float = 0.012,
         low_threshold: float = 0.004,
+        candle_interval: int = 60,
     ):
         self.instrument_token = instrument_token
         self.period = period
         self.high_threshold = high_threshold
         self.low_threshold = low_threshold
-        self._tr_values = deque(maxlen=period)
+        self.candle_interval = candle_interval
 
     def update(self, state: MarketState) -> Optional[VolSignal]:
         """Compute ATR-based vol signal."""
-        candles = state.recent_candles.get(self.instrument_token)
-        if not candles or len(candles) < 2:
-            return None
-
-        # use last two candles
-        prev: Candle = candles[-2]
-        last: Candle = candles[-1]
-
-        h = last.high
-        l = last.low
-        prev_close = prev.close
-        close = last.close
-
-        if h is None or l is None or prev_close is None or close is None:
+        candles = state.candles(self.instrument_token, self.candle_interval)
+        if candles is None or len(candles) < self.period + 1:
             return None
 
-        tr = max(
-            h - l,
-            abs(h - prev_close),
-            abs(l - prev_close),
-        )
-
-        self._tr_values.append(tr)
-        if len(self._tr_values) < self.period:
-            return None
+        # zero-copy views of the last `period` true ranges' inputs
+        high = candles.highs(self.period)
+        low = candles.lows(self.period)
+        closes = candles.closes(self.period + 1)
+        prev_close = closes[:-1]
+        close = float(closes[-1])
 
-        atr = sum(self._tr_values) / len(self._tr_values)
+        tr = np.maximum(high - low,
+                        np.maximum(np.abs(high - prev_close), np.abs(low - prev_close)))
+        atr = float(tr.mean())
         atr_pct = atr / close
 
         kind: Optional[str] = None
@@ -83,5 +73,22 @@ class ATRVolModel(VolatilityModel):
             instrument_token=self.instrument_token,
             kind=kind,
             strength=strength,
-            timestamp=datetime.now(),
-        )
\ No newline at end of file
+            timestamp=self.clock.now(),
+        )
+
+    def batch(self, high: np.ndarray, low: np.ndarray, close: np.ndarray) -> VolSeries:
+        """
+        Evaluate ATR% over a whole bar history in one vectorized pass.
+        Element i matches the `update` call made when bar i was the last candle.
+        """
+        high, low, close = (np.asarray(a, dtype=float) for a in (high, low, close))
+        vol = np.full(len(close), np.nan)
+        if len(close) >= 2:
+            prev_close = close[:-1]
+            tr = np.maximum.reduce([
+                high[1:] - low[1:],
+                np.abs(high[1:] - prev_close),
+                np.abs(low[1:] - prev_close),
+            ])
+            vol[1:] = rolling_mean(tr, self.period) / close[1:]
+        return classify(vol, self.high_threshold, self.low_threshold)
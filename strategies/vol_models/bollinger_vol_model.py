@@ -3,25 +3,25 @@ Bollinger Band volatility model implementation.
 """
 # strategies/vol_models/bollinger_vol_model.py
 
-from collections import deque
-from math import sqrt
 from typing import Optional
-from datetime import datetime
+
+import numpy as np
 
 from core.ports.vol_model import VolatilityModel
 from core.domain.state import MarketState
 from core.domain.signals import VolSignal
-from core.domain.types import Candle
+from strategies.vol_models.vectorized import VolSeries, classify, rolling_mean, rolling_std
 
 
 class BollingerVolModel(VolatilityModel):
     """
     Bollinger Band Width as a volatility indicator.
     width = (upper - lower) / middle
-    Uses recent candle CLOSE prices.
+    Uses recent candle CLOSE prices, once per closed `candle_interval` bar.
     """
 
     name = "bollinger_vol_model"
+    uses_candles = True
 
     def __init__(
         self,
@@ -29,33 +29,24 @@ class BollingerVolModel(VolatilityModel):
         period: int = 20,
         high_threshold: float = 0.05,
         low_threshold: float = 0.02,
+        candle_interval: int = 60,
     ):
         self.instrument_token = instrument_token
         self.period = period
         self.high_threshold = high_threshold
         self.low_threshold = low_threshold
-        self._closes = deque(maxlen=period)
+        self.candle_interval = candle_interval
 
     def update(self, state: MarketState) -> Optional[VolSignal]:
         """Compute bandwidth-based vol signal."""
-        candles = state.recent_candles.get(self.instrument_token)
-        if not candles:
-            return None
-
-        # push the last close into a window
-        last: Candle = candles[-1]
-        if last.close is None:
-            return None
-
-        self._closes.append(last.close)
-
-        if len(self._closes) < self.period:
+        candles = state.candles(self.instrument_token, self.candle_interval)
+        if candles is None or len(candles) < self.period:
             return None
 
-        closes = list(self._closes)
-        mean = sum(closes) / self.period
-        var = sum((c - mean) ** 2 for c in closes) / self.period
-        std = sqrt(var)
+        # zero-copy view of the last `period` closes
+        closes = candles.closes(self.period)
+        mean = float(closes.mean())
+        std = float(closes.std())
 
         upper = mean + 2 * std
         lower = mean - 2 * std
@@ -78,5 +69,18 @@ class BollingerVolModel(VolatilityModel):
             instrument_token=self.instrument_token,
             kind=kind,
             strength=strength,
-            timestamp=datetime.now(),
-        )
\ No newline at end of file
+            timestamp=self.clock.now(),
+        )
+
+    def batch(self, high: np.ndarray, low: np.ndarray, close: np.ndarray) -> VolSeries:
+        """
+        Evaluate band width over a whole bar history in one vectorized pass.
+        Takes the same (high, low, close) arrays as ATRVolModel.batch; only
+        closes are used. Element i matches the `update` call made when bar i
+        was the last candle.
+        """
+        close = np.asarray(close, dtype=float)
+        mean = rolling_mean(close, self.period)
+        std = rolling_std(close, self.period, ddof=0)
+        bw = (4 * std) / mean
+        return classify(bw, self.high_threshold, self.low_threshold)
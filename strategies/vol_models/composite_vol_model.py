@@ -4,10 +4,10 @@ Composite volatility model (aggregation).
 # strategies/vol_models/composite_vol_model.py
 
 from typing import Optional, Iterable
-from datetime import datetime
 
 from core.domain.state import MarketState
 from core.domain.signals import VolSignal
+from core.ports.clock import Clock
 from core.ports.vol_model import VolatilityModel
 
 
@@ -21,9 +21,24 @@ class CompositeVolModel(VolatilityModel):
     def __init__(self, models: Iterable[VolatilityModel]):
         self.models = list(models)
         # assume all child models refer to the same instrument
-        self.instrument_token = (
+        self._signal_token = (
             self.models[0].instrument_token if self.models else None
         )
+        # only subscribe to a single token when every child agrees on it;
+        # otherwise the engine must update us on every tick
+        tokens = {m.instrument_token for m in self.models}
+        self.instrument_token = tokens.pop() if len(tokens) == 1 else None
+        # bar-driven only when every child runs on the same bar interval
+        intervals = {m.candle_interval if m.uses_candles else None for m in self.models}
+        if len(intervals) == 1 and None not in intervals:
+            self.uses_candles = True
+            self.candle_interval = intervals.pop()
+
+    def set_clock(self, clock: Clock) -> None:
+        """Share the clock with every child model."""
+        self.clock = clock
+        for m in self.models:
+            m.set_clock(clock)
 
     def update(self, state: MarketState) -> Optional[VolSignal]:
         """Aggregate signals from child models."""
@@ -44,26 +59,26 @@ class CompositeVolModel(VolatilityModel):
 
         if len(ups) > len(downs):
             strength = sum(ups) / len(ups)
-            token = self.instrument_token
+            token = self._signal_token
             if token is None:
                 return None
             return VolSignal(
                 instrument_token=token,
                 kind="VOL_UP",
                 strength=strength,
-                timestamp=datetime.now(),
+                timestamp=self.clock.now(),
             )
 
         if len(downs) > len(ups):
             strength = sum(downs) / len(downs)
-            token = self.instrument_token
+            token = self._signal_token
             if token is None:
                 return None
             return VolSignal(
                 instrument_token=token,
                 kind="VOL_DOWN",
                 strength=strength,
-                timestamp=datetime.now(),
+                timestamp=self.clock.now(),
             )
 
         return None
\ No newline at end of file
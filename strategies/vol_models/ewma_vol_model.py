@@ -5,9 +5,12 @@ from datetime import datetime
 from math import log, sqrt
 from typing import Optional
 
+import numpy as np
+
 from core.ports.vol_model import VolatilityModel
 from core.domain.state import MarketState
 from core.domain.signals import VolSignal
+from strategies.vol_models.vectorized import VolSeries, classify, linear_recurrence, log_returns
 
 
 class EWMAVolModel(VolatilityModel):
@@ -83,5 +86,23 @@ class EWMAVolModel(VolatilityModel):
             instrument_token=self.instrument_token,
             kind=kind,
             strength=strength,
-            timestamp=tick.timestamp if isinstance(tick.timestamp, datetime) else datetime.now(),
+            timestamp=tick.timestamp if isinstance(tick.timestamp, datetime) else self.clock.now(),
         )
+
+    def batch(self, prices: np.ndarray) -> VolSeries:
+        """
+        Evaluate the model over a whole price history in one vectorized pass.
+        Element i matches the `update` call that saw prices[i]; streaming
+        state is left untouched. Prices must be positive.
+        """
+        prices = np.asarray(prices, dtype=float)
+        vol = np.full(len(prices), np.nan)
+        rets = log_returns(prices)
+        if len(rets):
+            var = np.empty(len(rets))
+            var[0] = rets[0] ** 2
+            var[1:] = linear_recurrence(
+                self.decay_factor, (1 - self.decay_factor) * (rets[1:] ** 2), var[0]
+            )
+            vol[1:] = np.sqrt(var) * self.annualize_factor
+        return classify(vol, self.high_threshold, self.low_threshold)
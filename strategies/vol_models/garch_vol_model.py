@@ -5,9 +5,12 @@ from datetime import datetime
 from math import log, sqrt
 from typing import Optional
 
+import numpy as np
+
 from core.ports.vol_model import VolatilityModel
 from core.domain.state import MarketState
 from core.domain.signals import VolSignal
+from strategies.vol_models.vectorized import VolSeries, classify, linear_recurrence, log_returns
 
 
 class GARCHVolModel(VolatilityModel):
@@ -86,5 +89,20 @@ class GARCHVolModel(VolatilityModel):
             instrument_token=self.instrument_token,
             kind=kind,
             strength=strength,
-            timestamp=tick.timestamp if isinstance(tick.timestamp, datetime) else datetime.now(),
+            timestamp=tick.timestamp if isinstance(tick.timestamp, datetime) else self.clock.now(),
         )
+
+    def batch(self, prices: np.ndarray) -> VolSeries:
+        """
+        Evaluate the model over a whole price history in one vectorized pass,
+        starting from the long-run variance seed. Element i matches the
+        `update` call that saw prices[i]; streaming state is left untouched.
+        """
+        prices = np.asarray(prices, dtype=float)
+        vol = np.full(len(prices), np.nan)
+        rets = log_returns(prices)
+        if len(rets):
+            seed = self.omega / (1 - self.alpha - self.beta)
+            var = linear_recurrence(self.beta, self.omega + self.alpha * (rets ** 2), seed)
+            vol[1:] = np.sqrt(var) * self.annualize_factor
+        return classify(vol, self.high_threshold, self.low_threshold)
@@ -8,17 +8,20 @@ from datetime import datetime
 from math import log, sqrt
 from typing import Deque, Optional
 
+import numpy as np
+
 from core.ports.vol_model import VolatilityModel
 from core.domain.state import MarketState
 from core.domain.signals import VolSignal
+from strategies.vol_models.vectorized import VolSeries, classify, log_returns, rolling_std
 
 
 class RealizedVolModel(VolatilityModel):
     """
     Rolling realized volatility (std dev of log returns) for ONE instrument.
 
-    - Maintains a rolling window of prices
-    - Computes log returns and std dev
+    - Maintains a rolling window of prices and log returns
+    - Updates the std dev incrementally (O(1) per tick, any lookback)
     - Compares against high/low thresholds
     - Emits VOL_UP / VOL_DOWN signals
     """
@@ -48,9 +51,48 @@ class RealizedVolModel(VolatilityModel):
 
         # store lookback+1 prices to compute `lookback` returns
         self._prices: Deque[float] = deque(maxlen=lookback + 1)
+        self._rets: Deque[float] = deque(maxlen=lookback)
+
+        # running sums of shifted returns (r - shift) and their squares;
+        # shifting by a recent mean keeps the one-pass variance stable and
+        # the sums are rebuilt exactly every `lookback` updates
+        self._shift = 0.0
+        self._sum = 0.0
+        self._sum_sq = 0.0
+        self._since_recenter = 0
+
+        self.current_vol: Optional[float] = None
+
+    def _push_return(self, r: float) -> None:
+        """Slide the return window by one in O(1)."""
+        if len(self._rets) == self._rets.maxlen:
+            old = self._rets[0] - self._shift
+            self._sum -= old
+            self._sum_sq -= old * old
+
+        self._rets.append(r)
+        d = r - self._shift
+        self._sum += d
+        self._sum_sq += d * d
+
+        self._since_recenter += 1
+        if self._since_recenter >= self.lookback:
+            self._recenter()
+
+    def _recenter(self) -> None:
+        """Re-shift around the current mean and recompute the sums exactly."""
+        n = len(self._rets)
+        self._shift = sum(self._rets) / n if n else 0.0
+        self._sum = 0.0
+        self._sum_sq = 0.0
+        for r in self._rets:
+            d = r - self._shift
+            self._sum += d
+            self._sum_sq += d * d
+        self._since_recenter = 0
 
     def update(self, state: MarketState) -> Optional[VolSignal]:
-        """Compute realized vol from recent prices."""
+        """Compute realized vol from recent prices in O(1) per tick."""
         tick = state.last_ticks.get(self.instrument_token)
         if tick is None:
             return None
@@ -59,26 +101,22 @@ class RealizedVolModel(VolatilityModel):
         if price is None or price <= 0:
             return None
 
+        if self._prices:
+            self._push_return(log(price / self._prices[-1]))
         self._prices.append(price)
 
         # wait until we have enough data
         if len(self._prices) < self.lookback + 1:
             return None
 
-        # compute log returns
-        prices = list(self._prices)
-        rets = []
-        for i in range(1, len(prices)):
-            r = log(prices[i] / prices[i - 1])
-            rets.append(r)
-
-        n = len(rets)
+        n = len(self._rets)
         if n < 2:
             return None
 
-        mean_r = sum(rets) / n
-        var = sum((r - mean_r) ** 2 for r in rets) / (n - 1)
+        mean_d = self._sum / n
+        var = max(0.0, (self._sum_sq - n * mean_d * mean_d) / (n - 1))
         vol = sqrt(var) * self.annualize_factor
+        self.current_vol = vol
 
         kind: Optional[str] = None
         if vol >= self.high_threshold:
@@ -98,5 +136,17 @@ class RealizedVolModel(VolatilityModel):
             instrument_token=self.instrument_token,
             kind=kind,
             strength=strength,
-            timestamp=tick.timestamp if isinstance(tick.timestamp, datetime) else datetime.now(),
-        )
\ No newline at end of file
+            timestamp=tick.timestamp if isinstance(tick.timestamp, datetime) else self.clock.now(),
+        )
+
+    def batch(self, prices: np.ndarray) -> VolSeries:
+        """
+        Evaluate the model over a whole price history in one vectorized pass.
+        Element i matches the `update` call that saw prices[i]; streaming
+        state is left untouched. Prices must be positive.
+        """
+        prices = np.asarray(prices, dtype=float)
+        vol = np.full(len(prices), np.nan)
+        if self.lookback >= 2 and len(prices) > 1:
+            vol[1:] = rolling_std(log_returns(prices), self.lookback, ddof=1) * self.annualize_factor
+        return classify(vol, self.high_threshold, self.low_threshold)
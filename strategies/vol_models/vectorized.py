@@ -0,0 +1,118 @@
+"""
+Vectorized helpers for evaluating vol models over whole price histories.
+"""
+# strategies/vol_models/vectorized.py
+
+from math import log
+from typing import NamedTuple
+
+import numpy as np
+
+# signal codes used in VolSeries.signal
+VOL_UP = 1
+VOL_DOWN = -1
+NO_SIGNAL = 0
+
+# keep the a**-k scaling of `linear_recurrence` below this factor per block
+_MAX_BLOCK_SCALE = log(1e4)
+
+
+class VolSeries(NamedTuple):
+    """
+    Output of a model's batch evaluation, aligned with its input arrays.
+
+    vol:      vol estimate at each step (NaN while the model warms up)
+    signal:   VOL_UP / VOL_DOWN / NO_SIGNAL codes (int8)
+    strength: signal strength in [0, 1] (NaN where there is no signal)
+    """
+    vol: np.ndarray
+    signal: np.ndarray
+    strength: np.ndarray
+
+
+def classify(vol: np.ndarray, high_threshold: float, low_threshold: float) -> VolSeries:
+    """Apply the models' threshold/strength rules to a whole vol series."""
+    vol = np.asarray(vol, dtype=float)
+    up = vol >= high_threshold
+    down = ~up & (vol <= low_threshold)
+
+    signal = np.zeros(len(vol), dtype=np.int8)
+    signal[up] = VOL_UP
+    signal[down] = VOL_DOWN
+
+    denominator = (high_threshold - low_threshold) or 1.0
+    strength = np.clip((vol - low_threshold) / denominator, 0.0, 1.0)
+    strength[signal == NO_SIGNAL] = np.nan
+
+    return VolSeries(vol, signal, strength)
+
+
+def log_returns(prices: np.ndarray) -> np.ndarray:
+    """log(p[t] / p[t-1]) for t >= 1."""
+    prices = np.asarray(prices, dtype=float)
+    return np.log(prices[1:] / prices[:-1])
+
+
+def rolling_mean(x: np.ndarray, window: int) -> np.ndarray:
+    """Mean of each full window, aligned to the window's last element (NaN before)."""
+    x = np.asarray(x, dtype=float)
+    out = np.full(len(x), np.nan)
+    if window < 1 or len(x) < window:
+        return out
+    c = np.concatenate(([0.0], np.cumsum(x)))
+    out[window - 1:] = (c[window:] - c[:-window]) / window
+    return out
+
+
+def rolling_std(x: np.ndarray, window: int, ddof: int = 0) -> np.ndarray:
+    """
+    Std dev of each full window, aligned to the window's last element.
+    Data is centred on its global mean first so the cumulative sums of
+    squares do not lose precision.
+    """
+    x = np.asarray(x, dtype=float)
+    out = np.full(len(x), np.nan)
+    if window - ddof < 1 or len(x) < window:
+        return out
+
+    d = x - x.mean()
+    c1 = np.concatenate(([0.0], np.cumsum(d)))
+    c2 = np.concatenate(([0.0], np.cumsum(d * d)))
+    s1 = c1[window:] - c1[:-window]
+    s2 = c2[window:] - c2[:-window]
+    var = (s2 - s1 * s1 / window) / (window - ddof)
+    out[window - 1:] = np.sqrt(np.maximum(var, 0.0))
+    return out
+
+
+def linear_recurrence(a: float, x: np.ndarray, y0: float) -> np.ndarray:
+    """
+    Solve y[t] = a * y[t-1] + x[t] (with y[-1] = y0) without a Python loop per step.
+
+    Within a block, y[k] = a**k * (y0 + cumsum(x[j] * a**-j)). Blocks are
+    short enough that a**-k stays small, which keeps the result within
+    float rounding of the sequential recursion; only the block seeds are
+    carried in Python.
+    """
+    x = np.asarray(x, dtype=float)
+    n = len(x)
+    y = np.empty(n)
+    if n == 0:
+        return y
+    if a == 0:
+        y[:] = x
+        return y
+
+    if abs(a) >= 1:
+        block = n
+    else:
+        block = max(1, min(n, int(_MAX_BLOCK_SCALE / -log(abs(a)))))
+
+    powers = a ** np.arange(1, block + 1)
+    prev = y0
+    for start in range(0, n, block):
+        xb = x[start:start + block]
+        pw = powers[:len(xb)]
+        y[start:start + len(xb)] = pw * (prev + np.cumsum(xb / pw))
+        prev = y[start + len(xb) - 1]
+    return y
@@ -8,6 +8,8 @@ sys.modules["yaml"] = MagicMock()
 
 from app.runner_factory import RunnerFactory
 from app.config import AppConfig
+from infra.dummy.dry_run_broker import DryRunBroker
+from strategies.risk_managers.exposure_risk_manager import ExposureRiskManager
 
 class TestRunnerFactory(unittest.TestCase):
     def test_build_dummy(self):
@@ -35,10 +37,76 @@ class TestRunnerFactory(unittest.TestCase):
         engine = RunnerFactory.build(config)
         
         self.assertIsNotNone(engine)
-        MockBroker.assert_called_with("k", "t")
-        MockFeed.assert_called_with("k", "t")
+        MockBroker.assert_called_with("k", "t", instruments_cache_dir="data/instruments")
+        MockFeed.assert_called_with("k", "t", buffer_size=10_000, overflow_policy="drop_oldest")
         # Check vol models count (Realized + EWMA + GARCH = 3 per token)
         self.assertEqual(len(engine.vol_models), 3)
+        # orders are only logged unless live_orders is set
+        self.assertIsInstance(engine.broker, DryRunBroker)
+        self.assertIsInstance(engine.risk_mgr, ExposureRiskManager)
+
+    @patch("app.runner_factory.ZerodhaBroker")
+    @patch("app.runner_factory.ZerodhaFeed")
+    def test_build_live_resolves_options(self, MockFeed, MockBroker):
+        import os
+        from infra.zerodtha.instrument_master import InstrumentMaster
+
+        MockBroker.return_value.instruments = InstrumentMaster.from_csv(os.path.join(
+            os.path.dirname(__file__), "..", "fixtures", "instruments.csv"))
+        config = AppConfig(mode="live", instruments=[256265], api_key="k", access_token="t")
+        engine = RunnerFactory.build(config)
+
+        self.assertIn(256265, engine.resolver.chains)
+
+    def test_risk_limits_from_config(self):
+        from datetime import time
+
+        config = AppConfig(mode="live", instruments=[123], risk_max_position=50,
+                           risk_trading_hours="09:15-15:20")
+        risk = RunnerFactory._risk_manager(config)
+
+        self.assertEqual(risk.max_position, 50)
+        self.assertEqual(risk.trading_hours, (time(9, 15), time(15, 20)))
+
+    @patch("app.runner_factory.ZerodhaBroker")
+    @patch("app.runner_factory.ZerodhaFeed")
+    def test_build_live_orders(self, MockFeed, MockBroker):
+        config = AppConfig(mode="live", instruments=[123], api_key="k", access_token="t",
+                           live_orders=True)
+        engine = RunnerFactory.build(config)
+
+        self.assertIs(engine.broker, MockBroker.return_value)
+
+    @patch("app.runner_factory.ZerodhaBroker")
+    @patch("app.runner_factory.ZerodhaFeed")
+    def test_build_live_async(self, MockFeed, MockBroker):
+        from core.engine.async_runner import AsyncBrokerAdapter, AsyncEngine
+
+        config = AppConfig(mode="live", instruments=[123], api_key="k", access_token="t",
+                           async_engine=True)
+        engine = RunnerFactory.build(config)
+
+        self.assertIsInstance(engine, AsyncEngine)
+        self.assertIsInstance(engine.broker, AsyncBrokerAdapter)
+        self.assertIs(engine.broker.broker.broker, MockBroker.return_value)
+        self.assertIs(engine.feed, MockFeed.return_value)
+
+    def test_build_dummy_sharded(self):
+        from core.engine.sharded_runner import ShardedEngine
+
+        config = AppConfig(mode="dummy", instruments=[1, 2, 3], shards=2)
+        engine = RunnerFactory.build(config)
+
+        self.assertIsInstance(engine, ShardedEngine)
+        self.assertEqual(engine.partitions, [[1, 3], [2]])
+
+    @patch("app.runner_factory.ZerodhaBroker")
+    @patch("app.runner_factory.ZerodhaFeed")
+    def test_build_live_sharded_rejects_async(self, MockFeed, MockBroker):
+        config = AppConfig(mode="live", instruments=[1, 2], api_key="k", access_token="t",
+                           shards=2, async_engine=True)
+        with self.assertRaises(ValueError):
+            RunnerFactory.build(config)
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,221 @@
+import asyncio
+import time
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+from core.domain.actions import TradeAction
+from core.domain.types import Tick
+from core.engine.async_runner import (AsyncBrokerAdapter, AsyncEngine, AsyncFeedAdapter,
+                                      AsyncOrderExecutor)
+from core.ports.broker import AsyncBroker
+from core.ports.market_data import AsyncMarketDataFeed
+from infra.dummy.dummy_broker import DummyBroker
+
+START = datetime(2024, 1, 1, 9, 15)
+TIMEOUT = 10.0  # a hung engine fails the test instead of the whole run
+
+
+def run(engine):
+    asyncio.run(asyncio.wait_for(engine.arun(), TIMEOUT))
+
+
+def ticks(n, token=7):
+    return [Tick(token, START + timedelta(seconds=i), 100.0 + i, i) for i in range(n)]
+
+
+class PacedFeed(AsyncMarketDataFeed):
+    """Async feed delivering ticks every `gap` seconds, recording arrival times."""
+
+    def __init__(self, items, gap=0.01):
+        self.items = items
+        self.gap = gap
+
+    def subscribe(self, instruments):
+        pass
+
+    async def astream(self):
+        for tick in self.items:
+            await asyncio.sleep(self.gap)
+            yield tick
+
+
+class SlowAsyncBroker(AsyncBroker):
+    """DummyBroker behind an awaitable with a fixed latency per call."""
+
+    def __init__(self, latency):
+        self.inner = DummyBroker()
+        self.latency = latency
+        self.position_calls = 0
+
+    async def place_order(self, order):
+        await asyncio.sleep(self.latency)
+        return self.inner.place_order(order)
+
+    async def modify_order(self, order_id, **kwargs):
+        return self.inner.modify_order(order_id, **kwargs)
+
+    async def cancel_order(self, order_id):
+        self.inner.cancel_order(order_id)
+
+    async def get_positions(self):
+        self.position_calls += 1
+        await asyncio.sleep(self.latency)
+        return self.inner.get_positions()
+
+
+def buying_strategy(token=7, qty=25):
+    strategy = MagicMock()
+    strategy.instrument_token = None
+    strategy.on_tick.return_value = [TradeAction("OPEN_LONG", token, qty)]
+    strategy.on_vol_signal.return_value = []
+    return strategy
+
+
+def pass_through_risk():
+    risk = MagicMock()
+    risk.filter_actions.side_effect = lambda actions: actions
+    return risk
+
+
+class TestAsyncEngine(unittest.TestCase):
+    def test_slow_orders_do_not_stall_ticks(self):
+        broker = SlowAsyncBroker(latency=0.2)
+        engine = AsyncEngine(PacedFeed(ticks(10)), broker, [], [buying_strategy()],
+                             pass_through_risk(), position_sync_interval=None)
+
+        started = time.perf_counter()
+        run(engine)
+        elapsed = time.perf_counter() - started
+
+        # 10 orders × 0.2s in sequence would take 2s
+        self.assertLess(elapsed, 1.0)
+        self.assertEqual(engine.tick_count, 10)
+        self.assertEqual(engine.positions.snapshot(), {7: 250})
+
+    def test_fills_trigger_a_position_resync(self):
+        broker = SlowAsyncBroker(latency=0.0)
+        engine = AsyncEngine(PacedFeed(ticks(5)), broker, [], [buying_strategy()],
+                             pass_through_risk(), position_sync_interval=60.0)
+        run(engine)
+
+        # the initial sync plus at least one triggered by fills, long before 60s
+        self.assertGreaterEqual(broker.position_calls, 2)
+        self.assertEqual(engine.loop.state.positions.get(7, 0) % 25, 0)
+
+    def test_timers_run_alongside_ticks(self):
+        broker = SlowAsyncBroker(latency=0.0)
+        strategy = buying_strategy()
+        strategy.on_tick.return_value = []
+        engine = AsyncEngine(PacedFeed(ticks(20), gap=0.01), broker, [], [strategy],
+                             pass_through_risk(), position_sync_interval=None)
+        fired = []
+
+        async def async_timer():
+            fired.append("async")
+
+        engine.add_timer(0.05, lambda: fired.append("sync"))
+        engine.add_timer(0.05, async_timer)
+        run(engine)
+
+        self.assertIn("sync", fired)
+        self.assertIn("async", fired)
+
+    def test_batch_mode(self):
+        class BatchFeed(PacedFeed):
+            async def astream_batches(self):
+                yield self.items[:3]
+                yield []
+                yield self.items[3:]
+
+        strategy = buying_strategy()
+        strategy.on_tick.return_value = []
+        engine = AsyncEngine(BatchFeed(ticks(5)), SlowAsyncBroker(0.0), [], [strategy],
+                             pass_through_risk(), position_sync_interval=None,
+                             batch_mode=True)
+        run(engine)
+
+        self.assertEqual(engine.tick_count, 5)
+        self.assertEqual(strategy.on_tick.call_count, 2)
+
+    def test_sync_adapters(self):
+        """A blocking feed and broker run unchanged behind the adapters."""
+        feed = MagicMock()
+        feed.stream.return_value = iter(ticks(3))
+        broker = DummyBroker()
+
+        engine = AsyncEngine(AsyncFeedAdapter(feed), AsyncBrokerAdapter(broker), [],
+                             [buying_strategy()], pass_through_risk(),
+                             position_sync_interval=None)
+        run(engine)
+
+        self.assertEqual(engine.tick_count, 3)
+        self.assertEqual({p.instrument_token: p.quantity for p in broker.get_positions()},
+                         {7: 75})
+
+
+class TestAsyncFeedAdapter(unittest.TestCase):
+    def test_feed_errors_propagate(self):
+        def failing():
+            yield ticks(1)[0]
+            raise RuntimeError("socket closed")
+
+        feed = MagicMock()
+        feed.stream.return_value = failing()
+
+        async def consume():
+            return [tick async for tick in AsyncFeedAdapter(feed).astream()]
+
+        with self.assertRaises(RuntimeError):
+            asyncio.run(asyncio.wait_for(consume(), TIMEOUT))
+
+
+class TestAsyncOrderExecutor(unittest.TestCase):
+    def test_broker_errors_become_rejections(self):
+        broker = MagicMock()
+
+        async def fail(order):
+            raise RuntimeError("timeout")
+
+        broker.place_order.side_effect = fail
+
+        async def scenario():
+            executor = AsyncOrderExecutor(broker)
+            executor.submit([TradeAction("OPEN_LONG", 1, 10)])
+            await executor.aclose()
+            return executor.drain()
+
+        with self.assertLogs("core.engine.async_runner", level="ERROR"):
+            (event,) = asyncio.run(asyncio.wait_for(scenario(), TIMEOUT))
+        self.assertEqual(event.report.status, "REJECTED")
+
+    def test_in_flight_orders_are_bounded(self):
+        broker = SlowAsyncBroker(latency=0.05)
+        active = []
+        place = broker.place_order
+
+        async def tracking(order):
+            active.append(len(active) + 1)
+            try:
+                return await place(order)
+            finally:
+                active.pop()
+
+        broker.place_order = tracking
+        peaks = []
+
+        async def scenario():
+            executor = AsyncOrderExecutor(broker, max_pending=2)
+            executor.submit([TradeAction("OPEN_LONG", i, 1) for i in range(6)])
+            while executor.pending:
+                peaks.append(len(active))
+                await asyncio.sleep(0.01)
+            return executor.drain()
+
+        events = asyncio.run(asyncio.wait_for(scenario(), TIMEOUT))
+        self.assertEqual(len(events), 6)
+        self.assertLessEqual(max(peaks), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
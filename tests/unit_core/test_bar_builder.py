@@ -0,0 +1,83 @@
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+from core.domain.types import Candle, Tick
+from core.engine.bar_builder import BarBuilder
+from core.engine.runner import Engine
+
+T0 = datetime(2024, 10, 1, 9, 15)
+
+
+def tick(seconds, price, volume=0, token=1):
+    return Tick(token, T0 + timedelta(seconds=seconds), price, volume)
+
+
+class TestBarBuilder(unittest.TestCase):
+    def test_builds_ohlcv_bars(self):
+        builder = BarBuilder(intervals=[60])
+        self.assertEqual(builder.on_tick(tick(0, 100.0, 1000)), [])
+        builder.on_tick(tick(10, 103.0, 1010))
+        builder.on_tick(tick(20, 99.0, 1025))
+        builder.on_tick(tick(59, 101.0, 1040))
+
+        (event,) = builder.on_tick(tick(61, 102.0, 1050))
+
+        self.assertEqual(event.interval, 60)
+        self.assertEqual(event.candle, Candle(1, T0, 100.0, 103.0, 99.0, 101.0, 40))
+        self.assertEqual(list(builder.bars(1)), [event.candle])
+
+    def test_multiple_intervals_and_alignment(self):
+        builder = BarBuilder(intervals=[900, 60, 300])
+        closed = []
+        for second in range(0, 16 * 60, 30):
+            closed.extend(builder.on_tick(tick(second, 100.0 + second / 60)))
+
+        counts = {i: sum(1 for e in closed if e.interval == i) for i in (60, 300, 900)}
+        self.assertEqual(counts, {60: 15, 300: 3, 900: 1})
+
+        (bar_15m,) = builder.bars(1, 900)
+        self.assertEqual(bar_15m.timestamp, T0)
+        self.assertEqual((bar_15m.open, bar_15m.high, bar_15m.close), (100.0, 114.5, 114.5))
+        self.assertEqual([b.timestamp.minute for b in builder.bars(1, 300)], [15, 20, 25])
+
+    def test_bars_are_per_token_and_bounded(self):
+        builder = BarBuilder(intervals=[60], max_bars=5)
+        for minute in range(20):
+            builder.on_tick(tick(minute * 60, 100.0, token=1))
+            builder.on_tick(tick(minute * 60, 200.0, token=2))
+
+        self.assertEqual(len(builder.bars(1)), 5)
+        self.assertEqual(builder.bars(2)[-1].close, 200.0)
+        self.assertEqual(builder.bars(1)[-1].timestamp, T0 + timedelta(minutes=18))
+
+    def test_rejects_intervals_that_do_not_divide_a_day(self):
+        with self.assertRaises(ValueError):
+            BarBuilder(intervals=[7 * 60])
+
+
+class TestEngineBars(unittest.TestCase):
+    def test_candle_models_run_once_per_bar(self):
+        feed = MagicMock()
+        feed.stream.return_value = [tick(s, 100.0) for s in range(0, 5 * 60, 15)]
+        broker = MagicMock()
+        broker.get_positions.return_value = []
+        risk_mgr = MagicMock()
+        risk_mgr.filter_actions.return_value = []
+
+        tick_model = MagicMock(instrument_token=1, uses_candles=False)
+        tick_model.update.return_value = None
+        seen = []
+        bar_model = MagicMock(instrument_token=1, uses_candles=True, candle_interval=60)
+        bar_model.update.side_effect = lambda state: seen.append(len(state.candles(1, 60)))
+
+        engine = Engine(feed, broker, [tick_model, bar_model], [], risk_mgr)
+        engine.run()
+
+        self.assertEqual(tick_model.update.call_count, 20)
+        self.assertEqual(seen, [1, 2, 3, 4])
+        self.assertIs(engine.loop.state.recent_candles, engine.loop.state.candles_by_interval[60])
+
+
+if __name__ == "__main__":
+    unittest.main()
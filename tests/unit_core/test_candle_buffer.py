@@ -0,0 +1,69 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from core.domain.candle_buffer import CandleRingBuffer
+from core.domain.types import Candle
+
+T0 = datetime(2024, 10, 1, 9, 15)
+
+
+def candle(i, tz=None, oi=None):
+    return Candle(7, (T0 + timedelta(minutes=i)).replace(tzinfo=tz),
+                  100.0 + i, 101.0 + i, 99.0 + i, 100.5 + i, 10 * i, oi)
+
+
+class TestCandleRingBuffer(unittest.TestCase):
+    def test_views_before_wrap(self):
+        buf = CandleRingBuffer(7, capacity=5)
+        self.assertEqual(len(buf), 0)
+        self.assertEqual(buf.closes().tolist(), [])
+
+        buf.extend(candle(i) for i in range(3))
+
+        self.assertEqual(buf.closes().tolist(), [100.5, 101.5, 102.5])
+        self.assertEqual(buf.highs(2).tolist(), [102.0, 103.0])
+        self.assertEqual(buf.volumes(10).tolist(), [0, 10, 20])
+
+    def test_wraps_and_keeps_last_n_contiguous(self):
+        buf = CandleRingBuffer(7, capacity=4)
+        for i in range(11):
+            buf.append(candle(i))
+            n = min(i + 1, 4)
+            expected = [100.5 + k for k in range(i + 1 - n, i + 1)]
+            self.assertEqual(buf.closes().tolist(), expected)
+
+        self.assertEqual(len(buf), 4)
+        self.assertEqual(buf[0], candle(7))
+        self.assertEqual(buf[-1], candle(10))
+        self.assertEqual(list(buf), [candle(i) for i in range(7, 11)])
+        self.assertEqual(buf[-2:], [candle(9), candle(10)])
+        with self.assertRaises(IndexError):
+            buf[4]
+
+    def test_views_are_zero_copy_and_read_only(self):
+        buf = CandleRingBuffer(7, capacity=8)
+        buf.extend(candle(i) for i in range(20))
+
+        view = buf.closes(5)
+        self.assertTrue(np.shares_memory(view, buf._columns["close"]))
+        self.assertTrue(view.flags.c_contiguous)
+        with self.assertRaises(ValueError):
+            view[0] = 0.0
+
+    def test_round_trips_timestamps_and_oi(self):
+        ist = timezone(timedelta(hours=5, minutes=30))
+        aware = CandleRingBuffer(7)
+        aware.append(candle(1, tz=ist, oi=1500))
+        self.assertEqual(aware[0], candle(1, tz=ist, oi=1500))
+        self.assertEqual(aware[0].timestamp.utcoffset(), timedelta(hours=5, minutes=30))
+
+        naive = CandleRingBuffer(7)
+        naive.append(candle(1))
+        self.assertEqual(naive[0], candle(1))
+        self.assertIsNone(naive[0].oi)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+from core.domain.types import Candle, OrderRequest
+from core.engine.clock import EPOCH, ReplayClock
+from core.engine.execution import OrderExecutor
+from core.engine.runner import Engine
+from core.ports.clock import WALL_CLOCK, WallClock
+from infra.backtest.backtest_feed import BacktestFeed
+from infra.backtest.simulated_broker import SimulatedBroker
+from infra.dummy.dummy_risk import DummyRiskManager
+from strategies.option_strategies.high_vol_long_straddle import HighVolLongStraddleStrategy
+from strategies.vol_models.atr_vol_model import ATRVolModel
+from strategies.vol_models.composite_vol_model import CompositeVolModel
+from strategies.vol_models.realized_vol_model import RealizedVolModel
+
+START = datetime(2024, 10, 1, 9, 15)
+
+
+class TestClocks(unittest.TestCase):
+    def test_replay_clock_follows_ticks_and_never_goes_back(self):
+        clock = ReplayClock()
+        self.assertEqual(clock.now(), EPOCH)
+
+        clock.advance(START + timedelta(minutes=1))
+        clock.advance(START)   # late tick
+        self.assertEqual(clock.now(), START + timedelta(minutes=1))
+        self.assertEqual(clock.monotonic(), (START + timedelta(minutes=1)).timestamp())
+
+    def test_wall_clock(self):
+        before = datetime.now(timezone.utc)
+        self.assertGreaterEqual(WallClock().now(), before)
+        WALL_CLOCK.advance(START)   # ignored
+        self.assertGreater(WALL_CLOCK.now().year, 2024)
+
+
+class TestEngineClock(unittest.TestCase):
+    @staticmethod
+    def candles():
+        return [Candle(1, START + timedelta(minutes=i), p, p * 1.01, p * 0.99, p, 100)
+                for i, p in enumerate(100.0 + 3 * (i % 4) for i in range(60))]
+
+    def run_backtest(self):
+        broker = SimulatedBroker()
+        atr = ATRVolModel(1, period=5, high_threshold=0.01, low_threshold=0.001)
+        composite = CompositeVolModel([RealizedVolModel(1, lookback=5)])
+        strategy = HighVolLongStraddleStrategy(underlying_token=1)
+        signals = []
+        strategy.on_vol_signal = lambda ctx: signals.extend(ctx.vol_signals) or []
+
+        engine = Engine(BacktestFeed({1: self.candles()}), broker, [atr, composite],
+                        [strategy], DummyRiskManager(),
+                        executor=OrderExecutor(broker, max_workers=0),
+                        clock=ReplayClock())
+        engine.run()
+        broker.place_order(OrderRequest(1, 1, "MARKET", "BUY"))
+        return engine, signals, broker.orders
+
+    def test_components_share_the_engine_clock(self):
+        engine, _, _ = self.run_backtest()
+        for component in (*engine.vol_models, *engine.vol_models[1].models,
+                          *engine.strategies, engine.broker, engine.risk_mgr):
+            self.assertIs(component.clock, engine.clock)
+
+    def test_backtests_are_stamped_with_replay_time_and_repeatable(self):
+        _, signals, orders = self.run_backtest()
+        _, signals_again, orders_again = self.run_backtest()
+
+        self.assertTrue(signals)
+        last = START + timedelta(minutes=59)
+        self.assertTrue(all(START <= s.timestamp <= last for s in signals))
+        self.assertTrue(all(r.timestamp == last for r in orders.values()))
+        self.assertEqual(signals, signals_again)
+        self.assertEqual(orders, orders_again)
+
+    def test_mock_components_are_tolerated(self):
+        engine = Engine(MagicMock(), MagicMock(), [], [object()], MagicMock())
+        self.assertIs(engine.clock, WALL_CLOCK)
+
+
+if __name__ == "__main__":
+    unittest.main()
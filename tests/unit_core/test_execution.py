@@ -0,0 +1,130 @@
+import threading
+import time
+import unittest
+from datetime import datetime
+from unittest.mock import MagicMock
+
+from core.domain.actions import TradeAction
+from core.domain.types import OrderRequest, Tick
+from core.engine.execution import OrderExecutor, to_order
+from core.engine.runner import Engine
+from infra.dummy.dummy_broker import DummyBroker
+
+
+class SlowBroker(DummyBroker):
+    """DummyBroker with a fixed place_order latency."""
+
+    def __init__(self, latency):
+        super().__init__()
+        self.latency = latency
+        self.max_concurrent = 0
+        self._active = 0
+        self._lock = threading.Lock()
+
+    def place_order(self, order):
+        with self._lock:
+            self._active += 1
+            self.max_concurrent = max(self.max_concurrent, self._active)
+        time.sleep(self.latency)
+        with self._lock:
+            self._active -= 1
+            return super().place_order(order)
+
+
+def condor_legs(token=100):
+    return [
+        TradeAction("OPEN_SHORT", token + 1, 50),
+        TradeAction("OPEN_LONG", token + 2, 50),
+        TradeAction("OPEN_SHORT", token + 3, 50),
+        TradeAction("OPEN_LONG", token + 4, 50, price=12.5),
+    ]
+
+
+class TestToOrder(unittest.TestCase):
+    def test_maps_action_types(self):
+        self.assertEqual(to_order(TradeAction("OPEN_LONG", 1, 10)),
+                         OrderRequest(1, 10, "MARKET", "BUY"))
+        self.assertEqual(to_order(TradeAction("CLOSE_LONG", 1, 10, price=5.0)),
+                         OrderRequest(1, 10, "LIMIT", "SELL", 5.0))
+        self.assertEqual(to_order(TradeAction("OPEN_SHORT", 1, 10)).transaction_type, "SELL")
+        self.assertEqual(to_order(TradeAction("CLOSE_SHORT", 1, 10)).transaction_type, "BUY")
+
+    def test_unknown_action_type(self):
+        with self.assertRaises(ValueError):
+            to_order(TradeAction("HEDGE", 1, 10))
+
+
+class TestOrderExecutor(unittest.TestCase):
+    def test_inline_execution_with_dummy_broker(self):
+        broker = DummyBroker()
+        executor = OrderExecutor(broker, max_workers=0)
+
+        executor.submit(condor_legs())
+        events = executor.drain()
+
+        self.assertEqual([e.order.instrument_token for e in events], [101, 102, 103, 104])
+        self.assertTrue(all(e.report.status == "FILLED" for e in events))
+        self.assertEqual({p.instrument_token: p.quantity for p in broker.get_positions()},
+                         {101: -50, 102: 50, 103: -50, 104: 50})
+        self.assertEqual(executor.drain(), [])
+
+    def test_legs_are_sent_concurrently(self):
+        broker = SlowBroker(latency=0.2)
+        executor = OrderExecutor(broker, max_workers=4)
+
+        started = time.perf_counter()
+        executor.submit(condor_legs())
+        submit_time = time.perf_counter() - started
+        executor.close()
+        elapsed = time.perf_counter() - started
+
+        self.assertLess(submit_time, 0.1)      # the caller never waits on the broker
+        self.assertLess(elapsed, 0.6)          # well under 4 × 0.2s sequential
+        self.assertEqual(broker.max_concurrent, 4)
+        self.assertEqual(len(executor.drain()), 4)
+
+    def test_broker_errors_become_rejections(self):
+        broker = MagicMock()
+        broker.place_order.side_effect = RuntimeError("timeout")
+        executor = OrderExecutor(broker, max_workers=0)
+
+        with self.assertLogs("core.engine.execution", level="ERROR"):
+            executor.submit([TradeAction("OPEN_LONG", 1, 10)])
+
+        (event,) = executor.drain()
+        self.assertEqual(event.report.status, "REJECTED")
+
+    def test_later_reports_are_routed_back(self):
+        broker = DummyBroker()
+        executor = OrderExecutor(broker, max_workers=0)
+        executor.submit([TradeAction("OPEN_LONG", 1, 10)])
+        (placed,) = executor.drain()
+
+        executor.on_report(placed.report)
+        executor.on_report(MagicMock(order_id="unknown"))
+
+        (event,) = executor.drain()
+        self.assertEqual(event.action, placed.action)
+
+
+class TestEngineExecution(unittest.TestCase):
+    def test_fills_reach_position_cache(self):
+        broker = DummyBroker()
+        strategy = MagicMock()
+        strategy.instrument_token = None
+        strategy.on_tick.return_value = [TradeAction("OPEN_LONG", 7, 25)]
+        strategy.on_vol_signal.return_value = []
+        risk = MagicMock()
+        risk.filter_actions.side_effect = lambda actions: actions
+        feed = MagicMock()
+        feed.stream.return_value = iter([Tick(7, datetime(2024, 1, 1, 9, 15), 100.0, 0)])
+
+        engine = Engine(feed, broker, [], [strategy], risk,
+                        executor=OrderExecutor(broker, max_workers=2))
+        engine.run()
+
+        self.assertEqual(engine.positions.snapshot(), {7: 25})
+
+
+if __name__ == "__main__":
+    unittest.main()
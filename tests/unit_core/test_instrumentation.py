@@ -0,0 +1,88 @@
+import random
+import unittest
+from datetime import datetime
+from unittest.mock import MagicMock
+
+from core.domain.types import Tick
+from core.engine.instrumentation import Instrumentation, LatencyHistogram
+from core.engine.runner import Engine
+
+
+def engine_with(instrumentation, ticks=3):
+    feed = MagicMock()
+    feed.stream.return_value = [Tick(1, datetime(2024, 10, 1, 9, 15, i), 100.0, 0)
+                                for i in range(ticks)]
+    broker = MagicMock()
+    broker.get_positions.return_value = []
+    model = MagicMock(instrument_token=1, uses_candles=False)
+    model.name = "vol"
+    model.update.return_value = None
+    strategy = MagicMock(instrument_token=1)
+    strategy.name = "strat"
+    strategy.on_tick.return_value = []
+    risk = MagicMock()
+    risk.filter_actions.return_value = []
+    return Engine(feed, broker, [model], [strategy], risk, instrumentation=instrumentation)
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_percentiles_within_bucket_precision(self):
+        rng = random.Random(3)
+        values = sorted(int(rng.lognormvariate(10, 1.5)) for _ in range(20000))
+        hist = LatencyHistogram()
+        for v in values:
+            hist.record(v)
+
+        for p in (50, 90, 99, 99.9):
+            exact = values[int(len(values) * p / 100) - 1]
+            self.assertAlmostEqual(hist.percentile(p) / exact, 1.0, delta=0.035)
+        self.assertEqual((hist.min, hist.max, hist.count), (values[0], values[-1], len(values)))
+
+    def test_small_values_are_exact_and_merge(self):
+        a, b = LatencyHistogram(), LatencyHistogram()
+        for v in range(1, 11):
+            a.record(v)
+            b.record(v + 10)
+        a.merge(b)
+
+        self.assertEqual(a.count, 20)
+        self.assertEqual(a.percentile(50), 10)
+        self.assertEqual(a.max, 20)
+        self.assertAlmostEqual(a.mean(), 10.5)
+
+
+class TestInstrumentation(unittest.TestCase):
+    def test_engine_records_stages_and_components(self):
+        inst = Instrumentation(sink=lambda report: None)
+        engine_with(inst).run()
+
+        report = inst.report()
+        for stage in ("fills", "state", "positions", "models", "strategies", "risk", "tick"):
+            self.assertEqual(report["stages"][stage]["count"], 3)
+        self.assertEqual(report["components"]["vol[1]"]["count"], 3)
+        self.assertEqual(report["components"]["strat[1]"]["count"], 3)
+
+    def test_disabled_is_a_no_op(self):
+        clock = MagicMock(side_effect=AssertionError("clock read while disabled"))
+        inst = Instrumentation(enabled=False, clock=clock)
+        engine_with(inst).run()
+
+        self.assertEqual(inst.report(), {"stages": {}, "components": {}})
+        clock.assert_not_called()
+
+    def test_interval_dumps(self):
+        now = [0.0]
+        reports = []
+        inst = Instrumentation(dump_interval=10.0, sink=reports.append,
+                               wall_clock=lambda: now[0])
+        inst.stage("state", 1000)
+
+        inst.maybe_dump()
+        self.assertEqual(reports, [])
+        now[0] = 10.0
+        inst.maybe_dump()
+        self.assertEqual(reports[0]["stages"]["state"]["count"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,152 @@
+import os
+import unittest
+from datetime import date, datetime
+
+from core.domain.actions import TradeAction
+from core.domain.types import Tick
+from core.engine.clock import ReplayClock
+from core.engine.option_resolver import OptionResolver
+from infra.zerodtha.instrument_master import InstrumentMaster
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "..", "fixtures", "instruments.csv")
+
+NIFTY, BANKNIFTY, RELIANCE = 256265, 260105, 738561
+
+
+def straddle(kind="OPEN_LONG", underlying=NIFTY, spot=24763.0, lots=1):
+    return [TradeAction(kind, underlying, lots, metadata={"structure": "LONG_STRADDLE",
+                                                         "leg": leg, "approx_strike": spot})
+            for leg in ("CALL", "PUT")]
+
+
+def condor(underlying=NIFTY, spot=24750.0, width=100.0):
+    legs = (("OPEN_SHORT", "SHORT_CALL", width), ("OPEN_SHORT", "SHORT_PUT", -width),
+            ("OPEN_LONG", "LONG_CALL", 2 * width), ("OPEN_LONG", "LONG_PUT", -2 * width))
+    return [TradeAction(kind, underlying, 1, metadata={"structure": "IRON_CONDOR", "leg": leg,
+                                                       "approx_strike": spot,
+                                                       "relative_strike": offset})
+            for kind, leg, offset in legs]
+
+
+def condor_close(underlying=NIFTY):
+    legs = (("CLOSE_SHORT", "SHORT_CALL"), ("CLOSE_SHORT", "SHORT_PUT"),
+            ("CLOSE_LONG", "LONG_CALL"), ("CLOSE_LONG", "LONG_PUT"))
+    return [TradeAction(kind, underlying, 1, metadata={"structure": "IRON_CONDOR", "leg": leg})
+            for kind, leg in legs]
+
+
+class TestOptionResolver(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.master = InstrumentMaster.from_csv(FIXTURE)
+
+    def setUp(self):
+        self.clock = ReplayClock(datetime(2024, 10, 1, 9, 15))
+        self.resolver = OptionResolver.from_master(self.master, [NIFTY, BANKNIFTY, RELIANCE])
+        self.resolver.set_clock(self.clock)
+
+    def contract(self, action):
+        inst = self.master.get(action.instrument_token)
+        return inst.name, inst.instrument_type, inst.strike, inst.expiry
+
+    def test_straddle_rounds_to_atm_on_nearest_expiry(self):
+        call, put = self.resolver.resolve(straddle())
+
+        self.assertEqual(self.contract(call), ("NIFTY", "CE", 24750.0, date(2024, 10, 3)))
+        self.assertEqual(self.contract(put), ("NIFTY", "PE", 24750.0, date(2024, 10, 3)))
+        self.assertEqual(call.quantity, 25)
+        self.assertEqual(call.metadata["underlying"], NIFTY)
+        self.assertEqual(call.metadata["lot_size"], 25)
+        self.assertEqual(call.metadata["lots"], 1)
+        self.assertEqual(call.metadata["leg"], "CALL")
+
+    def test_condor_wings(self):
+        actions = self.resolver.resolve(condor())
+
+        self.assertEqual([(self.contract(a)[1], self.contract(a)[2]) for a in actions],
+                         [("CE", 24850.0), ("PE", 24650.0), ("CE", 24950.0), ("PE", 24550.0)])
+        self.assertEqual([a.action_type for a in actions],
+                         ["OPEN_SHORT", "OPEN_SHORT", "OPEN_LONG", "OPEN_LONG"])
+
+    def test_targets_outside_the_chain_clamp_to_the_edge(self):
+        call, _ = self.resolver.resolve(straddle(spot=30000.0))
+        self.assertEqual(self.contract(call)[2], 25500.0)
+
+    def test_index_and_equity_option_names(self):
+        call, _ = self.resolver.resolve(straddle(underlying=BANKNIFTY, spot=51234.0))
+        self.assertEqual(self.contract(call), ("BANKNIFTY", "CE", 51200.0, date(2024, 10, 30)))
+        self.assertEqual(call.quantity, 15)
+
+        _, put = self.resolver.resolve(straddle(underlying=RELIANCE, spot=2851.0, lots=2))
+        self.assertEqual(self.contract(put), ("RELIANCE", "PE", 2860.0, date(2024, 10, 31)))
+        self.assertEqual(put.quantity, 500)
+
+    def test_closes_use_the_opened_contracts(self):
+        opened = self.resolver.resolve(condor())
+        self.resolver.accept(opened)
+        # past the weekly expiry, with the spot moved: new opens would pick other contracts
+        self.clock.advance(datetime(2024, 10, 4, 9, 15))
+
+        closed = self.resolver.resolve(condor_close())
+        self.assertEqual([a.instrument_token for a in closed],
+                         [a.instrument_token for a in opened])
+        self.assertIsNotNone(self.resolver.open_leg(NIFTY, "IRON_CONDOR", "SHORT_CALL"))
+        self.resolver.accept(closed)
+        self.assertIsNone(self.resolver.open_leg(NIFTY, "IRON_CONDOR", "SHORT_CALL"))
+
+    def test_only_accepted_legs_are_remembered(self):
+        self.resolver.resolve(condor())   # rejected by risk: never accepted
+        self.assertEqual(self.resolver.resolve(condor_close()), [])
+
+        opened = self.resolver.resolve(straddle())
+        self.resolver.accept(opened)
+        self.resolver.resolve(straddle("CLOSE_LONG", spot=25200.0))   # close rejected
+        self.assertEqual(self.resolver.open_leg(NIFTY, "LONG_STRADDLE", "CALL").instrument_token,
+                         opened[0].instrument_token)
+        closed = self.resolver.resolve(straddle("CLOSE_LONG", spot=25200.0))
+        self.assertEqual([a.instrument_token for a in closed],
+                         [a.instrument_token for a in opened])
+
+    def test_ref_price_is_the_underlying_price(self):
+        call, _ = self.resolver.resolve(straddle())
+        self.assertEqual(call.metadata["ref_price"], 24763.0)   # approx_strike before any tick
+
+        self.resolver.on_tick(Tick(NIFTY, datetime(2024, 10, 1, 9, 16), 24801.5, 0))
+        call, _ = self.resolver.resolve(straddle())
+        self.assertEqual(call.metadata["ref_price"], 24801.5)
+
+    def test_expiry_rolls_with_the_clock(self):
+        self.clock.advance(datetime(2024, 10, 4, 9, 15))
+        call, _ = self.resolver.resolve(straddle())
+        self.assertEqual(self.contract(call)[3], date(2024, 10, 31))
+
+    def test_expiry_rank_and_min_days(self):
+        resolver = OptionResolver.from_master(self.master, [NIFTY], expiry_rank=1)
+        resolver.set_clock(self.clock)
+        self.assertEqual(resolver.leg(NIFTY, "CE", 24750.0).expiry, date(2024, 10, 31))
+
+        resolver = OptionResolver.from_master(self.master, [NIFTY], min_days_to_expiry=3)
+        resolver.set_clock(self.clock)
+        self.assertEqual(resolver.leg(NIFTY, "CE", 24750.0).expiry, date(2024, 10, 31))
+
+    def test_unresolvable_group_is_dropped_whole(self):
+        actions = condor()
+        actions[3] = actions[3]._replace(metadata={**actions[3].metadata, "leg": "WING"})
+        self.assertEqual(self.resolver.resolve(actions), [])
+        self.assertIsNone(self.resolver.open_leg(NIFTY, "IRON_CONDOR", "SHORT_CALL"))
+
+        unknown = straddle(underlying=999)
+        plain = TradeAction("OPEN_LONG", 999, 1)
+        self.assertEqual(self.resolver.resolve(unknown + [plain] + straddle()[:1]),
+                         [plain] + self.resolver.resolve(straddle()[:1]))
+
+    def test_close_without_open_is_dropped(self):
+        self.assertEqual(self.resolver.resolve(condor_close()), [])
+
+    def test_resolved_actions_pass_through(self):
+        resolved = self.resolver.resolve(straddle())
+        self.assertEqual(self.resolver.resolve(resolved), resolved)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+from datetime import datetime
+from unittest.mock import MagicMock
+
+from core.engine.position_cache import PositionCache
+from core.domain.types import OrderRequest, OrderExecutionReport, Position
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestPositionCache(unittest.TestCase):
+    def setUp(self):
+        self.broker = MagicMock()
+        self.broker.get_positions.return_value = [Position(123, 10, 100.0, 0.0)]
+        self.clock = FakeClock()
+        self.cache = PositionCache(self.broker, sync_interval=5.0, clock=self.clock)
+
+    def test_first_refresh_syncs_and_publishes(self):
+        self.assertTrue(self.cache.refresh())
+        self.assertEqual(self.cache.snapshot(), {123: 10})
+        self.broker.get_positions.assert_called_once()
+
+    def test_no_broker_call_until_interval(self):
+        self.cache.refresh()
+        self.clock.now = 4.9
+        self.assertFalse(self.cache.refresh())
+        self.assertEqual(self.broker.get_positions.call_count, 1)
+
+        self.clock.now = 5.0
+        self.assertFalse(self.cache.refresh())  # synced, but nothing changed
+        self.assertEqual(self.broker.get_positions.call_count, 2)
+
+    def test_fill_updates_locally_and_triggers_resync(self):
+        self.cache.refresh()
+        order = OrderRequest(123, 5, "MARKET", "SELL")
+        report = OrderExecutionReport("o1", "FILLED", 5, 101.0, datetime.now())
+
+        self.cache.apply_fill(order, report)
+        self.assertEqual(self.cache.snapshot(), {123: 5})
+
+        self.broker.get_positions.return_value = [Position(123, 5, 100.0, 0.0)]
+        self.assertTrue(self.cache.refresh())
+        self.assertEqual(self.broker.get_positions.call_count, 2)
+        self.assertEqual(self.cache.snapshot(), {123: 5})
+
+    def test_flat_positions_are_dropped(self):
+        self.cache.refresh()
+        order = OrderRequest(123, 10, "MARKET", "SELL")
+        report = OrderExecutionReport("o1", "FILLED", 10, 101.0, datetime.now())
+        self.cache.apply_fill(order, report)
+        self.assertEqual(self.cache.snapshot(), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
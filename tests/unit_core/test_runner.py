@@ -52,5 +52,256 @@ class TestRunner(unittest.TestCase):
         strategy.on_vol_signal.assert_called()
         risk_mgr.filter_actions.assert_called_with([action])
 
+    def test_token_indexed_dispatch(self):
+        """Models and strategies only see ticks for their own token, plus wildcards."""
+        feed = MagicMock()
+        broker = MagicMock()
+        risk_mgr = MagicMock()
+        broker.get_positions.return_value = []
+        risk_mgr.filter_actions.return_value = []
+
+        now = datetime.now()
+        feed.stream.return_value = [Tick(1, now, 100.0, 10), Tick(2, now, 200.0, 10)]
+
+        def component(token):
+            c = MagicMock()
+            c.instrument_token = token
+            c.update.return_value = None
+            c.on_tick.return_value = []
+            c.on_vol_signal.return_value = []
+            return c
+
+        model_1, model_2, model_any = component(1), component(2), component(None)
+        strat_1, strat_any = component(1), component(None)
+
+        engine = Engine(feed, broker, [model_1, model_2, model_any],
+                        [strat_1, strat_any], risk_mgr)
+        engine.run()
+
+        self.assertEqual(model_1.update.call_count, 1)
+        self.assertEqual(model_2.update.call_count, 1)
+        self.assertEqual(model_any.update.call_count, 2)
+        self.assertEqual(strat_1.on_tick.call_count, 1)
+        self.assertEqual(strat_any.on_tick.call_count, 2)
+
+    def test_batch_mode_evaluates_once_per_token(self):
+        """Models see every tick of a batch; strategies run once per token."""
+        feed = MagicMock()
+        broker = MagicMock()
+        risk_mgr = MagicMock()
+        broker.get_positions.return_value = []
+        risk_mgr.filter_actions.return_value = []
+
+        now = datetime.now()
+        feed.stream_batches.return_value = [
+            [Tick(1, now, 100.0, 10), Tick(2, now, 200.0, 10), Tick(1, now, 101.0, 11)],
+            [Tick(1, now, 102.0, 12)],
+        ]
+
+        seen_prices = []
+        model_1 = MagicMock(instrument_token=1, uses_candles=False)
+        model_1.update.side_effect = lambda state: seen_prices.append(
+            state.last_ticks[1].last_price)
+        strat_any = MagicMock(instrument_token=None)
+        strat_any.on_tick.return_value = []
+
+        engine = Engine(feed, broker, [model_1], [strat_any], risk_mgr, batch_mode=True)
+        engine.run()
+
+        feed.stream.assert_not_called()
+        self.assertEqual(seen_prices, [100.0, 101.0, 102.0])
+        self.assertEqual(strat_any.on_tick.call_count, 3)   # tokens 1, 2, then 1
+        self.assertEqual(risk_mgr.filter_actions.call_count, 2)
+        self.assertEqual(engine.tick_count, 4)
+
+    def test_batch_mode_does_not_change_signals(self):
+        """Stateful tick models produce the same signals with and without batching."""
+        from datetime import timedelta
+        from core.domain.types import Candle
+        from infra.backtest.backtest_feed import BacktestFeed
+        from strategies.vol_models.ewma_vol_model import EWMAVolModel
+        from strategies.vol_models.realized_vol_model import RealizedVolModel
+
+        start = datetime(2024, 10, 1, 9, 15)
+        candles = {
+            token: [Candle(token, start + timedelta(minutes=i), p, p * 1.004, p * 0.996,
+                           p * (1.002 if i % 3 else 0.998), 100)
+                    for i, p in enumerate(100.0 + token + (i % 7) for i in range(120))]
+            for token in (1, 2)
+        }
+
+        def signals(batch_mode):
+            broker = MagicMock()
+            broker.get_positions.return_value = []
+            risk_mgr = MagicMock()
+            risk_mgr.filter_actions.return_value = []
+            models = [m for token in (1, 2) for m in (
+                RealizedVolModel(token, lookback=10, high_threshold=0.003,
+                                 low_threshold=0.001),
+                EWMAVolModel(token, high_threshold=0.003, low_threshold=0.001))]
+            seen = []
+            strategy = MagicMock(instrument_token=None)
+            strategy.on_tick.return_value = []
+            strategy.on_vol_signal.side_effect = lambda ctx: seen.extend(ctx.signals) or []
+            engine = Engine(BacktestFeed(candles), broker, models, [strategy], risk_mgr,
+                            batch_mode=batch_mode)
+            engine.run()
+            return sorted(set(seen))
+
+        unbatched = signals(False)
+        self.assertTrue(unbatched)
+        self.assertEqual(signals(True), unbatched)
+
+    def test_signals_routed_per_token(self):
+        """Each strategy reacts once per signalling token, seeing only its signals."""
+        feed = MagicMock()
+        broker = MagicMock()
+        risk_mgr = MagicMock()
+        broker.get_positions.return_value = []
+        risk_mgr.filter_actions.return_value = []
+
+        now = datetime.now()
+        feed.stream.return_value = [Tick(1, now, 100.0, 10), Tick(2, now, 200.0, 10)]
+
+        def model(token, kind):
+            m = MagicMock(instrument_token=token, uses_candles=False)
+            m.update.side_effect = lambda state: (
+                VolSignal(token, kind, 0.5, now) if token in state.last_ticks else None)
+            return m
+
+        calls = []
+        contexts = []
+
+        def strategy(token):
+            s = MagicMock(instrument_token=token)
+            s.on_tick.side_effect = lambda ctx: contexts.append(ctx) or []
+            s.on_vol_signal.side_effect = lambda ctx: calls.append(
+                (token, ctx.token, [sig.kind for sig in ctx.signals])) or []
+            return s
+
+        # two models emit for token 1 on the same tick
+        models = [model(1, "VOL_UP"), model(1, "VOL_DOWN"), model(2, "VOL_UP")]
+        engine = Engine(feed, broker, models, [strategy(1), strategy(None)], risk_mgr)
+        engine.run()
+
+        self.assertEqual(calls, [
+            (1, 1, ["VOL_UP", "VOL_DOWN"]), (None, 1, ["VOL_UP", "VOL_DOWN"]),
+            (None, 2, ["VOL_UP"]),
+        ])
+        self.assertIs(contexts[0], contexts[-1])
+
+    def test_dummy_strategy_acts_once_per_signal(self):
+        from infra.dummy.dummy_strategy import DummyStrategy
+
+        feed = MagicMock()
+        broker = MagicMock()
+        risk_mgr = MagicMock()
+        broker.get_positions.return_value = []
+        risk_mgr.filter_actions.side_effect = lambda actions: []
+
+        now = datetime.now()
+        feed.stream.return_value = [Tick(1, now, 100.0, 10)]
+        models = []
+        for token in (1, 2):
+            m = MagicMock(instrument_token=None, uses_candles=False)
+            m.update.return_value = VolSignal(token, "VOL_UP", 0.5, now)
+            models.append(m)
+
+        engine = Engine(feed, broker, models, [DummyStrategy()], risk_mgr)
+        engine.run()
+
+        (actions,), _ = risk_mgr.filter_actions.call_args
+        self.assertEqual(sorted(a.instrument_token for a in actions), [1, 2])
+
+    def test_risk_manager_sees_ticks_and_fills(self):
+        from infra.dummy.dummy_broker import DummyBroker
+        from core.engine.execution import OrderExecutor
+        from strategies.risk_managers.exposure_risk_manager import ExposureRiskManager
+
+        feed = MagicMock()
+        now = datetime.now()
+        feed.stream.return_value = [Tick(1, now, 100.0, 10), Tick(1, now, 90.0, 11)]
+        strategy = MagicMock(instrument_token=1)
+        strategy.on_tick.return_value = [TradeAction("OPEN_LONG", 1, 2, price=100.0)]
+        strategy.on_vol_signal.return_value = []
+        broker = DummyBroker()
+        risk = ExposureRiskManager(max_position=3)
+
+        Engine(feed, broker, [], [strategy], risk,
+               executor=OrderExecutor(broker, max_workers=0)).run()
+
+        # the second buy would take the position to 4
+        self.assertEqual(risk.position(1), 2)
+        self.assertEqual(risk.unrealized_pnl, -20.0)
+
+    def test_resolver_runs_between_strategies_and_risk(self):
+        import os
+        from core.engine.clock import ReplayClock
+        from core.engine.option_resolver import OptionResolver
+        from infra.zerodtha.instrument_master import InstrumentMaster
+
+        master = InstrumentMaster.from_csv(os.path.join(
+            os.path.dirname(__file__), "..", "fixtures", "instruments.csv"))
+        feed = MagicMock()
+        feed.stream.return_value = [Tick(256265, datetime(2024, 10, 1, 9, 15), 24763.0, 10)]
+        strategy = MagicMock(instrument_token=256265)
+        strategy.on_tick.return_value = [
+            TradeAction("OPEN_LONG", 256265, 1, metadata={"structure": "LONG_STRADDLE",
+                                                          "leg": leg, "approx_strike": 24763.0})
+            for leg in ("CALL", "PUT")]
+        strategy.on_vol_signal.return_value = []
+        broker = MagicMock()
+        broker.get_positions.return_value = []
+        broker.on_tick.return_value = []
+        risk_mgr = MagicMock()
+        risk_mgr.filter_actions.return_value = []
+
+        Engine(feed, broker, [], [strategy], risk_mgr, clock=ReplayClock(),
+               resolver=OptionResolver.from_master(master, [256265])).run()
+
+        actions = risk_mgr.filter_actions.call_args[0][0]
+        self.assertEqual([master.get(a.instrument_token).tradingsymbol for a in actions],
+                         ["NIFTY24O0324750CE", "NIFTY24O0324750PE"])
+        self.assertEqual([a.quantity for a in actions], [25, 25])
+
+    def test_notional_limit_applies_to_resolved_option_legs(self):
+        import os
+        from infra.dummy.dummy_broker import DummyBroker
+        from core.engine.clock import ReplayClock
+        from core.engine.execution import OrderExecutor
+        from core.engine.option_resolver import OptionResolver
+        from infra.zerodtha.instrument_master import InstrumentMaster
+        from strategies.risk_managers.exposure_risk_manager import ExposureRiskManager
+
+        master = InstrumentMaster.from_csv(os.path.join(
+            os.path.dirname(__file__), "..", "fixtures", "instruments.csv"))
+
+        def run(limit):
+            feed = MagicMock()
+            feed.stream.return_value = [Tick(256265, datetime(2024, 10, 1, 9, 15), 24763.0, 10)]
+            strategy = MagicMock(instrument_token=256265)
+            strategy.on_tick.return_value = [
+                TradeAction("OPEN_LONG", 256265, 1, metadata={
+                    "structure": "LONG_STRADDLE", "leg": leg, "approx_strike": 24763.0})
+                for leg in ("CALL", "PUT")]
+            strategy.on_vol_signal.return_value = []
+            broker = DummyBroker()
+            risk = ExposureRiskManager(max_underlying_notional=limit)
+            resolver = OptionResolver.from_master(master, [256265])
+            engine = Engine(feed, broker, [], [strategy], risk, clock=ReplayClock(),
+                            executor=OrderExecutor(broker, max_workers=0), resolver=resolver)
+            engine.run()
+            return engine, risk, resolver
+
+        # two legs of 25 at the underlying's 24763: 1.238M of notional
+        engine, risk, resolver = run(1_000_000.0)
+        self.assertEqual((engine.action_count, risk.rejected), (0, 2))
+        self.assertIsNone(resolver.open_leg(256265, "LONG_STRADDLE", "CALL"))
+
+        engine, risk, resolver = run(1_500_000.0)
+        self.assertEqual((engine.action_count, risk.rejected), (2, 0))
+        self.assertIsNotNone(resolver.open_leg(256265, "LONG_STRADDLE", "CALL"))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,153 @@
+import contextlib
+import io
+import unittest
+from datetime import datetime, timedelta
+
+from benchmarks.bench_engine import build_components
+from benchmarks.synthetic_feed import SyntheticFeed
+from core.domain.actions import TradeAction
+from core.domain.types import Tick
+from core.engine.clock import ReplayClock
+from core.engine.execution import OrderExecutor
+from core.engine.runner import Engine
+from core.engine.sharded_runner import ShardedEngine, partition
+from core.ports.strategy import Strategy
+from infra.dummy.dummy_broker import DummyBroker
+from infra.dummy.dummy_risk import DummyRiskManager
+
+START = datetime(2024, 1, 1, 9, 15)
+
+
+class BuyEveryTick(Strategy):
+    """Buys `qty` of the ticked token on every tick."""
+
+    name = "buy_every_tick"
+
+    def __init__(self, token, qty=1):
+        self.instrument_token = token
+        self.qty = qty
+
+    def on_tick(self, ctx):
+        return [TradeAction("OPEN_LONG", self.instrument_token, self.qty)]
+
+    def on_vol_signal(self, ctx):
+        return []
+
+
+class Failing(BuyEveryTick):
+    def on_tick(self, ctx):
+        raise ValueError("boom")
+
+
+# shard factories run in the worker processes, so they live at module level
+def buyers(tokens):
+    return [], [BuyEveryTick(token) for token in tokens]
+
+
+def failing(tokens):
+    return [], [Failing(token) for token in tokens]
+
+
+class ListFeed(SyntheticFeed):
+    def __init__(self, ticks, batch_size=1):
+        self.items = ticks
+        self.batch_size = batch_size
+
+    def stream(self):
+        return iter(self.items)
+
+
+def ticks(tokens, rounds):
+    return [Tick(token, START + timedelta(seconds=i), 100.0 + i, i)
+            for i in range(rounds) for token in tokens]
+
+
+def run(engine):
+    with contextlib.redirect_stdout(io.StringIO()):
+        engine.run()
+    return engine
+
+
+def positions(broker):
+    return {p.instrument_token: p.quantity for p in broker.get_positions()}
+
+
+class TestPartition(unittest.TestCase):
+    def test_round_robin(self):
+        self.assertEqual(partition([1, 2, 3, 4, 5], 2), [[1, 3, 5], [2, 4]])
+
+    def test_never_empty_shards(self):
+        self.assertEqual(partition([1, 2], 4), [[1], [2]])
+
+    def test_rejects_zero_shards(self):
+        with self.assertRaises(ValueError):
+            partition([1], 0)
+
+
+class TestShardedEngine(unittest.TestCase):
+    def test_routes_every_shards_actions(self):
+        tokens = [11, 12, 13]
+        broker = DummyBroker()
+        engine = run(ShardedEngine(ListFeed(ticks(tokens, 20), batch_size=3), broker, buyers,
+                                   tokens, DummyRiskManager(), shards=2,
+                                   executor=OrderExecutor(broker, max_workers=0)))
+
+        self.assertEqual(engine.tick_count, 60)
+        self.assertEqual(engine.action_count, 60)
+        self.assertEqual(positions(broker), {11: 20, 12: 20, 13: 20})
+        self.assertEqual(engine.positions.snapshot(), {11: 20, 12: 20, 13: 20})
+
+    def test_risk_sees_one_aggregated_list(self):
+        class CapAtFive(DummyRiskManager):
+            def __init__(self):
+                self.seen = 0
+
+            def filter_actions(self, actions):
+                allowed = actions[:max(0, 5 - self.seen)]
+                self.seen += len(allowed)
+                return allowed
+
+        tokens = [11, 12]
+        broker = DummyBroker()
+        engine = run(ShardedEngine(ListFeed(ticks(tokens, 10)), broker, buyers, tokens,
+                                   CapAtFive(), shards=2,
+                                   executor=OrderExecutor(broker, max_workers=0)))
+
+        self.assertEqual(engine.action_count, 5)
+        self.assertEqual(sum(positions(broker).values()), 5)
+
+    def test_same_actions_as_single_engine(self):
+        def feed():
+            return SyntheticFeed(4, 6000, seed=3, batch_size=4)
+
+        broker = DummyBroker()
+        models, strategies = build_components(feed().tokens)
+        single = run(Engine(feed(), broker, models, strategies, DummyRiskManager(),
+                            position_sync_interval=None,
+                            executor=OrderExecutor(broker, max_workers=0),
+                            clock=ReplayClock()))
+
+        sharded_broker = DummyBroker()
+        sharded = run(ShardedEngine(feed(), sharded_broker, build_components, feed().tokens,
+                                    DummyRiskManager(), shards=3,
+                                    position_sync_interval=None,
+                                    executor=OrderExecutor(sharded_broker, max_workers=0),
+                                    clock=ReplayClock()))
+
+        self.assertGreater(single.action_count, 0)
+        self.assertEqual(sharded.tick_count, single.tick_count)
+        self.assertEqual(sharded.action_count, single.action_count)
+        self.assertEqual(positions(sharded_broker), positions(broker))
+
+    def test_shard_errors_propagate(self):
+        broker = DummyBroker()
+        engine = ShardedEngine(ListFeed(ticks([1, 2], 3)), broker, failing, [1, 2],
+                               DummyRiskManager(), shards=2,
+                               executor=OrderExecutor(broker, max_workers=0))
+
+        with self.assertRaisesRegex(RuntimeError, "boom"):
+            run(engine)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+from datetime import datetime, timedelta
+
+from core.engine.event_loop import EventLoop
+from infra.backtest.backtest_feed import BacktestFeed
+from core.domain.types import Candle
+
+
+def make_candles(token, start, n, step_minutes=1, base=100.0):
+    return [
+        Candle(token, start + timedelta(minutes=i * step_minutes),
+               base + i, base + i + 2, base + i - 1, base + i + 1, 10 * i)
+        for i in range(n)
+    ]
+
+
+class TestBacktestFeed(unittest.TestCase):
+    def test_merge_matches_global_sort(self):
+        start = datetime(2024, 10, 1, 9, 15)
+        candles_by_token = {
+            1: make_candles(1, start, 5),
+            2: make_candles(2, start, 3, step_minutes=2, base=200.0),
+            3: make_candles(3, start + timedelta(seconds=30), 4, base=300.0),
+        }
+
+        expected = []
+        for token, candles in candles_by_token.items():
+            for c in candles:
+                for price in (c.open, c.high, c.low, c.close):
+                    expected.append((c.timestamp, token, price))
+        expected.sort(key=lambda e: e[0])
+
+        got = [(t.timestamp, t.instrument_token, t.last_price)
+               for t in BacktestFeed(candles_by_token).stream()]
+
+        self.assertEqual(got, expected)
+
+    def test_bars_rebuilt_through_event_loop_keep_candle_volume(self):
+        start = datetime(2024, 10, 1, 9, 15)
+        candles = [Candle(1, start + timedelta(minutes=i), 100.0, 101.0, 99.0, 100.5, v)
+                   for i, v in enumerate([500, 300, 800, 200])]
+        # next day: cumulative volume restarts from zero
+        candles.append(Candle(1, datetime(2024, 10, 2, 9, 15), 100.0, 101.0, 99.0, 100.5, 70))
+        candles.append(Candle(1, datetime(2024, 10, 2, 9, 16), 100.0, 101.0, 99.0, 100.5, 90))
+
+        loop = EventLoop(bar_intervals=(60, 300))
+        for tick in BacktestFeed({1: candles}).stream():
+            loop.update_state_with_tick(tick)
+
+        self.assertEqual([c.volume for c in loop.bars.bars(1, 60)], [500, 300, 800, 200, 70])
+        self.assertEqual([(c.high, c.low) for c in loop.bars.bars(1, 60)][0], (101.0, 99.0))
+        self.assertEqual([c.volume for c in loop.bars.bars(1, 300)], [1800])
+
+    def test_stream_batches_group_by_timestamp(self):
+        start = datetime(2024, 10, 1, 9, 15)
+        feed = BacktestFeed({1: make_candles(1, start, 3), 2: make_candles(2, start, 2)})
+
+        batches = list(feed.stream_batches())
+
+        self.assertEqual([len(b) for b in batches], [8, 8, 4])
+        self.assertEqual([t for b in batches for t in b], list(feed.stream()))
+        for batch in batches:
+            self.assertEqual(len({t.timestamp for t in batch}), 1)
+
+    def test_stream_is_lazy(self):
+        start = datetime(2024, 10, 1, 9, 15)
+        candles = make_candles(1, start, 3)
+        consumed = []
+
+        def tracking():
+            for c in candles:
+                consumed.append(c)
+                yield c
+
+        stream = BacktestFeed({1: tracking()}).stream()
+        first = next(stream)
+
+        self.assertEqual(first.last_price, candles[0].open)
+        self.assertEqual(len(consumed), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import tempfile
+import unittest
+from datetime import date, datetime, timedelta, timezone
+
+from infra.backtest.candle_cache import CandleCache, CachedHistoricalProvider
+from core.domain.types import Candle
+
+IST = timezone(timedelta(hours=5, minutes=30))
+
+
+def day_candles(token, day, n=3):
+    start = datetime(day.year, day.month, day.day, 9, 15, tzinfo=IST)
+    return [
+        Candle(token, start + timedelta(minutes=i), 100.0 + i, 101.5 + i,
+               99.25 + i, 100.5 + i, 1000 + i, None if i == 0 else 50 + i)
+        for i in range(n)
+    ]
+
+
+class FakeProvider:
+    """Stand-in for ZerodhaHistoricalProvider that records requested ranges."""
+
+    def __init__(self, days):
+        self.days = days
+        self.calls = []
+
+    def load_candles(self, token, start, end, interval):
+        self.calls.append((token, start.date(), end.date(), interval))
+        return [c for d in self.days if start.date() <= d <= end.date()
+                for c in day_candles(token, d)]
+
+
+class TestCandleCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_round_trip(self):
+        cache = CandleCache(self.tmp.name, "minute")
+        candles = day_candles(123, date(2024, 10, 1)) + day_candles(123, date(2024, 10, 3))
+
+        cache.store_candles(123, candles)
+
+        self.assertEqual(cache.load_candles(123), candles)
+        self.assertEqual(cache.cached_days(123), {date(2024, 10, 1), date(2024, 10, 3)})
+        self.assertEqual(
+            cache.missing_days(123, date(2024, 10, 1), date(2024, 10, 5)),
+            [(date(2024, 10, 2), date(2024, 10, 2)), (date(2024, 10, 4), date(2024, 10, 5))],
+        )
+
+    def test_naive_timestamps_round_trip(self):
+        cache = CandleCache(self.tmp.name, "5 minute")
+        candles = [Candle(1, datetime(2024, 10, 1, 9, 15), 1.0, 2.0, 0.5, 1.5, 10)]
+
+        cache.store_candles(1, candles)
+
+        self.assertEqual(cache.load_candles(1), candles)
+
+    def test_read_through_only_fetches_missing_days(self):
+        trading_days = [date(2024, 10, 1), date(2024, 10, 3), date(2024, 10, 4)]
+        provider = FakeProvider(trading_days)
+        cached = CachedHistoricalProvider(self.tmp.name, provider)
+
+        first = cached.load_candles(7, datetime(2024, 10, 1), datetime(2024, 10, 3), "minute")
+        self.assertEqual(len(first), 6)
+        self.assertEqual(provider.calls, [(7, date(2024, 10, 1), date(2024, 10, 3), "minute")])
+
+        second = cached.load_candles(7, datetime(2024, 10, 1), datetime(2024, 10, 4), "minute")
+        self.assertEqual(second[:6], first)
+        self.assertEqual(len(second), 9)
+        self.assertEqual(provider.calls[1], (7, date(2024, 10, 4), date(2024, 10, 4), "minute"))
+
+    def test_offline_serves_cache_only(self):
+        CachedHistoricalProvider(self.tmp.name, FakeProvider([date(2024, 10, 1)])).load_candles(
+            7, datetime(2024, 10, 1), datetime(2024, 10, 1), "minute")
+
+        offline = CachedHistoricalProvider(self.tmp.name, provider=None)
+        candles = offline.load_candles(7, datetime(2024, 10, 1), datetime(2024, 10, 2), "minute")
+
+        self.assertEqual(len(candles), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
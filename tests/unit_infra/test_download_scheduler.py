@@ -0,0 +1,166 @@
+import threading
+import unittest
+from datetime import datetime, timedelta
+
+from infra.backtest.download_scheduler import (
+    HistoricalDownloadScheduler,
+    TokenBucket,
+    chunk_range,
+    is_transient,
+)
+
+
+class NetworkException(Exception):
+    """Shaped like kiteconnect.exceptions.NetworkException."""
+
+    def __init__(self, message, code=503):
+        super().__init__(message)
+        self.code = code
+
+
+class TokenException(Exception):
+    def __init__(self, message, code=403):
+        super().__init__(message)
+        self.code = code
+
+
+class FakeKite:
+    """KiteConnect stand-in serving one row per requested day."""
+
+    def __init__(self, fail_first=0, error=None):
+        self.calls = []
+        self.fail_first = fail_first
+        self.error = error or NetworkException("Too many requests", code=429)
+        self._lock = threading.Lock()
+
+    def historical_data(self, token, start, end, interval, oi=False):
+        with self._lock:
+            self.calls.append((token, start, end))
+            if self.fail_first > 0:
+                self.fail_first -= 1
+                raise self.error
+
+        day = start.replace(hour=0, minute=0, second=0)
+        rows = []
+        while day <= end:
+            rows.append({"date": day, "open": 1.0, "high": 1.0, "low": 1.0,
+                         "close": 1.0, "volume": token, "oi": 0})
+            day += timedelta(days=1)
+        return rows
+
+
+class FakeTime:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def clock(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestChunkRange(unittest.TestCase):
+    def test_minute_ranges_split_at_sixty_days(self):
+        start = datetime(2024, 1, 1)
+        end = datetime(2024, 6, 30, 23, 59, 59)
+
+        chunks = chunk_range(start, end, "minute")
+
+        self.assertEqual(len(chunks), 4)
+        self.assertEqual(chunks[0][0], start)
+        self.assertEqual(chunks[-1][1], end)
+        for (_, prev_end), (next_start, _) in zip(chunks, chunks[1:]):
+            self.assertEqual(next_start - prev_end, timedelta(seconds=1))
+        for chunk_start, chunk_end in chunks:
+            self.assertLess(chunk_end - chunk_start, timedelta(days=60))
+
+    def test_day_interval_fits_one_request(self):
+        chunks = chunk_range(datetime(2024, 1, 1), datetime(2024, 12, 31), "day")
+        self.assertEqual(len(chunks), 1)
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_requests_are_spaced_by_rate(self):
+        t = FakeTime()
+        bucket = TokenBucket(rate=2.0, clock=t.clock, sleep=t.sleep)
+
+        for _ in range(5):
+            bucket.acquire()
+
+        # first request is free, the remaining four wait 0.5s each
+        self.assertAlmostEqual(t.now, 2.0)
+
+
+class TestHistoricalDownloadScheduler(unittest.TestCase):
+    def test_streams_every_token_in_time_order(self):
+        kite = FakeKite()
+        scheduler = HistoricalDownloadScheduler(kite, requests_per_second=1000, max_workers=4)
+        start, end = datetime(2024, 1, 1), datetime(2024, 4, 30)
+        requests = [(token, start, end) for token in (1, 2, 3)]
+
+        results = dict(scheduler.stream(requests, "minute"))
+
+        self.assertEqual(set(results), set(requests))
+        self.assertEqual(len(kite.calls), 3 * len(chunk_range(start, end, "minute")))
+        for (token, _, _), rows in results.items():
+            dates = [r["date"] for r in rows]
+            self.assertEqual(dates, sorted(dates))
+            self.assertEqual(len(dates), (end - start).days + 1)
+            self.assertTrue(all(r["volume"] == token for r in rows))
+
+    def test_retries_with_backoff(self):
+        kite = FakeKite(fail_first=2)
+        t = FakeTime()
+        scheduler = HistoricalDownloadScheduler(
+            kite, requests_per_second=1000, max_workers=1, backoff=0.5,
+            clock=t.clock, sleep=t.sleep)
+
+        rows = scheduler.fetch_chunk(1, datetime(2024, 1, 1), datetime(2024, 1, 2), "minute")
+
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(len(kite.calls), 3)
+        self.assertIn(0.5, t.sleeps)
+        self.assertIn(1.0, t.sleeps)
+
+    def test_gives_up_after_max_retries(self):
+        kite = FakeKite(fail_first=10)
+        t = FakeTime()
+        scheduler = HistoricalDownloadScheduler(
+            kite, requests_per_second=1000, max_retries=2, clock=t.clock, sleep=t.sleep)
+
+        with self.assertRaises(NetworkException):
+            list(scheduler.stream([(1, datetime(2024, 1, 1), datetime(2024, 1, 2))], "minute"))
+        self.assertEqual(len(kite.calls), 3)
+
+    def test_permanent_errors_fail_fast(self):
+        for error in (TokenException("Incorrect api_key or access_token"),
+                      TypeError("bad argument")):
+            kite = FakeKite(fail_first=1, error=error)
+            t = FakeTime()
+            scheduler = HistoricalDownloadScheduler(
+                kite, requests_per_second=1000, clock=t.clock, sleep=t.sleep)
+
+            with self.assertRaises(type(error)):
+                scheduler.fetch_chunk(1, datetime(2024, 1, 1), datetime(2024, 1, 2), "minute")
+            self.assertEqual(len(kite.calls), 1)
+            self.assertEqual(t.sleeps, [])
+
+    def test_transient_classification(self):
+        class Response:
+            status_code = 429
+
+        class HTTPError(IOError):
+            response = Response()
+
+        self.assertTrue(is_transient(NetworkException("gateway", code=502)))
+        self.assertTrue(is_transient(TimeoutError()))
+        self.assertTrue(is_transient(HTTPError()))
+        self.assertFalse(is_transient(TokenException("expired")))
+        self.assertFalse(is_transient(ValueError("bad interval")))
+
+
+if __name__ == "__main__":
+    unittest.main()
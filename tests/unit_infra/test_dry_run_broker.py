@@ -0,0 +1,32 @@
+import unittest
+from unittest.mock import MagicMock
+
+from core.domain.types import OrderRequest, Position
+from infra.dummy.dry_run_broker import DRY_RUN, DryRunBroker
+
+
+class TestDryRunBroker(unittest.TestCase):
+    def test_orders_are_logged_not_sent(self):
+        live = MagicMock()
+        broker = DryRunBroker(live)
+
+        with self.assertLogs("infra.dummy.dry_run_broker", level="WARNING"):
+            report = broker.place_order(OrderRequest(256265, 50, "MARKET", "SELL"))
+            broker.modify_order(report.order_id, price=10.0)
+            broker.cancel_order(report.order_id)
+
+        self.assertEqual(report.status, DRY_RUN)
+        self.assertEqual(report.filled_quantity, 0)
+        live.place_order.assert_not_called()
+        live.modify_order.assert_not_called()
+        live.cancel_order.assert_not_called()
+
+    def test_positions_come_from_the_live_broker(self):
+        live = MagicMock()
+        live.get_positions.return_value = [Position(1, 50, 10.0, 0.0)]
+
+        self.assertEqual(DryRunBroker(live).get_positions(), [Position(1, 50, 10.0, 0.0)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import os
+import tempfile
+import unittest
+from datetime import date
+
+from infra.zerodtha.instrument_master import InstrumentMaster, load_instrument_master
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "..", "fixtures", "instruments.csv")
+
+
+class TestInstrumentMaster(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.master = InstrumentMaster.from_csv(FIXTURE)
+
+    def test_lookup_by_token(self):
+        inst = self.master.get(10000516)
+        self.assertEqual(inst.exchange, "NFO")
+        self.assertEqual(inst.tradingsymbol, "NIFTY24O0324500CE")
+        self.assertEqual(inst.name, "NIFTY")
+        self.assertEqual(inst.instrument_type, "CE")
+        self.assertEqual(inst.expiry, date(2024, 10, 3))
+        self.assertEqual(inst.strike, 24500.0)
+        self.assertEqual(inst.tick_size, 0.05)
+        self.assertEqual(inst.lot_size, 25)
+
+        index = self.master.get(256265)
+        self.assertEqual((index.tradingsymbol, index.expiry), ("NIFTY 50", None))
+        self.assertIsNone(self.master.get(1))
+        self.assertIn(256265, self.master)
+
+    def test_lookup_by_symbol_is_per_exchange(self):
+        self.assertEqual(self.master.find("NSE", "RELIANCE").instrument_token, 738561)
+        self.assertEqual(self.master.find("BSE", "RELIANCE").instrument_token, 128083204)
+        self.assertIsNone(self.master.find("NFO", "RELIANCE"))
+
+    def test_columns_are_row_aligned(self):
+        tokens = self.master.column("instrument_token")
+        types = self.master.column("instrument_type")
+        self.assertEqual(len(tokens), len(self.master))
+        row = list(tokens).index(10000774)
+        self.assertEqual(types[row], "PE")
+        self.assertEqual(self.master.at(row).instrument_token, 10000774)
+
+    def test_save_and_load_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "master.col")
+            self.master.save(path)
+            loaded = InstrumentMaster.load(path)
+
+        self.assertEqual(len(loaded), len(self.master))
+        for token in self.master.column("instrument_token"):
+            self.assertEqual(loaded.get(token), self.master.get(token))
+        self.assertEqual(loaded.find("NFO", "NIFTY24OCTFUT"),
+                         self.master.find("NFO", "NIFTY24OCTFUT"))
+
+
+class TestLoadInstrumentMaster(unittest.TestCase):
+    def test_downloads_once_per_day(self):
+        master = InstrumentMaster.from_csv(FIXTURE)
+        rows = [master.at(i)._asdict() for i in range(len(master))]
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            return rows
+
+        with tempfile.TemporaryDirectory() as tmp:
+            first = load_instrument_master(tmp, fetch, day=date(2024, 10, 1))
+            again = load_instrument_master(tmp, fetch, day=date(2024, 10, 1))
+            self.assertEqual(len(calls), 1)
+            self.assertEqual(again.get(10000516), first.get(10000516))
+
+            load_instrument_master(tmp, fetch, day=date(2024, 10, 2))
+            self.assertEqual(len(calls), 2)
+            self.assertEqual(os.listdir(tmp), ["2024-10-02.col"])
+
+    def test_unreadable_cache_is_refetched(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(tmp, "2024-10-01.col"), "wb") as f:
+                f.write(b'{"version": 1, "rows": 10')
+            with self.assertLogs("infra.zerodtha.instrument_master", level="WARNING"):
+                master = load_instrument_master(tmp, lambda: [], day=date(2024, 10, 1))
+        self.assertEqual(len(master), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
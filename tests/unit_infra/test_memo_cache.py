@@ -0,0 +1,161 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, time
+
+from core.domain.actions import TradeAction
+from core.domain.state import MarketState
+from core.domain.types import Tick
+from infra.dummy.dummy_risk import DummyRiskManager
+
+from infra.backtest.memo_cache import MemoCache, component_key, dataset_key, fingerprint
+from infra.backtest.signal_precompute import precompute_signals
+from infra.backtest.sweep_runner import run_backtest, run_components
+from strategies.vol_models.atr_vol_model import ATRVolModel
+from strategies.vol_models.composite_vol_model import CompositeVolModel
+from strategies.risk_managers.exposure_risk_manager import ExposureRiskManager
+from strategies.vol_models.realized_vol_model import RealizedVolModel
+from tests.unit_infra.test_sweep_runner import zigzag_candles
+
+
+class TestKeys(unittest.TestCase):
+    def test_fingerprint_is_stable_and_order_independent(self):
+        self.assertEqual(fingerprint({"a": 1, "b": 2.5}), fingerprint({"b": 2.5, "a": 1}))
+        self.assertNotEqual(fingerprint({"a": 1}), fingerprint({"a": 2}))
+        self.assertNotEqual(fingerprint(1), fingerprint("1"))
+
+    def test_component_key_uses_class_and_parameters(self):
+        key = component_key(RealizedVolModel(1, lookback=10))
+        self.assertEqual(key["type"], "strategies.vol_models.realized_vol_model.RealizedVolModel")
+        self.assertEqual(key["params"]["lookback"], 10)
+        self.assertNotEqual(key, component_key(RealizedVolModel(1, lookback=20)))
+        self.assertNotEqual(component_key(CompositeVolModel([RealizedVolModel(1, lookback=10)])),
+                            component_key(CompositeVolModel([RealizedVolModel(1, lookback=20)])))
+
+    def test_component_key_encodes_container_and_time_parameters(self):
+        def hours(start, end):
+            return component_key(ExposureRiskManager(trading_hours=(start, end)))
+
+        self.assertNotEqual(hours(time(9, 15), time(15, 20)), hours(time(10, 0), time(11, 0)))
+        self.assertNotEqual(component_key(ExposureRiskManager(underlyings={11: 1})),
+                            component_key(ExposureRiskManager(underlyings={11: 2})))
+        self.assertNotEqual(fingerprint((1, 2)), fingerprint([1, 2]))
+
+    def test_component_key_ignores_runtime_state(self):
+        model, fresh = RealizedVolModel(1, lookback=3), RealizedVolModel(1, lookback=3)
+        for i, price in enumerate((100.0, 101.0, 99.0, 102.0, 98.0)):
+            tick = Tick(1, datetime(2024, 1, 1, 9, 15, i), price, 0)
+            model.update(MarketState({1: tick}, {}, {}, 0.0))
+        risk = ExposureRiskManager()
+        risk.filter_actions([TradeAction("OPEN_LONG", 11, 1, metadata={"underlying": 1})])
+
+        self.assertIsNotNone(model.current_vol)
+        self.assertEqual(component_key(model), component_key(fresh))
+        self.assertEqual(component_key(risk), component_key(ExposureRiskManager()))
+
+    def test_unencodable_parameters_raise(self):
+        class Opaque(DummyRiskManager):
+            def __init__(self, handle, hidden=0):
+                self.handle = handle
+
+        with self.assertRaises(TypeError):
+            component_key(Opaque(object()))   # no stable encoding
+        with self.assertRaises(TypeError):
+            component_key(Opaque(1))          # `hidden` is not kept
+
+    def test_dataset_key_follows_content(self):
+        candles = zigzag_candles(1, 50)
+        self.assertEqual(dataset_key({1: candles}), dataset_key({1: list(candles)}))
+        changed = candles[:-1] + [candles[-1]._replace(close=candles[-1].close + 0.01)]
+        self.assertNotEqual(dataset_key({1: candles}), dataset_key({1: changed}))
+
+
+class TestMemoCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_round_trip_and_get_or_compute(self):
+        cache = MemoCache(self.tmp.name)
+        self.assertIsNone(cache.get("ns", "ab12"))
+
+        calls = []
+        compute = lambda: calls.append(1) or {"x": [1, 2]}
+        self.assertEqual(cache.get_or_compute("ns", "ab12", compute), {"x": [1, 2]})
+        self.assertEqual(cache.get_or_compute("ns", "ab12", compute), {"x": [1, 2]})
+        self.assertEqual(len(calls), 1)
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+    def test_least_recently_used_entries_are_evicted(self):
+        cache = MemoCache(self.tmp.name, max_bytes=10**9)
+        for i, key in enumerate(("aa", "bb", "cc")):
+            cache.put("ns", key, b"x" * 1000)
+            os.utime(cache._path("ns", key), (i, i))   # aa oldest, cc newest
+        cache.get("ns", "aa")                          # aa becomes most recent
+
+        cache.max_bytes = 2 * cache.size() // 3
+        cache.evict()
+
+        self.assertIsNone(cache.get("ns", "bb"))
+        self.assertIsNotNone(cache.get("ns", "aa"))
+        self.assertIsNotNone(cache.get("ns", "cc"))
+
+    def test_backtest_runs_are_memoized(self):
+        cache = MemoCache(self.tmp.name)
+        candles = {1: zigzag_candles(1), 2: zigzag_candles(2, 150)}
+        params = {"lookback": 5, "high_threshold": 0.005}
+
+        first = run_backtest(candles, params, cache=cache)
+        again = run_backtest(candles, params, cache=cache)
+        self.assertEqual((first["cached"], again["cached"]), (False, True))
+        timing = ("cached", "seconds")
+        self.assertEqual({k: v for k, v in again.items() if k not in timing},
+                         {k: v for k, v in first.items() if k not in timing})
+        self.assertEqual(cache.hits, 1)
+
+        self.assertFalse(run_backtest(candles, dict(params, lookback=6), cache=cache)["cached"])
+        self.assertFalse(run_backtest({1: candles[1]}, params, cache=cache)["cached"])
+
+    def test_unkeyable_runs_are_not_cached(self):
+        class Opaque(DummyRiskManager):
+            def __init__(self, handle):
+                self.handle = handle
+
+        cache = MemoCache(self.tmp.name)
+        candles = {1: zigzag_candles(1)}
+        for _ in range(2):
+            row = run_components(candles, [RealizedVolModel(1, lookback=5)], [], Opaque(object()),
+                                 cache=cache)
+            self.assertFalse(row["cached"])
+        self.assertFalse(os.path.exists(os.path.join(self.tmp.name, "runs")))
+
+    def test_backtests_reuse_signal_series(self):
+        from strategies.option_strategies.high_vol_long_straddle import HighVolLongStraddleStrategy
+
+        cache = MemoCache(self.tmp.name)
+        candles = {1: zigzag_candles(1)}
+        for threshold in (0.6, 0.7):
+            run_components(candles, [RealizedVolModel(1, lookback=5)],
+                           [HighVolLongStraddleStrategy(1, entry_threshold=threshold)],
+                           DummyRiskManager(), cache=cache)
+        # second run: its run key misses, the vol series is served from the cache
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 3)
+
+    def test_signal_series_are_memoized_per_model(self):
+        cache = MemoCache(self.tmp.name)
+        candles = {1: zigzag_candles(1)}
+        models = [RealizedVolModel(1, lookback=10), ATRVolModel(1)]
+
+        first = precompute_signals(candles, models, cache=cache)
+        precompute_signals(candles, [RealizedVolModel(1, lookback=20), ATRVolModel(1)],
+                           cache=cache)
+        self.assertEqual(cache.hits, 1)   # only the ATR series was reused
+
+        again = precompute_signals(candles, models, cache=cache)
+        for key, series in first.items():
+            self.assertEqual(series.signal.tolist(), again[key].signal.tolist())
+
+
+if __name__ == "__main__":
+    unittest.main()
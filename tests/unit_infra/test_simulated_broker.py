@@ -0,0 +1,96 @@
+import unittest
+from datetime import datetime, timedelta
+
+from core.domain.types import OrderRequest, Tick
+from infra.backtest.simulated_broker import SimulatedBroker
+
+T0 = datetime(2024, 10, 1, 9, 15)
+
+
+def tick(price, seconds=0, token=1):
+    return Tick(token, T0 + timedelta(seconds=seconds), price, 0)
+
+
+class TestSimulatedBroker(unittest.TestCase):
+    def setUp(self):
+        self.broker = SimulatedBroker()
+        self.broker.on_tick(tick(100.0))
+
+    def test_market_order_fills_on_next_tick(self):
+        report = self.broker.place_order(OrderRequest(1, 10, "MARKET", "BUY"))
+        self.assertEqual(report.status, "NEW")
+
+        self.assertEqual(self.broker.on_tick(tick(50.0, token=2)), [])  # other instrument
+        (fill,) = self.broker.on_tick(tick(101.0, 1))
+
+        self.assertEqual(fill.order_id, report.order_id)
+        self.assertEqual((fill.status, fill.filled_quantity, fill.avg_price), ("FILLED", 10, 101.0))
+        self.assertEqual(self.broker.orders[report.order_id], fill)
+        self.assertEqual(self.broker.pending_orders, {})
+        self.assertEqual(self.broker.get_positions()[0].quantity, 10)
+
+    def test_limit_orders_fill_when_price_crosses(self):
+        buy = self.broker.place_order(OrderRequest(1, 5, "LIMIT", "BUY", 98.0))
+        sell = self.broker.place_order(OrderRequest(1, 5, "LIMIT", "SELL", 103.0))
+
+        self.assertEqual(self.broker.on_tick(tick(99.0, 1)), [])
+        (fill,) = self.broker.on_tick(tick(97.5, 2))
+        self.assertEqual((fill.order_id, fill.avg_price), (buy.order_id, 97.5))
+
+        (fill,) = self.broker.on_tick(tick(104.0, 3))
+        self.assertEqual((fill.order_id, fill.avg_price), (sell.order_id, 104.0))
+        self.assertEqual(self.broker.positions[1].quantity, 0)
+        self.assertAlmostEqual(self.broker.positions[1].pnl, 5 * (104.0 - 97.5))
+
+    def test_book_only_touches_crossed_orders(self):
+        ids = [self.broker.place_order(OrderRequest(1, 1, "LIMIT", "BUY", p)).order_id
+               for p in (95.0, 99.0, 97.0, 90.0)]
+
+        self.broker.on_tick(tick(100.0, 1))
+        fills = self.broker.on_tick(tick(96.0, 2))
+
+        self.assertEqual([f.order_id for f in fills], [ids[1], ids[2]])  # best bid first
+        self.assertEqual(len(self.broker._books[1].bids), 2)
+
+    def test_cancel_and_modify(self):
+        cancelled = self.broker.place_order(OrderRequest(1, 1, "LIMIT", "BUY", 99.0))
+        moved = self.broker.place_order(OrderRequest(1, 1, "LIMIT", "BUY", 99.0))
+        self.broker.on_tick(tick(100.0, 1))
+
+        self.broker.cancel_order(cancelled.order_id)
+        self.broker.modify_order(moved.order_id, price=95.0)
+
+        self.assertEqual(self.broker.orders[cancelled.order_id].status, "CANCELLED")
+        self.assertEqual(self.broker.on_tick(tick(98.0, 2)), [])
+        (fill,) = self.broker.on_tick(tick(94.0, 3))
+        self.assertEqual((fill.order_id, fill.avg_price), (moved.order_id, 94.0))
+
+    def test_slippage_and_latency(self):
+        broker = SimulatedBroker(slippage_bps=10, latency=timedelta(seconds=2))
+        broker.on_tick(tick(100.0))
+        buy = broker.place_order(OrderRequest(1, 1, "MARKET", "BUY"))
+        sell = broker.place_order(OrderRequest(1, 1, "LIMIT", "SELL", 99.95))
+
+        self.assertEqual(broker.on_tick(tick(100.0, 1)), [])   # still in flight
+        buy_fill, sell_fill = broker.on_tick(tick(100.0, 2))
+
+        self.assertEqual(buy_fill.order_id, buy.order_id)
+        self.assertAlmostEqual(buy_fill.avg_price, 100.1)
+        self.assertAlmostEqual(sell_fill.avg_price, 99.95)    # capped at the limit
+
+    def test_position_accounting(self):
+        for price, side, qty in ((100.0, "BUY", 10), (110.0, "BUY", 10), (120.0, "SELL", 15)):
+            self.broker.place_order(OrderRequest(1, qty, "MARKET", side))
+            self.broker.on_tick(tick(price, 1))
+
+        pos = self.broker.positions[1]
+        self.assertEqual(pos.quantity, 5)
+        self.assertAlmostEqual(pos.avg_price, 105.0)
+        self.assertAlmostEqual(pos.pnl, 15 * 15.0 + 5 * 15.0)
+
+        self.broker.on_tick(tick(100.0, 2))
+        self.assertAlmostEqual(self.broker.positions[1].pnl, 15 * 15.0 - 5 * 5.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
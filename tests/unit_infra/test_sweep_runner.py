@@ -0,0 +1,60 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from core.domain.types import Candle
+from infra.backtest.sweep_runner import (
+    ParameterSweepRunner,
+    SharedCandleStore,
+    expand_grid,
+    run_backtest,
+)
+
+IST = timezone(timedelta(hours=5, minutes=30))
+
+
+def zigzag_candles(token, n=200):
+    start = datetime(2024, 10, 1, 9, 15, tzinfo=IST)
+    candles = []
+    for i in range(n):
+        swing = 3.0 if (i // 40) % 2 else 0.05
+        close = 100.0 + (swing if i % 2 else -swing)
+        candles.append(Candle(token, start + timedelta(minutes=i), 100.0,
+                              max(100.0, close), min(100.0, close), close, 10 * i, i))
+    return candles
+
+
+class TestSweepRunner(unittest.TestCase):
+    def setUp(self):
+        self.candles = {1: zigzag_candles(1), 2: zigzag_candles(2, 150)}
+
+    def test_expand_grid(self):
+        combos = expand_grid({"lookback": [10, 20], "entry_threshold": [0.5]})
+        self.assertEqual(combos, [
+            {"lookback": 10, "entry_threshold": 0.5},
+            {"lookback": 20, "entry_threshold": 0.5},
+        ])
+
+    def test_shared_store_round_trip(self):
+        store = SharedCandleStore(self.candles)
+        try:
+            loaded = SharedCandleStore.load(store.name, store.layout)
+        finally:
+            store.close()
+        self.assertEqual(loaded, self.candles)
+
+    def test_pool_matches_inline_runs(self):
+        grid = {"lookback": [5, 20], "high_threshold": [0.005, 0.02]}
+
+        rows = ParameterSweepRunner(self.candles, max_workers=2).run(grid)
+
+        self.assertEqual(len(rows), 4)
+        for row, params in zip(rows, expand_grid(grid)):
+            inline = run_backtest(self.candles, params)
+            self.assertEqual({k: row[k] for k in params}, params)
+            self.assertEqual(row["ticks"], 4 * 350)
+            self.assertEqual(row["actions"], inline["actions"])
+        self.assertTrue(any(row["actions"] for row in rows))
+
+
+if __name__ == "__main__":
+    unittest.main()
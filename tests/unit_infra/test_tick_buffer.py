@@ -0,0 +1,82 @@
+import queue
+import threading
+import time
+import unittest
+from datetime import datetime
+
+from core.domain.types import Tick
+from infra.zerodtha.tick_buffer import (
+    BLOCK, CONFLATE, DROP_NEWEST, DROP_OLDEST, TickBuffer,
+)
+
+NOW = datetime(2024, 10, 1, 9, 15)
+
+
+def tick(token, price):
+    return Tick(token, NOW, price, 0)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTickBuffer(unittest.TestCase):
+    def test_conflate_keeps_latest_per_token_in_arrival_order(self):
+        clock = FakeClock()
+        buf = TickBuffer(capacity=10, policy=CONFLATE, clock=clock)
+        buf.put_many([tick(1, 100.0), tick(2, 200.0)])
+        clock.now = 3.0
+        buf.put_many([tick(1, 101.0), tick(1, 102.0), tick(3, 300.0)])
+
+        m = buf.metrics()
+        self.assertEqual((m.depth, m.enqueued, m.conflated, m.dropped), (3, 5, 2, 0))
+        self.assertEqual(m.oldest_age, 3.0)   # token 1 is still waiting since t=0
+
+        self.assertEqual(buf.get_batch(), [tick(1, 102.0), tick(2, 200.0), tick(3, 300.0)])
+        self.assertEqual(buf.metrics().oldest_age, 0.0)
+
+    def test_conflate_drops_oldest_token_when_full(self):
+        buf = TickBuffer(capacity=2, policy=CONFLATE)
+        buf.put_many([tick(1, 1.0), tick(2, 2.0), tick(3, 3.0)])
+
+        self.assertEqual(buf.metrics().dropped, 1)
+        self.assertEqual([t.instrument_token for t in buf.get_batch()], [2, 3])
+
+    def test_drop_policies(self):
+        oldest = TickBuffer(capacity=2, policy=DROP_OLDEST)
+        newest = TickBuffer(capacity=2, policy=DROP_NEWEST)
+        for buf in (oldest, newest):
+            buf.put_many([tick(1, p) for p in (1.0, 2.0, 3.0)])
+
+        self.assertEqual([t.last_price for t in oldest.get_batch()], [2.0, 3.0])
+        self.assertEqual([t.last_price for t in newest.get_batch()], [1.0, 2.0])
+        self.assertEqual(oldest.metrics().dropped, 1)
+        self.assertEqual(newest.metrics().high_watermark, 2)
+
+    def test_block_applies_back_pressure(self):
+        buf = TickBuffer(capacity=1, policy=BLOCK)
+        buf.put(tick(1, 1.0))
+        producer = threading.Thread(target=buf.put, args=(tick(1, 2.0),))
+        producer.start()
+        time.sleep(0.05)
+        self.assertTrue(producer.is_alive())
+
+        self.assertEqual(buf.get().last_price, 1.0)
+        producer.join(timeout=1)
+        self.assertFalse(producer.is_alive())
+        self.assertEqual(buf.get().last_price, 2.0)
+        self.assertEqual(buf.metrics().dropped, 0)
+
+    def test_get_times_out_and_rejects_bad_policy(self):
+        with self.assertRaises(queue.Empty):
+            TickBuffer().get(timeout=0.01)
+        with self.assertRaises(ValueError):
+            TickBuffer(policy="latest")
+
+
+if __name__ == "__main__":
+    unittest.main()
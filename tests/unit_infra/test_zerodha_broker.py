@@ -6,22 +6,28 @@ import sys
 mock_kite_module = MagicMock()
 sys.modules["kiteconnect"] = mock_kite_module
 
-from infra.zerodtha.zerodtha_broker import ZerodhaBroker
+import os
+
+from infra.zerodtha.instrument_master import InstrumentMaster
+from infra.zerodtha.zerodtha_broker import ZerodhaBroker, round_to_tick
 from core.domain.types import OrderRequest
 
+FIXTURE = os.path.join(os.path.dirname(__file__), "..", "fixtures", "instruments.csv")
+
 class TestZerodhaBroker(unittest.TestCase):
     @patch("infra.zerodtha.zerodtha_broker.KiteConnect")
     def test_place_order(self, MockKite):
         mock_kite = MockKite.return_value
-        broker = ZerodhaBroker("api_key", "access_token")
+        broker = ZerodhaBroker("api_key", "access_token",
+                               instruments=InstrumentMaster.from_csv(FIXTURE))
         mock_kite.place_order.return_value = "order_123"
         
         order = OrderRequest(
-            instrument_token=123,
-            quantity=10,
+            instrument_token=10000516,
+            quantity=25,
             transaction_type="BUY",
             order_type="LIMIT",
-            price=100.0
+            price=100.03
         )
         
         report = broker.place_order(order)
@@ -29,6 +35,23 @@ class TestZerodhaBroker(unittest.TestCase):
         self.assertEqual(report.order_id, "order_123")
         self.assertEqual(report.status, "NEW")
         mock_kite.place_order.assert_called_once()
+        _, kwargs = mock_kite.place_order.call_args
+        self.assertEqual(kwargs["exchange"], "NFO")
+        self.assertEqual(kwargs["tradingsymbol"], "NIFTY24O0324500CE")
+        self.assertEqual(kwargs["price"], 100.05)
+
+    @patch("infra.zerodtha.zerodtha_broker.KiteConnect")
+    def test_unknown_token_is_refused(self, MockKite):
+        broker = ZerodhaBroker("api_key", "access_token",
+                               instruments=InstrumentMaster.from_csv(FIXTURE))
+        with self.assertRaises(ValueError):
+            broker.place_order(OrderRequest(123, 1, "MARKET", "BUY"))
+        MockKite.return_value.place_order.assert_not_called()
+
+    def test_round_to_tick(self):
+        self.assertEqual(round_to_tick(100.03, 0.05), 100.05)
+        self.assertEqual(round_to_tick(100.02, 0.05), 100.0)
+        self.assertEqual(round_to_tick(100.02, 0.0), 100.02)
 
     @patch("infra.zerodtha.zerodtha_broker.KiteConnect")
     def test_get_positions(self, MockKite):
@@ -54,5 +54,19 @@ class TestZerodhaFeed(unittest.TestCase):
         
         t.join()
 
+    @patch("infra.zerodtha.zerodtha_feed.KiteTicker")
+    def test_stream_batches(self, MockTicker):
+        instance = MockTicker.return_value
+        feed = ZerodhaFeed("key", "token", overflow_policy="drop_oldest")
+
+        feed._on_ticks(instance, [
+            {"instrument_token": 123, "last_price": 100.0, "timestamp": "2024-01-01"},
+            {"instrument_token": 456, "last_price": 200.0, "timestamp": "2024-01-01"},
+        ])
+        batch = next(feed.stream_batches())
+
+        self.assertEqual([t.instrument_token for t in batch], [123, 456])
+        self.assertEqual(feed.metrics().delivered, 2)
+
 if __name__ == "__main__":
     unittest.main()
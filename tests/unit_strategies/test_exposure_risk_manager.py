@@ -0,0 +1,153 @@
+import unittest
+from datetime import datetime, time
+
+from core.domain.actions import TradeAction
+from core.domain.types import OrderRequest, OrderExecutionReport, Position, Tick
+from strategies.risk_managers.exposure_risk_manager import COMPLETED_ORDERS_KEPT, ExposureRiskManager
+
+NOW = datetime(2024, 10, 1, 10, 0)
+
+
+def tick(token, price, at=NOW):
+    return Tick(token, at, price, 0)
+
+
+def fill(risk, token, qty, price, order_id=None, filled=None):
+    side = "BUY" if qty > 0 else "SELL"
+    order = OrderRequest(token, abs(qty), "MARKET", side)
+    report = OrderExecutionReport(order_id or f"o-{token}-{qty}-{price}", "FILLED",
+                                  filled if filled is not None else abs(qty), price, NOW)
+    risk.on_fill(order, report)
+
+
+def condor(underlying, legs=(11, 12, 13, 14), qty=1):
+    kinds = ("OPEN_SHORT", "OPEN_SHORT", "OPEN_LONG", "OPEN_LONG")
+    return [TradeAction(kind, token, qty, metadata={"structure": "IRON_CONDOR",
+                                                     "underlying": underlying})
+            for kind, token in zip(kinds, legs)]
+
+
+class TestExposureBook(unittest.TestCase):
+    def test_fills_and_ticks_update_aggregates(self):
+        risk = ExposureRiskManager(underlyings={11: 1, 12: 1, 21: 2})
+        fill(risk, 11, 10, 100.0)
+        fill(risk, 12, -5, 50.0)
+        fill(risk, 21, 2, 10.0)
+
+        self.assertEqual(risk.underlying_notional(1), 1250.0)
+        self.assertEqual(risk.underlying_notional(2), 20.0)
+        self.assertEqual(risk.gross_notional, 1270.0)
+        self.assertEqual(risk.unrealized_pnl, 0.0)
+
+        risk.on_tick(tick(11, 110.0))
+        risk.on_tick(tick(12, 40.0))
+        self.assertEqual(risk.unrealized_pnl, 100.0 + 50.0)
+        self.assertEqual(risk.underlying_notional(1), 1100.0 + 200.0)
+        self.assertEqual(risk.gross_notional, 1320.0)
+
+    def test_realized_pnl_on_reduce_and_flip(self):
+        risk = ExposureRiskManager()
+        fill(risk, 11, 10, 100.0)
+        fill(risk, 11, -4, 110.0)
+        self.assertEqual(risk.realized_pnl, 40.0)
+        self.assertEqual(risk.position(11), 6)
+
+        fill(risk, 11, -10, 90.0)   # closes 6 at a loss, then short 4 at 90
+        self.assertEqual(risk.realized_pnl, 40.0 - 60.0)
+        self.assertEqual(risk.position(11), -4)
+        risk.on_tick(tick(11, 80.0))
+        self.assertEqual(risk.unrealized_pnl, 40.0)
+        self.assertEqual(risk.gross_notional, 320.0)
+
+    def test_cumulative_reports_are_booked_once(self):
+        risk = ExposureRiskManager()
+        fill(risk, 11, 10, 100.0, order_id="a", filled=4)
+        fill(risk, 11, 10, 100.0, order_id="a", filled=10)
+        fill(risk, 11, 10, 100.0, order_id="a", filled=10)
+        self.assertEqual(risk.position(11), 10)
+
+    def test_fill_bookkeeping_is_bounded(self):
+        risk = ExposureRiskManager()
+        fill(risk, 11, 10, 100.0, order_id="a", filled=4)
+        self.assertEqual(risk._applied, {"a": 4})
+        fill(risk, 11, 10, 100.0, order_id="a", filled=10)
+        self.assertEqual(risk._applied, {})
+
+        for i in range(COMPLETED_ORDERS_KEPT + 10):
+            fill(risk, 12, 1, 10.0, order_id=f"o{i}")
+        self.assertEqual(len(risk._completed), COMPLETED_ORDERS_KEPT)
+
+        risk.load([])
+        self.assertEqual((risk._applied, len(risk._completed)), ({}, 0))
+
+    def test_load_replaces_positions(self):
+        risk = ExposureRiskManager()
+        fill(risk, 11, 10, 100.0)
+        risk.load([Position(12, -3, 20.0, 0.0)])
+        self.assertEqual(risk.position(11), 0)
+        self.assertEqual(risk.position(12), -3)
+        self.assertEqual(risk.gross_notional, 60.0)
+
+
+class TestPreTradeChecks(unittest.TestCase):
+    def test_max_position(self):
+        risk = ExposureRiskManager(max_position=10)
+        fill(risk, 11, 8, 100.0)
+        ok = TradeAction("OPEN_LONG", 11, 2)
+        too_big = TradeAction("OPEN_LONG", 11, 3)
+        self.assertEqual(risk.filter_actions([ok]), [ok])
+        self.assertEqual(risk.filter_actions([too_big]), [])
+        self.assertEqual(risk.rejected, 1)
+
+    def test_reductions_always_pass(self):
+        risk = ExposureRiskManager(max_position=1, max_loss=10.0,
+                                   trading_hours=(time(9, 15), time(15, 20)))
+        fill(risk, 11, 5, 100.0)
+        risk.on_tick(tick(11, 50.0, at=datetime(2024, 10, 1, 16, 0)))   # deep loss, after hours
+
+        close = TradeAction("CLOSE_LONG", 11, 5)
+        self.assertEqual(risk.filter_actions([close]), [close])
+        self.assertEqual(risk.filter_actions([TradeAction("OPEN_LONG", 12, 1)]), [])
+
+    def test_list_exposure_accumulates(self):
+        risk = ExposureRiskManager(max_portfolio_notional=250.0)
+        for token in (1, 2, 3):
+            risk.on_tick(tick(token, 100.0))
+        actions = [TradeAction("OPEN_LONG", token, 1) for token in (1, 2, 3)]
+        self.assertEqual(risk.filter_actions(actions), actions[:2])
+
+    def test_condor_is_atomic(self):
+        risk = ExposureRiskManager(max_position=1)
+        fill(risk, 14, 1, 5.0)            # the last leg would go to 2
+        self.assertEqual(risk.filter_actions(condor(1)), [])
+        self.assertEqual(risk.rejected, 4)
+
+        ok = condor(2, legs=(21, 22, 23, 24))
+        self.assertEqual(risk.filter_actions(condor(1) + ok), ok)
+
+    def test_underlying_notional_counts_all_legs(self):
+        risk = ExposureRiskManager(max_underlying_notional=350.0)
+        for token in (11, 12, 13, 14):
+            risk.on_tick(tick(token, 100.0))
+        self.assertEqual(risk.filter_actions(condor(1)), [])
+        self.assertEqual(len(risk.filter_actions(condor(1, qty=1)[:3])), 3)
+
+    def test_max_loss_blocks_new_risk(self):
+        risk = ExposureRiskManager(max_loss=100.0)
+        fill(risk, 11, 10, 100.0)
+        risk.on_tick(tick(11, 89.0))
+        self.assertEqual(risk.filter_actions([TradeAction("OPEN_LONG", 12, 1)]), [])
+        risk.on_tick(tick(11, 95.0))
+        self.assertEqual(len(risk.filter_actions([TradeAction("OPEN_LONG", 12, 1)])), 1)
+
+    def test_trading_hours(self):
+        risk = ExposureRiskManager(trading_hours=(time(9, 15), time(15, 20)))
+        action = TradeAction("OPEN_LONG", 11, 1)
+        risk.on_tick(tick(11, 100.0, at=datetime(2024, 10, 1, 9, 0)))
+        self.assertEqual(risk.filter_actions([action]), [])
+        risk.on_tick(tick(11, 100.0, at=datetime(2024, 10, 1, 9, 15)))
+        self.assertEqual(risk.filter_actions([action]), [action])
+
+
+if __name__ == "__main__":
+    unittest.main()
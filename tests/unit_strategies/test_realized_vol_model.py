@@ -1,5 +1,7 @@
+import random
 import unittest
 from datetime import datetime
+from math import log, sqrt
 from strategies.vol_models.realized_vol_model import RealizedVolModel
 from core.domain.state import MarketState
 from core.domain.types import Tick
@@ -44,5 +46,26 @@ class TestRealizedVolModel(unittest.TestCase):
         self.assertIsNotNone(last_signal)
         self.assertEqual(last_signal.kind, "VOL_UP")
 
+    def test_incremental_vol_matches_two_pass(self):
+        lookback = 375
+        model = RealizedVolModel(instrument_token=123, lookback=lookback, annualize_factor=1.0)
+        state = MarketState(last_ticks={}, recent_candles={}, positions={}, timestamp=0.0)
+
+        rng = random.Random(7)
+        prices = [20000.0]
+        for _ in range(3 * lookback):
+            prices.append(prices[-1] * (1 + rng.gauss(0.0002, 0.001)))
+
+        for i, p in enumerate(prices):
+            state.last_ticks[123] = Tick(123, datetime.now(), p, 100)
+            model.update(state)
+
+            if i >= lookback:
+                window = prices[i - lookback:i + 1]
+                rets = [log(b / a) for a, b in zip(window, window[1:])]
+                mean_r = sum(rets) / len(rets)
+                expected = sqrt(sum((r - mean_r) ** 2 for r in rets) / (len(rets) - 1))
+                self.assertAlmostEqual(model.current_vol, expected, delta=expected * 1e-9)
+
 if __name__ == "__main__":
     unittest.main()
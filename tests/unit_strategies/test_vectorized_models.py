@@ -0,0 +1,187 @@
+import math
+import random
+import unittest
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from core.domain.candle_buffer import CandleRingBuffer
+from core.domain.state import MarketState
+from core.domain.types import Candle, Tick
+from infra.backtest.signal_precompute import (PrecomputedVolModel, precompute_signals,
+                                              replay_models, series_key, tick_prices)
+from strategies.vol_models.atr_vol_model import ATRVolModel
+from strategies.vol_models.bollinger_vol_model import BollingerVolModel
+from strategies.vol_models.ewma_vol_model import EWMAVolModel
+from strategies.vol_models.garch_vol_model import GARCHVolModel
+from strategies.vol_models.realized_vol_model import RealizedVolModel
+from strategies.vol_models.vectorized import NO_SIGNAL, VOL_DOWN, VOL_UP, linear_recurrence
+
+CODES = {"VOL_UP": VOL_UP, "VOL_DOWN": VOL_DOWN}
+
+
+def random_walk(n, seed=11, sigma=0.004):
+    rng = random.Random(seed)
+    prices = [100.0]
+    for i in range(n - 1):
+        # alternate calm and noisy regimes so both signals fire
+        s = sigma * (3 if (i // 50) % 2 else 0.5)
+        prices.append(prices[-1] * math.exp(rng.gauss(0, s)))
+    return prices
+
+
+def random_candles(n, seed=5):
+    rng = random.Random(seed)
+    closes = random_walk(n, seed)
+    start = datetime(2024, 10, 1, 9, 15)
+    candles = []
+    prev = closes[0]
+    for i, c in enumerate(closes):
+        spread = abs(rng.gauss(0, 0.01)) * c
+        candles.append(Candle(1, start + timedelta(minutes=i), prev,
+                              max(prev, c) + spread, min(prev, c) - spread, c, 100))
+        prev = c
+    return candles
+
+
+def stream_ticks(model, prices):
+    state = MarketState(last_ticks={}, recent_candles={}, positions={}, timestamp=0.0)
+    out = []
+    for p in prices:
+        state.last_ticks[1] = Tick(1, datetime(2024, 1, 1), p, 0)
+        out.append(model.update(state))
+    return out
+
+
+def stream_candles(model, candles):
+    bars = CandleRingBuffer(1, capacity=64)
+    state = MarketState(last_ticks={}, recent_candles={1: bars}, positions={}, timestamp=0.0)
+    out = []
+    for candle in candles:
+        bars.append(candle)
+        out.append(model.update(state))
+    return out
+
+
+class TestVectorizedModels(unittest.TestCase):
+    def assertSignalsMatch(self, streamed, series):
+        for sig, code, strength in zip(streamed, series.signal, series.strength):
+            if sig is None:
+                self.assertEqual(code, NO_SIGNAL)
+            else:
+                self.assertEqual(code, CODES[sig.kind])
+                self.assertAlmostEqual(sig.strength, strength, places=9)
+        self.assertTrue((series.signal == VOL_UP).any())
+        self.assertTrue((series.signal == VOL_DOWN).any())
+
+    def test_linear_recurrence_matches_loop(self):
+        x = np.array(random_walk(1000))
+        for a in (0.0, 0.1, 0.85, 0.94, 0.999):
+            expected, y = [], 3.0
+            for v in x:
+                y = a * y + v
+                expected.append(y)
+            np.testing.assert_allclose(linear_recurrence(a, x, 3.0), expected, rtol=1e-10)
+
+    def test_realized(self):
+        prices = random_walk(2000)
+        model = RealizedVolModel(1, lookback=30, high_threshold=0.006, low_threshold=0.003)
+        series = RealizedVolModel(1, lookback=30, high_threshold=0.006, low_threshold=0.003).batch(prices)
+
+        vols = []
+        state = MarketState(last_ticks={}, recent_candles={}, positions={}, timestamp=0.0)
+        streamed = []
+        for p in prices:
+            state.last_ticks[1] = Tick(1, datetime(2024, 1, 1), p, 0)
+            streamed.append(model.update(state))
+            vols.append(model.current_vol if len(model._prices) > model.lookback else np.nan)
+
+        np.testing.assert_allclose(series.vol, vols, rtol=1e-9)
+        self.assertSignalsMatch(streamed, series)
+
+    def test_ewma(self):
+        prices = random_walk(2000)
+        kwargs = dict(decay_factor=0.94, high_threshold=0.006, low_threshold=0.003)
+        series = EWMAVolModel(1, **kwargs).batch(prices)
+        self.assertSignalsMatch(stream_ticks(EWMAVolModel(1, **kwargs), prices), series)
+
+    def test_garch(self):
+        prices = random_walk(2000)
+        kwargs = dict(high_threshold=0.006, low_threshold=0.004)
+        series = GARCHVolModel(1, **kwargs).batch(prices)
+        self.assertSignalsMatch(stream_ticks(GARCHVolModel(1, **kwargs), prices), series)
+
+    def test_atr(self):
+        candles = random_candles(600)
+        kwargs = dict(period=14, high_threshold=0.025, low_threshold=0.015)
+        closes = np.array([c.close for c in candles])
+        series = ATRVolModel(1, **kwargs).batch(
+            [c.high for c in candles], [c.low for c in candles], closes)
+        self.assertSignalsMatch(stream_candles(ATRVolModel(1, **kwargs), candles), series)
+
+    def test_bollinger(self):
+        candles = random_candles(600)
+        kwargs = dict(period=20, high_threshold=0.06, low_threshold=0.03)
+        series = BollingerVolModel(1, **kwargs).batch(
+            [c.high for c in candles], [c.low for c in candles], [c.close for c in candles])
+        self.assertSignalsMatch(stream_candles(BollingerVolModel(1, **kwargs), candles), series)
+
+    def test_precompute_signals(self):
+        candles = random_candles(100)
+        realized, atr = RealizedVolModel(1), ATRVolModel(1)
+
+        results = precompute_signals({1: candles}, [realized, atr, EWMAVolModel(2)])
+
+        self.assertEqual(set(results), {series_key(realized), series_key(atr)})
+        self.assertEqual(len(results[series_key(realized)].vol), 4 * len(candles))
+        self.assertEqual(len(results[series_key(atr)].vol), len(candles))
+        self.assertEqual(tick_prices(candles[:1]).tolist(),
+                         [candles[0].open, candles[0].high, candles[0].low, candles[0].close])
+
+    def test_precompute_signals_keys_each_configuration(self):
+        short, long = RealizedVolModel(1, lookback=10), RealizedVolModel(1, lookback=30)
+        results = precompute_signals({1: random_candles(50)}, [short, long])
+
+        self.assertEqual(len(results), 2)
+        self.assertEqual(np.isnan(results[series_key(short)].vol).sum(), 10)
+        self.assertEqual(np.isnan(results[series_key(long)].vol).sum(), 30)
+
+    def test_replayed_models_match_streaming_engine(self):
+        from unittest.mock import MagicMock
+        from core.engine.clock import ReplayClock
+        from core.engine.runner import Engine
+        from infra.backtest.backtest_feed import BacktestFeed
+
+        candles = {1: random_candles(600)}
+
+        def models():
+            return [RealizedVolModel(1, lookback=10, high_threshold=0.01, low_threshold=0.006),
+                    RealizedVolModel(1, lookback=30, high_threshold=0.01, low_threshold=0.006),
+                    EWMAVolModel(1, high_threshold=0.01, low_threshold=0.006),
+                    ATRVolModel(1, high_threshold=0.025, low_threshold=0.015)]
+
+        def signals(vol_models):
+            broker = MagicMock()
+            broker.get_positions.return_value = []
+            broker.on_tick.return_value = []
+            risk_mgr = MagicMock()
+            risk_mgr.filter_actions.return_value = []
+            seen = []
+            strategy = MagicMock(instrument_token=None)
+            strategy.on_tick.return_value = []
+            strategy.on_vol_signal.side_effect = lambda ctx: seen.extend(
+                (s.kind, round(s.strength, 9), s.timestamp) for s in ctx.signals) or []
+            Engine(BacktestFeed(candles), broker, vol_models, [strategy], risk_mgr,
+                   clock=ReplayClock()).run()
+            return seen
+
+        replayed = replay_models(candles, models())
+        self.assertEqual([type(m) for m in replayed],
+                         [PrecomputedVolModel] * 3 + [ATRVolModel])
+        streamed = signals(models())
+        self.assertTrue(streamed)
+        self.assertEqual(signals(replayed), streamed)
+
+
+if __name__ == "__main__":
+    unittest.main()